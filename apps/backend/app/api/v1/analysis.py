@@ -0,0 +1,119 @@
+"""
+Analysis job API endpoints
+"""
+
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+import os
+
+from app.core.executors import executors
+from app.models.ml_model import AnalysisJob, MLModel, Dataset
+from app.services.analysis_jobs import analysis_jobs, JOB_COMPLETED, JOB_FAILED
+from app.services.model_registry import ModelNotFoundError
+from app.schemas.analysis import (
+    AnalysisJobRequest, AnalysisJobStatus, AnalysisJobProgress, AnalysisJobResult
+)
+
+# Create router
+router = APIRouter()
+
+
+async def _get_job(job_id: int) -> AnalysisJob:
+    job = await AnalysisJob.get_or_none(id=job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs", response_model=AnalysisJobStatus, status_code=202)
+async def submit_job(job_request: AnalysisJobRequest):
+    """Queue a model analysis and return its job id"""
+    try:
+        ml_service = analysis_jobs.ml_service
+        
+        # Resolve the model file and make sure it loads
+        try:
+            entry = await run_in_threadpool(ml_service.registry.get, job_request.model_id)
+        except ModelNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e.args[0]))
+        
+        if not os.path.exists(job_request.dataset_path):
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        dataset_info = await executors.run(
+            "dataset", ml_service.load_dataset, job_request.dataset_path, preview=True
+        )
+        if not dataset_info["success"]:
+            raise HTTPException(status_code=400, detail=dataset_info["message"])
+        
+        model, _ = await MLModel.get_or_create(
+            file_path=entry.file_path,
+            defaults={
+                "name": entry.model_id,
+                "model_type": "sklearn",  # Default for MVP
+                "algorithm": type(entry.model).__name__,
+            }
+        )
+        rows, columns = dataset_info["dataset_info"]["shape"]
+        dataset, _ = await Dataset.get_or_create(
+            file_path=job_request.dataset_path,
+            target_column=job_request.target_column,
+            defaults={
+                "name": os.path.basename(job_request.dataset_path),
+                "row_count": rows,
+                "column_count": columns,
+            }
+        )
+        
+        job = await analysis_jobs.submit(model, dataset)
+        return _job_status(job)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Job submission failed: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobStatus)
+async def get_job_status(job_id: int):
+    """Status of an analysis job"""
+    return _job_status(await _get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/progress", response_model=AnalysisJobProgress)
+async def get_job_progress(job_id: int):
+    """Current stage and completed fraction of an analysis job"""
+    job = await _get_job(job_id)
+    return AnalysisJobProgress(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        progress=job.progress
+    )
+
+
+@router.get("/jobs/{job_id}/result", response_model=AnalysisJobResult)
+async def get_job_result(job_id: int):
+    """Result of a completed analysis job"""
+    job = await _get_job(job_id)
+    
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=400, detail=f"Analysis failed: {job.error}")
+    if job.status != JOB_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    
+    return AnalysisJobResult(job_id=job.id, status=job.status, result=job.result)
+
+
+def _job_status(job: AnalysisJob) -> AnalysisJobStatus:
+    return AnalysisJobStatus(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        progress=job.progress,
+        error=job.error,
+        prediction_id=job.prediction_id,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
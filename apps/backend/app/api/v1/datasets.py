@@ -12,6 +12,8 @@ from datetime import datetime
 from app.services.ml_service import MLService
 from app.schemas.dataset import DatasetUploadResponse, DatasetPreviewResponse
 from app.core.config import settings
+from app.core.executors import executors
+from app.utils.files import save_upload_file, UploadTooLargeError
 
 # Create router
 router = APIRouter()
@@ -39,7 +41,7 @@ async def upload_dataset(
             )
         
         # Check file size
-        if file.size and file.size > settings.MAX_FILE_SIZE:
+        if file.size and file.size > settings.MAX_DATASET_FILE_SIZE:
             raise HTTPException(status_code=400, detail="File too large")
         
         # Generate unique filename
@@ -47,24 +49,36 @@ async def upload_dataset(
         filename = f"{file_id}{file_ext}"
         file_path = os.path.join(settings.DATASET_UPLOAD_DIR, filename)
         
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Copy the spooled file to disk in chunks (UploadLimitMiddleware already
+        # refused bodies over the limit); the file itself is checked exactly
+        try:
+            size_bytes, sha256 = await save_upload_file(
+                file, file_path, settings.MAX_DATASET_FILE_SIZE, settings.UPLOAD_CHUNK_SIZE
+            )
+        except UploadTooLargeError:
+            raise HTTPException(status_code=400, detail="File too large")
         
         # Load dataset to get info
-        dataset_info = ml_service.load_dataset(file_path)
+        dataset_info = await executors.run("dataset", ml_service.load_dataset, file_path, preview=True)
         if not dataset_info["success"]:
             # Clean up file if loading failed
             os.remove(file_path)
             raise HTTPException(status_code=400, detail=dataset_info["message"])
         
+        # Convert once into the columnar store used by every later read
+        store_info = await executors.run("dataset", ml_service.build_dataset_store, file_path)
+        if not store_info["success"]:
+            os.remove(file_path)
+            raise HTTPException(status_code=400, detail=store_info["message"])
+        
         return DatasetUploadResponse(
             success=True,
             filename=filename,
             file_path=file_path,
             shape=dataset_info["dataset_info"]["shape"],
             columns=dataset_info["dataset_info"]["columns"],
+            size_bytes=size_bytes,
+            sha256=sha256,
             message="Dataset uploaded successfully"
         )
         
@@ -81,8 +95,8 @@ async def preview_dataset(file_path: str):
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Load dataset
-        dataset_info = ml_service.load_dataset(file_path)
+        # Load dataset preview
+        dataset_info = await executors.run("dataset", ml_service.load_dataset, file_path, preview=True)
         if not dataset_info["success"]:
             raise HTTPException(status_code=400, detail=dataset_info["message"])
         
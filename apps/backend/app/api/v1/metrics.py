@@ -7,8 +7,16 @@ from fastapi.responses import JSONResponse
 from typing import List, Union
 
 from app.services.ml_service import MLService
-from app.schemas.metrics import EvaluationRequest, EvaluationResponse
+from app.schemas.metrics import (
+    EvaluationRequest, EvaluationResponse, CurvesRequest, CurvesResponse,
+    MetricsSessionRequest, MetricsBatchRequest, MetricsSessionResponse
+)
+from app.services.curves import roc_pr_curves
+from app.services.metrics_sessions import (
+    metrics_sessions, batch_statistics, MetricsSession, MetricsSessionNotFoundError
+)
 from app.core.config import settings
+from app.core.executors import executors
 
 # Create router
 router = APIRouter()
@@ -29,7 +37,9 @@ async def evaluate(evaluation_request: EvaluationRequest):
             )
         
         # Evaluate metrics
-        result = ml_service.evaluate_metrics(
+        result = await executors.run(
+            "metrics",
+            ml_service.evaluate_metrics,
             evaluation_request.y_true,
             evaluation_request.y_pred,
             evaluation_request.task_type
@@ -49,3 +59,102 @@ async def evaluate(evaluation_request: EvaluationRequest):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
+
+
+@router.post("/curves", response_model=CurvesResponse)
+async def curves(curves_request: CurvesRequest):
+    """Per-class ROC and precision-recall curves with AUC / average precision"""
+    try:
+        result = await executors.run(
+            "metrics",
+            roc_pr_curves,
+            curves_request.y_true,
+            curves_request.y_score,
+            curves_request.classes,
+            curves_request.max_points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Curve calculation failed: {str(e)}")
+    
+    return CurvesResponse(success=True, curves=result, message="Curves calculated successfully")
+
+
+def _get_session(session_id: str) -> MetricsSession:
+    try:
+        return metrics_sessions.get(session_id)
+    except MetricsSessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+
+def _session_response(session: MetricsSession, message: str,
+                       include_metrics: bool = False) -> MetricsSessionResponse:
+    metrics = None
+    if include_metrics:
+        try:
+            metrics = session.metrics()
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    return MetricsSessionResponse(
+        success=True,
+        metrics=metrics,
+        message=message,
+        **session.status()
+    )
+
+
+@router.post("/sessions", response_model=MetricsSessionResponse, status_code=201)
+async def create_session(session_request: MetricsSessionRequest):
+    """Open an incremental metrics session"""
+    try:
+        session = metrics_sessions.create(session_request.task_type, session_request.classes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _session_response(session, "Metrics session created")
+
+
+@router.post("/sessions/{session_id}/batches", response_model=MetricsSessionResponse)
+async def add_batch(session_id: str, batch: MetricsBatchRequest):
+    """
+    Add a batch of (y_true, y_pred[, proba]) to a session. Only the batch's
+    sufficient statistics are kept.
+    """
+    try:
+        session = _get_session(session_id)
+        
+        if len(batch.y_true) != len(batch.y_pred):
+            raise HTTPException(
+                status_code=400, 
+                detail="y_true and y_pred must have the same length"
+            )
+        
+        try:
+            partial = await executors.run(
+                "metrics", batch_statistics, session.task_type,
+                batch.y_true, batch.y_pred, batch.proba, session.classes
+            )
+            session.merge(partial)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return _session_response(session, "Batch added")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Adding batch failed: {str(e)}")
+
+
+@router.get("/sessions/{session_id}", response_model=MetricsSessionResponse)
+async def get_session_metrics(session_id: str):
+    """Current metrics of a session"""
+    return _session_response(_get_session(session_id), "Metrics calculated successfully", include_metrics=True)
+
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """Close a metrics session"""
+    if not metrics_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Metrics session '{session_id}' not found")
+    return {"success": True, "message": "Metrics session deleted"}
@@ -2,15 +2,31 @@
 Model API endpoints for MVP
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional
+import itertools
+import numpy as np
+import pandas as pd
 import os
 import uuid
 from datetime import datetime
 
 from app.services.ml_service import MLService
-from app.schemas.model import ModelUploadResponse, PredictionRequest, PredictionResponse
+from app.services.prediction_batcher import prediction_batcher
+from app.services.model_registry import ModelNotFoundError
+from app.schemas.model import (
+    ModelUploadResponse, PredictionRequest, PredictionResponse, BatchScoreRequest, BatchScoreResponse,
+    ModelComparisonRequest, ModelComparisonResponse, ExplainRequest, ExplainResponse
+)
 from app.core.config import settings
+from app.core.executors import executors
+from app.utils.files import save_upload_file, UploadTooLargeError
+from app.utils import codecs
+from app.utils.responses import NumpyJSONResponse
 
 # Create router
 router = APIRouter()
@@ -43,13 +59,17 @@ async def upload_model(file: UploadFile = File(...)):
         filename = f"{file_id}{file_ext}"
         file_path = os.path.join(settings.MODEL_UPLOAD_DIR, filename)
         
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Copy the spooled file to disk in chunks (UploadLimitMiddleware already
+        # refused bodies over the limit); the file itself is checked exactly
+        try:
+            size_bytes, sha256 = await save_upload_file(
+                file, file_path, settings.MAX_FILE_SIZE, settings.UPLOAD_CHUNK_SIZE
+            )
+        except UploadTooLargeError:
+            raise HTTPException(status_code=400, detail="File too large")
         
-        # Load model to get info
-        model_info = ml_service.load_model(file_path)
+        # Load model to get info (in-process, it populates the shared registry)
+        model_info = await run_in_threadpool(ml_service.load_model, file_path)
         if not model_info["success"]:
             # Clean up file if loading failed
             os.remove(file_path)
@@ -57,11 +77,13 @@ async def upload_model(file: UploadFile = File(...)):
         
         return ModelUploadResponse(
             success=True,
+            model_id=model_info["model_id"],
             filename=filename,
             file_path=file_path,
             model_type="sklearn",  # Default for MVP
             algorithm=model_info["model_info"]["algorithm"],
-            size_bytes=file.size,
+            size_bytes=size_bytes,
+            sha256=sha256,
             uploaded_at=datetime.now(),
             message="Model uploaded successfully"
         )
@@ -72,25 +94,260 @@ async def upload_model(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict(prediction_request: PredictionRequest):
-    """Make predictions using the loaded model"""
+@router.post(
+    "/predict",
+    response_model=PredictionResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                codecs.JSON: {"schema": PredictionRequest.model_json_schema()},
+                codecs.MSGPACK: {},
+                codecs.NPY: {},
+                codecs.ARROW: {},
+            },
+        }
+    },
+)
+async def predict(request: Request, model_id: Optional[str] = None, columns: Optional[str] = None):
+    """
+    Make predictions using the requested model (the latest upload by default).
+    
+    Besides row-oriented JSON, the body may be columnar JSON/msgpack
+    ({"columns": [...], "data": {column: [...]}}), an NPY array or an Arrow
+    IPC stream, selected by Content-Type. Binary bodies take `model_id` and,
+    for NPY, comma-separated `columns` as query parameters. The Accept header
+    selects a JSON, NPY, Arrow or msgpack response.
+    """
+    try:
+        try:
+            content_type = codecs.media_type(request.headers.get("content-type"))
+            response_type = codecs.negotiate(request.headers.get("accept"))
+            payload = codecs.decode_body(await request.body(), content_type)
+        except codecs.UnsupportedMediaTypeError as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+        
+        if isinstance(payload, dict):
+            model_id = payload.get("model_id") or model_id
+        
+        # Resolve the default model here so process-pool workers get a concrete id
+        model_id = model_id or ml_service.registry.default_model_id
+        
+        # Row-oriented JSON keeps its original path, including batching
+        if response_type == codecs.JSON and isinstance(payload, dict) and not codecs.is_columnar(payload):
+            return await _predict_rows(payload, model_id)
+        
+        try:
+            entry = await run_in_threadpool(ml_service.registry.get, model_id)
+        except ModelNotFoundError as e:
+            raise HTTPException(status_code=400, detail=ml_service.model_not_found(model_id, e)["message"])
+        
+        try:
+            frame = _payload_to_frame(payload, columns, entry.model)
+            predictions, probabilities = await executors.run(
+                "inference", ml_service.predict_frame, entry.model_id, frame
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Prediction failed: {str(e)}")
+        
+        result = ml_service.prediction_result(entry, predictions, probabilities)
+        if response_type == codecs.JSON:
+            return NumpyJSONResponse(result)
+        
+        classes = getattr(entry.model, "classes_", None)
+        return Response(
+            content=codecs.encode_predictions(
+                predictions, probabilities, result["model_info"], response_type,
+                classes=classes.tolist() if classes is not None else None
+            ),
+            media_type=response_type
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+
+async def _predict_rows(payload: Dict[str, Any], model_id: Optional[str]) -> NumpyJSONResponse:
+    """Predict a row-oriented JSON body ({"data": [{...}, ...]})"""
+    try:
+        prediction_request = PredictionRequest.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    # Make predictions, coalescing concurrent requests when enabled
+    if settings.PREDICT_BATCHING_ENABLED:
+        result = await prediction_batcher.predict(prediction_request.data, model_id)
+    else:
+        result = await executors.run("inference", ml_service.predict, prediction_request.data, model_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return NumpyJSONResponse({
+        "success": True,
+        "predictions": result["predictions"],
+        "probabilities": result.get("probabilities"),
+        "model_info": result["model_info"],
+        "message": result["message"]
+    })
+
+
+def _payload_to_frame(payload: Any, columns: Optional[str], model: Any) -> Any:
+    """Turn any decoded request body into model input"""
+    if isinstance(payload, pd.DataFrame):
+        return payload
+    
+    if isinstance(payload, np.ndarray):
+        names = columns.split(",") if columns else getattr(model, "feature_names_in_", None)
+        if names is None:
+            return payload
+        return pd.DataFrame(payload, columns=list(names), copy=False)
+    
+    if codecs.is_columnar(payload):
+        return codecs.columnar_to_frame(payload)
+    
+    # Row-oriented body with a binary response
+    data = PredictionRequest.model_validate(payload).data
+    return pd.DataFrame([data] if isinstance(data, dict) else data)
+
+
+@router.post("/explain", response_model=ExplainResponse)
+async def explain(explain_request: ExplainRequest):
+    """
+    Predict and explain a few rows (same `data` format as /predict).
+    
+    Each model's explainer is built once and cached with the loaded model.
+    Linear and model-agnostic explainers need a background dataset the
+    first time (`background_dataset_id` or `background_path`); tree models
+    do not.
+    """
     try:
-        # Make predictions
-        result = ml_service.predict(prediction_request.data)
+        model_id = explain_request.model_id or ml_service.registry.default_model_id
+        
+        background_path = None
+        if explain_request.background_dataset_id or explain_request.background_path:
+            background_path = _resolve_dataset_path(
+                explain_request.background_dataset_id, explain_request.background_path
+            )
         
+        result = await executors.run(
+            "inference", ml_service.explain, explain_request.data, model_id, background_path
+        )
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["message"])
         
-        return PredictionResponse(
-            success=True,
-            predictions=result["predictions"],
-            probabilities=result.get("probabilities"),
-            model_info=result["model_info"],
-            message=result["message"]
+        return NumpyJSONResponse(result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Explanation failed: {str(e)}")
+
+
+def _resolve_dataset_path(dataset_id: Optional[str], dataset_path: Optional[str]) -> str:
+    """Dataset file for an upload id or an explicit path"""
+    if dataset_id:
+        try:
+            return ml_service.find_dataset(dataset_id)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    
+    if dataset_path:
+        if not os.path.exists(dataset_path):
+            raise HTTPException(status_code=404, detail="File not found")
+        return dataset_path
+    
+    raise HTTPException(status_code=400, detail="dataset_id or dataset_path is required")
+
+
+@router.post("/score-dataset", response_model=BatchScoreResponse)
+async def score_dataset(score_request: BatchScoreRequest):
+    """
+    Score a whole dataset file (by upload id or path) with a model.
+    
+    The file is read in `chunk_rows` chunks so memory stays bounded by the
+    chunk size. Results stream back as NDJSON or CSV, or with
+    `output="file"` are written to a results file whose path is returned.
+    """
+    try:
+        model_id = score_request.model_id or ml_service.registry.default_model_id
+        try:
+            entry = await run_in_threadpool(ml_service.registry.get, model_id)
+        except ModelNotFoundError as e:
+            raise HTTPException(status_code=400, detail=ml_service.model_not_found(model_id, e)["message"])
+        
+        dataset_path = _resolve_dataset_path(score_request.dataset_id, score_request.dataset_path)
+        
+        args = (
+            entry.model_id, dataset_path, score_request.format,
+            score_request.chunk_rows, score_request.target_column
+        )
+        
+        if score_request.output == "file":
+            result = await executors.run("inference", ml_service.write_scores, *args)
+            if not result["success"]:
+                raise HTTPException(status_code=400, detail=result["message"])
+            return BatchScoreResponse(
+                success=True,
+                model_id=entry.model_id,
+                dataset_path=dataset_path,
+                results_path=result["results_path"],
+                size_bytes=result["size_bytes"],
+                message=result["message"]
+            )
+        
+        # Score the first chunk up front so bad input fails with a status code
+        # instead of a truncated stream
+        blocks = ml_service.score_dataset(*args)
+        try:
+            first = await run_in_threadpool(next, blocks, b"")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Batch scoring failed: {str(e)}")
+        
+        media_type = codecs.NDJSON if score_request.format == "ndjson" else codecs.CSV
+        return StreamingResponse(itertools.chain([first], blocks), media_type=media_type)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch scoring failed: {str(e)}")
+
+
+@router.post("/compare", response_model=ModelComparisonResponse)
+async def compare_models(comparison_request: ModelComparisonRequest):
+    """
+    Evaluate several models side by side on one dataset, returning a metrics
+    table plus curves aligned on shared grids
+    """
+    try:
+        dataset_path = _resolve_dataset_path(comparison_request.dataset_id, comparison_request.dataset_path)
+        
+        result = await ml_service.compare_models(
+            comparison_request.model_ids, dataset_path, comparison_request.target_column
         )
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["message"])
+        
+        return ModelComparisonResponse(**result)
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Model comparison failed: {str(e)}")
+
+
+@router.get("/registry")
+async def registry_status():
+    """Loaded models, model cache and batching statistics"""
+    return {
+        "loaded_model_ids": ml_service.registry.loaded_ids(),
+        **ml_service.registry.stats(),
+        "batching": {
+            "enabled": settings.PREDICT_BATCHING_ENABLED,
+            **prediction_batcher.stats()
+        }
+    }
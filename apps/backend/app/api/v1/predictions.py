@@ -0,0 +1,127 @@
+"""
+Stored prediction API endpoints
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.executors import executors
+from app.models.ml_model import Prediction
+from app.services import result_slices
+from app.services.array_store import array_cache
+from app.schemas.prediction import PredictionSummary, PredictionPage, ShapPage, TopRows
+from app.utils.responses import NumpyJSONResponse
+
+# Create router
+router = APIRouter()
+
+
+async def _get_prediction(prediction_id: int) -> Prediction:
+    prediction = await Prediction.get_or_none(id=prediction_id)
+    if prediction is None:
+        raise HTTPException(status_code=404, detail="Prediction not found")
+    if not prediction.arrays_path:
+        raise HTTPException(status_code=404, detail="Prediction has no stored arrays")
+    return prediction
+
+
+def _read(arrays_path: str, reader: Callable[..., Any], *args: Any) -> Any:
+    """Apply a result_slices reader to the cached bundle of a stored result"""
+    return reader(array_cache.get(arrays_path), *args)
+
+
+async def _slice(prediction: Prediction, reader: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return await executors.run("dataset", _read, prediction.arrays_path, reader, *args)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Prediction arrays not found")
+
+
+def _feature_names(prediction: Prediction) -> List[str]:
+    return (prediction.shap_values or {}).get("feature_names") or []
+
+
+@router.get("/{prediction_id}", response_model=PredictionSummary)
+async def get_prediction(prediction_id: int):
+    """Row counts, classes, features and array shapes of a stored prediction"""
+    prediction = await _get_prediction(prediction_id)
+    try:
+        summary = await _slice(
+            prediction, result_slices.result_summary, _feature_names(prediction)
+        )
+        return PredictionSummary(prediction_id=prediction.id, metrics=prediction.metrics, **summary)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read prediction: {str(e)}")
+
+
+@router.get("/{prediction_id}/predictions", response_model=PredictionPage)
+async def get_predictions(
+    prediction_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(settings.RESULT_PAGE_DEFAULT_ROWS, ge=1, le=settings.RESULT_PAGE_MAX_ROWS),
+    classes: Optional[List[str]] = Query(None)
+):
+    """Predictions, labels and probabilities of a row window"""
+    prediction = await _get_prediction(prediction_id)
+    try:
+        page = await _slice(
+            prediction, result_slices.prediction_page, offset, limit, classes
+        )
+        return NumpyJSONResponse({"prediction_id": prediction.id, **page})
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read predictions: {str(e)}")
+
+
+@router.get("/{prediction_id}/shap", response_model=ShapPage)
+async def get_shap_values(
+    prediction_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(settings.RESULT_PAGE_DEFAULT_ROWS, ge=1, le=settings.RESULT_PAGE_MAX_ROWS),
+    features: Optional[List[str]] = Query(None),
+    classes: Optional[List[str]] = Query(None)
+):
+    """SHAP and feature values of a window of explained rows"""
+    prediction = await _get_prediction(prediction_id)
+    try:
+        page = await _slice(
+            prediction, result_slices.shap_page, _feature_names(prediction),
+            offset, limit, features, classes
+        )
+        return NumpyJSONResponse({"prediction_id": prediction.id, **page})
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read SHAP values: {str(e)}")
+
+
+@router.get("/{prediction_id}/top", response_model=TopRows)
+async def get_top_rows(
+    prediction_id: int,
+    by: str = Query(result_slices.BY_SHAP, pattern="^(shap|error)$"),
+    k: int = Query(10, ge=1, le=settings.RESULT_PAGE_MAX_ROWS),
+    features: Optional[List[str]] = Query(None),
+    classes: Optional[List[str]] = Query(None)
+):
+    """Top-k rows by total |SHAP| over the selected features/classes or by error"""
+    prediction = await _get_prediction(prediction_id)
+    try:
+        top = await _slice(
+            prediction, result_slices.top_rows, _feature_names(prediction),
+            by, k, features, classes
+        )
+        return NumpyJSONResponse({"prediction_id": prediction.id, **top})
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rank rows: {str(e)}")
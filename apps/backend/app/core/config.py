@@ -3,7 +3,7 @@ Configuration settings for Meovis Backend
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
@@ -37,6 +37,8 @@ class Settings(BaseSettings):
     
     # File Upload
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+    MAX_DATASET_FILE_SIZE: int = 4 * 1024 * 1024 * 1024  # 4GB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1MB
     UPLOAD_DIR: str = "uploads"
     DATASET_UPLOAD_DIR: str = "uploads/datasets"
     MODEL_UPLOAD_DIR: str = "uploads/models"
@@ -49,7 +51,102 @@ class Settings(BaseSettings):
     # ML Settings
     SHAP_SAMPLE_SIZE: int = 1000
     MAX_FEATURES_FOR_SHAP: int = 50
-    
+    # Row-sharded TreeExplainer: rows per shard and workers of the
+    # "shap_shards" pool (1 disables); set SHAP_SAMPLE_SIZE to 0 to explain
+    # every row
+    SHAP_SHARD_ROWS: int = 250
+    SHAP_SHARD_WORKERS: int = 4
+    # KernelExplainer budget: background rows ("kmeans" or "sample"), rows
+    # explained, model evaluations per row and a wall-clock deadline after
+    # which the rows explained so far are returned
+    SHAP_KERNEL_BACKGROUND_METHOD: str = "kmeans"
+    SHAP_KERNEL_BACKGROUND_SIZE: int = 50
+    SHAP_KERNEL_EXPLAIN_SIZE: int = 100
+    SHAP_KERNEL_NSAMPLES: int = 200
+    SHAP_KERNEL_DEADLINE_SECONDS: float = 60.0
+    SHAP_KERNEL_BATCH_ROWS: int = 10
+    SHAP_CACHE_ENABLED: bool = True
+    SHAP_CACHE_DIR: str = "uploads/cache/shap"
+    SHAP_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1GB
+    FILE_HASH_CACHE_ENTRIES: int = 1024  # content digests memoized for cache keys
+
+    # Curves (points kept per ROC/PR curve after thinning)
+    CURVE_MAX_POINTS: int = 100
+
+    # Array Store ("float64" keeps full precision; "float32" or "float16"
+    # quantize stored floats to save space)
+    ARRAY_STORE_DIR: str = "uploads/arrays"
+    ARRAY_STORE_FLOAT_DTYPE: str = "float64"
+    ARRAY_STORE_CACHE_ENTRIES: int = 8
+
+    # Responses (round floats in array-heavy responses; None keeps full precision)
+    RESPONSE_FLOAT_DECIMALS: Optional[int] = None
+
+    # Stored Result Reads (rows per page)
+    RESULT_PAGE_DEFAULT_ROWS: int = 100
+    RESULT_PAGE_MAX_ROWS: int = 1000
+
+    # Dataset Preview
+    DATASET_PREVIEW_ROWS: int = 10
+    DATASET_DTYPE_SAMPLE_ROWS: int = 1000
+    DATASET_METADATA_CACHE_ENTRIES: int = 256
+    DATASET_STORE_MMAP: bool = True
+
+    # Model Registry
+    MODEL_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB
+    MODEL_CACHE_MAX_ENTRIES: int = 64
+
+    # Prediction Batching
+    PREDICT_BATCHING_ENABLED: bool = False
+    PREDICT_BATCH_MAX_WAIT_MS: float = 5.0
+    PREDICT_BATCH_MAX_ROWS: int = 512
+
+    # Executors ("thread" or "process" per operation type)
+    EXECUTOR_INFERENCE_KIND: str = "thread"
+    EXECUTOR_INFERENCE_WORKERS: int = 4
+    EXECUTOR_METRICS_KIND: str = "thread"
+    EXECUTOR_METRICS_WORKERS: int = 2
+    EXECUTOR_DATASET_KIND: str = "thread"
+    EXECUTOR_DATASET_WORKERS: int = 2
+    EXECUTOR_SHAP_KIND: str = "process"
+    EXECUTOR_SHAP_WORKERS: int = 2
+    EXECUTOR_COMPARE_KIND: str = "process"
+    EXECUTOR_COMPARE_WORKERS: int = 4
+    EXECUTOR_SHAP_SHARD_KIND: str = "process"  # sized by SHAP_SHARD_WORKERS
+
+    # Batch Scoring
+    BATCH_SCORE_CHUNK_ROWS: int = 50_000
+    BATCH_SCORE_RESULTS_DIR: str = "uploads/results"
+
+    # Metrics Sessions
+    METRICS_SESSION_MAX_SESSIONS: int = 1000
+    METRICS_SESSION_TTL_SECONDS: int = 3600
+
+    # Instrumentation (Server-Timing response headers with per-stage durations)
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Memory Profiling (tracemalloc per stage; slows allocation-heavy code).
+    # Stages whose traced peak exceeds the threshold log their top
+    # allocation sites
+    MEMORY_PROFILING_ENABLED: bool = False
+    MEMORY_PROFILE_FRAMES: int = 8
+    MEMORY_PROFILE_THRESHOLD_MB: float = 512.0
+    MEMORY_PROFILE_TOP_SITES: int = 10
+    MEMORY_PROFILE_HISTORY: int = 200
+
+    # Startup Prewarm: modules to import ("shap", "sklearn") and models to
+    # load, optionally with their explainers (non-tree explainers need the
+    # background dataset). Runs in the background after startup unless
+    # PREWARM_BLOCKING holds startup until it is done
+    PREWARM_IMPORTS: List[str] = []
+    PREWARM_MODEL_IDS: List[str] = []
+    PREWARM_EXPLAINERS: bool = False
+    PREWARM_BACKGROUND_PATH: Optional[str] = None
+    PREWARM_BLOCKING: bool = False
+
+    # Analysis Jobs
+    ANALYSIS_MAX_CONCURRENT_JOBS: int = 2
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -58,7 +155,12 @@ class Settings(BaseSettings):
 # Create settings instance
 settings = Settings()
 
-# Create upload directories if they don't exist
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-os.makedirs(settings.DATASET_UPLOAD_DIR, exist_ok=True)
-os.makedirs(settings.MODEL_UPLOAD_DIR, exist_ok=True)
+
+def create_upload_dirs() -> None:
+    """
+    Create the upload directories if they don't exist. Called on startup
+    rather than at import, so importing the app creates nothing on disk.
+    """
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    os.makedirs(settings.DATASET_UPLOAD_DIR, exist_ok=True)
+    os.makedirs(settings.MODEL_UPLOAD_DIR, exist_ok=True)
@@ -2,12 +2,23 @@
 Database configuration and initialization
 """
 
+from typing import Set
+
 from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
 from app.core.config import settings
 
 
+# Nullable columns added to existing tables after they were first created.
+# generate_schemas() only creates missing tables, so these are added with
+# ALTER TABLE on startup
+ADDED_COLUMNS = [
+    ("predictions", "arrays_path", "VARCHAR(500)"),
+]
+
+
 async def init_db():
-    """Initialize database connection and create tables"""
+    """Initialize database connection, create tables and add new columns"""
     await Tortoise.init(
         db_url=settings.DATABASE_URL,
         modules={"models": ["app.models.ml_model"]}
@@ -15,6 +26,24 @@ async def init_db():
     
     # Generate schemas
     await Tortoise.generate_schemas()
+    await add_missing_columns(Tortoise.get_connection("default"))
+
+
+async def _table_columns(conn: BaseDBAsyncClient, table: str) -> Set[str]:
+    if conn.capabilities.dialect == "sqlite":
+        rows = await conn.execute_query_dict(f"PRAGMA table_info({table})")
+        return {row["name"] for row in rows}
+    rows = await conn.execute_query_dict(
+        f"SELECT column_name FROM information_schema.columns WHERE table_name = '{table}'"
+    )
+    return {str(next(iter(row.values()))) for row in rows}
+
+
+async def add_missing_columns(conn: BaseDBAsyncClient) -> None:
+    """Add the ADDED_COLUMNS an existing database predates"""
+    for table, column, sql_type in ADDED_COLUMNS:
+        if column not in await _table_columns(conn, table):
+            await conn.execute_script(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type} NULL")
 
 
 async def close_db():
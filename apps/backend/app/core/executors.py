@@ -0,0 +1,136 @@
+"""
+Executor subsystem
+Runs blocking, CPU-bound work off the asyncio event loop
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class ExecutorPool:
+    """
+    A lazily created thread or process pool with in-flight accounting.
+
+    Work submitted to a process pool must be picklable: module-level
+    functions or methods of picklable objects, with picklable arguments.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unsupported executor kind for '{name}': {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def executor(self) -> Executor:
+        """The underlying pool, created on first use"""
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"meovis-{self.name}"
+                    )
+            return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in the pool and await its result. Thread
+        pools run it in a copy of the caller's context (as asyncio.to_thread
+        does), so request-scoped state such as stage timings carries over.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if self.kind == "thread":
+            call = functools.partial(contextvars.copy_context().run, call)
+
+        with self._lock:
+            self.submitted += 1
+        try:
+            result = await loop.run_in_executor(self.executor, call)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.completed += 1
+
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool statistics. Pools run work in FIFO order, so everything beyond
+        the first `max_workers` in-flight calls is waiting in the queue.
+        """
+        with self._lock:
+            in_flight = self.submitted - self.completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "in_flight": in_flight,
+                "running": min(in_flight, self.max_workers),
+                "queue_depth": max(0, in_flight - self.max_workers),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self) -> None:
+        """Shut down the underlying pool if it was started"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorManager:
+    """One executor pool per operation type"""
+
+    def __init__(self, pools: Dict[str, ExecutorPool]):
+        self.pools = pools
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking work on the pool configured for `operation`"""
+        pool = self.pools.get(operation)
+        if pool is None:
+            raise ValueError(f"Unknown executor operation: {operation}")
+        return await pool.run(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistics for every pool"""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def shutdown(self) -> None:
+        """Shut down every pool"""
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+# Shared executors, one pool per operation type
+executors = ExecutorManager({
+    "inference": ExecutorPool("inference", settings.EXECUTOR_INFERENCE_KIND, settings.EXECUTOR_INFERENCE_WORKERS),
+    "metrics": ExecutorPool("metrics", settings.EXECUTOR_METRICS_KIND, settings.EXECUTOR_METRICS_WORKERS),
+    "dataset": ExecutorPool("dataset", settings.EXECUTOR_DATASET_KIND, settings.EXECUTOR_DATASET_WORKERS),
+    "shap": ExecutorPool("shap", settings.EXECUTOR_SHAP_KIND, settings.EXECUTOR_SHAP_WORKERS),
+    "compare": ExecutorPool("compare", settings.EXECUTOR_COMPARE_KIND, settings.EXECUTOR_COMPARE_WORKERS),
+    "shap_shards": ExecutorPool("shap_shards", settings.EXECUTOR_SHAP_SHARD_KIND, settings.SHAP_SHARD_WORKERS),
+})
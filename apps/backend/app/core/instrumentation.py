@@ -0,0 +1,306 @@
+"""
+Instrumentation
+Request and stage timers, counters and Prometheus text exposition
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+from app.core.memory_profiling import memory_profiler
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond predictions up to multi-minute analyses
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def lines(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class CallbackMetric(_Metric):
+    """
+    Counter or gauge read from existing state at scrape time, so components
+    that already keep their own statistics are not counted twice
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "counter"):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def lines(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self.callback()
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+                 kind: str = "counter") -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, labelnames, callback, kind))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry exposed on /metrics; work done inside process-pool
+# workers is only visible through the stage timers around it
+metrics_registry = MetricsRegistry()
+
+REQUEST_LATENCY = metrics_registry.histogram(
+    "meovis_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+STAGE_LATENCY = metrics_registry.histogram(
+    "meovis_stage_duration_seconds", "Duration of named pipeline stages", ("stage",)
+)
+MODELS_LOADED = metrics_registry.counter(
+    "meovis_models_loaded_total", "Model files deserialized from disk"
+)
+ROWS_SCORED = metrics_registry.counter(
+    "meovis_rows_scored_total", "Rows passed through model predict"
+)
+
+
+# Stages finished during the current request, for the Server-Timing header
+_request_stages: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_stages", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a named stage.
+
+    The duration goes to the stage histogram and, when the block runs in a
+    request's context (the event loop or run_in_threadpool), to that
+    request's Server-Timing header. With memory profiling on, the stage's
+    allocations are recorded as well.
+    """
+    start = time.perf_counter()
+    try:
+        with memory_profiler.track(name):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, stage=name)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((name, elapsed))
+
+
+def _server_timing(stages: List[Tuple[str, float]], total: float) -> str:
+    """Server-Timing value; repeated stages are summed"""
+    durations: Dict[str, float] = {}
+    for name, elapsed in stages:
+        durations[name] = durations.get(name, 0.0) + elapsed
+    entries = [f"{name.replace('.', '-')};dur={elapsed * 1000:.1f}" for name, elapsed in durations.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """
+    Matched route as a template (/predictions/{prediction_id}): the route's
+    own path behind the prefixes of the mounts and routers it was matched
+    through; unmatched requests share one label to bound cardinality
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI keeps the include_router prefix on the included router rather
+    # than on the route; older versions copy the route with it prepended
+    included = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    path = getattr(route, "path_format", None) or route.path
+    return scope.get("root_path", "") + prefix + path
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware recording per-route latency and, when enabled, adding a
+    Server-Timing header that lists the stages run for the request
+    """
+
+    def __init__(self, app: Any, server_timing: Optional[bool] = None):
+        self.app = app
+        self.server_timing = settings.SERVER_TIMING_ENABLED if server_timing is None else server_timing
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: List[Tuple[str, float]] = []
+        origin = Headers(scope=scope).get("origin")
+        token = _request_stages.set(stages)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(stages, time.perf_counter() - start))
+                    # Browsers hide Server-Timing from cross-origin pages without this
+                    if origin in settings.ALLOWED_ORIGINS:
+                        headers.append("Timing-Allow-Origin", origin)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start, method=scope["method"], route=route_template(scope), status=status
+            )
@@ -0,0 +1,236 @@
+"""
+Memory profiling
+Opt-in per-stage peak RSS and traced allocation records
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+# Allocation sites are attributed to the innermost frame in this package
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux), or None where unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of the process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class _Frame:
+    """Bookkeeping for one open stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.rss_before = rss_bytes()
+        self.traced_before = tracemalloc.get_traced_memory()[0]
+        self.child_peak = 0
+
+
+class MemoryProfiler:
+    """
+    Records traced-allocation peaks and RSS around named stages.
+
+    Tracing is off unless MEMORY_PROFILING_ENABLED is set (or start() is
+    called) because tracemalloc slows allocation-heavy code noticeably.
+    tracemalloc has one process-wide peak, so overlapping stages from
+    concurrent requests see each other's allocations, and work done in
+    process-pool workers is not traced; profile with thread executors and
+    one request at a time for exact numbers.
+    """
+
+    def __init__(self, history: int, threshold_mb: float, top_sites: int):
+        self.threshold_bytes = int(threshold_mb * _MB)
+        self.top_sites = top_sites
+        self._records: "deque[Dict[str, Any]]" = deque(maxlen=history)
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._open: contextvars.ContextVar[Optional[_Frame]] = contextvars.ContextVar(
+            "memory_stage", default=None
+        )
+        self._collected: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+            "memory_records", default=None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._stages.clear()
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Record memory use of a block; a no-op while tracing is off"""
+        if not self.enabled:
+            yield
+            return
+
+        parent = self._open.get()
+        frame = _Frame(name)
+        # The global peak is reset per stage; enclosing stages fold in the
+        # peaks of the stages they contain
+        if parent is not None:
+            parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        token = self._open.set(frame)
+        try:
+            yield
+        finally:
+            self._open.reset(token)
+            if self.enabled:
+                self._finish(frame, parent)
+
+    def _finish(self, frame: _Frame, parent: Optional[_Frame]) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame.child_peak)
+        if parent is not None:
+            parent.child_peak = max(parent.child_peak, peak)
+
+        rss_after = rss_bytes()
+        record = {
+            "stage": frame.name,
+            "timestamp": time.time(),
+            "duration_seconds": time.perf_counter() - frame.start,
+            "traced_peak_bytes": max(0, peak - frame.traced_before),
+            "traced_net_bytes": current - frame.traced_before,
+            "rss_before_bytes": frame.rss_before,
+            "rss_after_bytes": rss_after,
+            "max_rss_bytes": max_rss_bytes(),
+        }
+
+        with self._lock:
+            self._records.append(record)
+            summary = self._stages.setdefault(frame.name, {
+                "count": 0, "max_traced_peak_bytes": 0, "max_rss_after_bytes": 0
+            })
+            summary["count"] += 1
+            summary["max_traced_peak_bytes"] = max(summary["max_traced_peak_bytes"], record["traced_peak_bytes"])
+            summary["max_rss_after_bytes"] = max(summary["max_rss_after_bytes"], rss_after or 0)
+
+        collected = self._collected.get()
+        if collected is not None:
+            collected.append(record)
+
+        if record["traced_peak_bytes"] > self.threshold_bytes:
+            logger.warning(
+                "Stage %s peaked at %.1f MB traced (threshold %.1f MB); largest live allocations:\n%s",
+                frame.name, record["traced_peak_bytes"] / _MB, self.threshold_bytes / _MB,
+                "\n".join(
+                    f"  {site['size_bytes'] / _MB:.1f} MB in {site['count']} blocks at {site['location']}"
+                    + (f" (from {site['app_frame']})" if site["app_frame"] else "")
+                    for site in self.top_allocations()
+                )
+            )
+
+    @contextmanager
+    def collect(self) -> Iterator[Optional[List[Dict[str, Any]]]]:
+        """
+        Gather the records of stages finished inside the block (None while
+        tracing is off), e.g. to return them as a debug field
+        """
+        if not self.enabled:
+            yield None
+            return
+        records: List[Dict[str, Any]] = []
+        token = self._collected.set(records)
+        try:
+            yield records
+        finally:
+            self._collected.reset(token)
+
+    def top_allocations(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Allocation sites holding the most traced memory right now. With
+        MEMORY_PROFILE_FRAMES > 1, `app_frame` names the innermost calling
+        line in this application (e.g. the ml_service line behind a pandas
+        allocation).
+        """
+        if not self.enabled:
+            return []
+        statistics = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )).statistics("traceback")
+
+        sites = []
+        for stat in statistics[:limit or self.top_sites]:
+            # Frames run from the oldest call to the allocating line
+            frames = list(stat.traceback)[::-1]
+            innermost = frames[0]
+            app_frame = next((f for f in frames if f.filename.startswith(_APP_DIR)), None)
+            sites.append({
+                "location": f"{innermost.filename}:{innermost.lineno}",
+                "app_frame": f"{app_frame.filename}:{app_frame.lineno}" if app_frame else None,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            })
+        return sites
+
+    def report(self, top: int = 0) -> Dict[str, Any]:
+        """Process memory, per-stage maxima and the most recent stage records"""
+        current, peak = tracemalloc.get_traced_memory() if self.enabled else (None, None)
+        with self._lock:
+            stages = {name: dict(summary) for name, summary in self._stages.items()}
+            recent = list(self._records)
+        return {
+            "enabled": self.enabled,
+            "rss_bytes": rss_bytes(),
+            "max_rss_bytes": max_rss_bytes(),
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "threshold_bytes": self.threshold_bytes,
+            "stages": stages,
+            "recent": recent,
+            "top_allocations": self.top_allocations(top) if top else [],
+        }
+
+
+# Shared profiler fed by instrumentation.stage()
+memory_profiler = MemoryProfiler(
+    history=settings.MEMORY_PROFILE_HISTORY,
+    threshold_mb=settings.MEMORY_PROFILE_THRESHOLD_MB,
+    top_sites=settings.MEMORY_PROFILE_TOP_SITES,
+)
@@ -0,0 +1,73 @@
+"""
+Startup
+Import and startup phase timings of this worker
+"""
+
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Modules that dominate import time; they are loaded on first use or by the
+# prewarm step, and the startup report shows whether they are in memory yet
+HEAVY_MODULES = ("shap", "sklearn", "joblib", "numba")
+
+
+class StartupTimer:
+    """
+    Durations of the app import and of each startup phase.
+
+    Created when this module is first imported, which app.main does before
+    anything else, so `import_seconds` covers importing the whole app.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.import_seconds: Optional[float] = None
+        self.ready_seconds: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.prewarm: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def mark_imported(self) -> None:
+        self.import_seconds = time.perf_counter() - self.started
+
+    def mark_ready(self) -> None:
+        """Record the time from import start to the end of startup and log the breakdown"""
+        self.ready_seconds = time.perf_counter() - self.started
+        logger.info(
+            "Ready in %.3fs (import %.3fs; %s)",
+            self.ready_seconds, self.import_seconds or 0.0,
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items()) or "no phases"
+        )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = time.perf_counter() - start
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = dict(self.phases)
+        return {
+            "import_seconds": self.import_seconds,
+            "phases": phases,
+            "ready": self.ready_seconds is not None,
+            "ready_seconds": self.ready_seconds,
+            "prewarm": self.prewarm,
+            "heavy_modules_loaded": {name: name in sys.modules for name in HEAVY_MODULES},
+        }
+
+
+# Timer of this worker process
+startup_timer = StartupTimer()
@@ -3,16 +3,32 @@ Meovis Backend - FastAPI Application
 Main entry point for the ML visualization API
 """
 
+# Imported first so the import timing covers everything below
+from app.core.startup import startup_timer
+
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from app.core.config import settings
+from app.core.config import settings, create_upload_dirs
 from app.core.database import init_db, close_db
-from app.api.v1 import models, datasets, metrics
+from app.core.executors import executors
+from app.core.instrumentation import InstrumentationMiddleware, metrics_registry, CONTENT_TYPE
+from app.core.memory_profiling import memory_profiler
+from app.services.model_registry import model_registry
+from app.services.dataset_metadata import dataset_metadata_cache
+from app.services.shap_cache import shap_cache
+from app.services.analysis_jobs import analysis_jobs
+from app.services.array_store import array_cache
+from app.services.prewarm import prewarm
+from app.utils.files import UploadLimitMiddleware
+from app.api.v1 import models, datasets, metrics, analysis, predictions
 
 # Create FastAPI app
 app = FastAPI(
@@ -28,6 +44,12 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Upload size limits, enforced before the multipart body is read
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/api/v1/models/upload-model": lambda: settings.MAX_FILE_SIZE,
+    "/api/v1/datasets/upload-dataset": lambda: settings.MAX_DATASET_FILE_SIZE,
+})
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,22 +65,57 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure for production
 )
 
+# Per-route latency histograms and Server-Timing headers
+app.add_middleware(InstrumentationMiddleware)
+
 # Include routers
 app.include_router(models.router, prefix="/api/v1/models", tags=["models"])
 app.include_router(datasets.router, prefix="/api/v1/datasets", tags=["datasets"])
 app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["analysis"])
+app.include_router(predictions.router, prefix="/api/v1/predictions", tags=["predictions"])
+
+
+async def _prewarm():
+    with startup_timer.phase("prewarm"):
+        startup_timer.prewarm = await prewarm()
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    await init_db()
+    """
+    Create upload directories, initialize database, resume interrupted
+    analysis jobs and start the prewarm step on startup
+    """
+    if settings.MEMORY_PROFILING_ENABLED:
+        memory_profiler.start(settings.MEMORY_PROFILE_FRAMES)
+    with startup_timer.phase("directories"):
+        create_upload_dirs()
+    with startup_timer.phase("database"):
+        await init_db()
+    with startup_timer.phase("resume_jobs"):
+        await analysis_jobs.resume()
+
+    app.state.prewarm_task = None
+    if settings.PREWARM_IMPORTS or settings.PREWARM_MODEL_IDS:
+        if settings.PREWARM_BLOCKING:
+            await _prewarm()
+        else:
+            # Serve requests while models load; /health/startup shows progress
+            app.state.prewarm_task = asyncio.create_task(_prewarm())
+    startup_timer.mark_ready()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database on shutdown"""
+    """Stop prewarm and analysis jobs, then close database, cached arrays and executor pools on shutdown"""
+    prewarm_task = getattr(app.state, "prewarm_task", None)
+    if prewarm_task is not None and not prewarm_task.done():
+        prewarm_task.cancel()
+    await analysis_jobs.shutdown()
     await close_db()
+    array_cache.clear()
+    executors.shutdown()
 
 
 @app.get("/")
@@ -77,6 +134,76 @@ async def health_check():
     return {"status": "healthy", "service": "meovis-api"}
 
 
+@app.get("/health/executors")
+async def executor_status():
+    """Queue depth and in-flight work per executor pool"""
+    return executors.stats()
+
+
+@app.get("/health/caches")
+async def cache_status():
+    """Hit/miss counters and sizes of the result caches"""
+    return {
+        "shap": shap_cache.stats(),
+        "dataset_metadata": {
+            "hits": dataset_metadata_cache.hits,
+            "misses": dataset_metadata_cache.misses
+        }
+    }
+
+
+@app.get("/health/memory")
+async def memory_status(top: int = 0):
+    """
+    Process memory plus per-stage traced peaks and RSS (recorded when
+    MEMORY_PROFILING_ENABLED is set); `top` adds the largest live
+    allocation sites
+    """
+    return memory_profiler.report(top=top)
+
+
+@app.get("/health/startup")
+async def startup_status():
+    """
+    Import and startup phase timings, prewarm results (null until prewarm
+    finishes) and which heavy ML modules are loaded
+    """
+    return startup_timer.report()
+
+
+def _cache_requests():
+    """Hit/miss counters the caches already keep, read at scrape time"""
+    for name, cache in (
+        ("model", model_registry), ("shap", shap_cache), ("dataset_metadata", dataset_metadata_cache)
+    ):
+        yield (name, "hit"), cache.hits
+        yield (name, "miss"), cache.misses
+
+
+metrics_registry.callback(
+    "meovis_cache_requests_total", "Cache lookups by cache and result", ("cache", "result"), _cache_requests
+)
+metrics_registry.callback(
+    "meovis_models_in_memory", "Models currently held by the model registry", (),
+    lambda: [((), model_registry.stats()["loaded_models"])], kind="gauge"
+)
+metrics_registry.callback(
+    "meovis_startup_phase_seconds", "Duration of app import and each startup phase", ("phase",),
+    lambda: [(("import",), startup_timer.import_seconds or 0.0)]
+    + [((name,), seconds) for name, seconds in startup_timer.report()["phases"].items()],
+    kind="gauge"
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request, stage, model and cache metrics in Prometheus text format"""
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
+startup_timer.mark_imported()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -60,9 +60,10 @@ class Prediction(models.Model):
     id = fields.IntField(pk=True)
     model = fields.ForeignKeyField("models.MLModel", related_name="predictions", description="Associated model")
     dataset = fields.ForeignKeyField("models.Dataset", related_name="predictions", description="Associated dataset")
-    predictions = fields.JSONField(description="Model predictions")
+    predictions = fields.JSONField(description="Prediction array summaries")
     metrics = fields.JSONField(description="Performance metrics")
-    shap_values = fields.JSONField(null=True, description="SHAP values")
+    shap_values = fields.JSONField(null=True, description="SHAP metadata and array summaries")
+    arrays_path = fields.CharField(max_length=500, null=True, description="Compressed file holding predictions, probabilities and SHAP arrays")
     created_at = fields.DatetimeField(auto_now_add=True, description="Creation timestamp")
     
     class Meta:
@@ -73,5 +74,29 @@ class Prediction(models.Model):
         return f"Prediction {self.id} - {self.model.name} on {self.dataset.name}"
 
 
+class AnalysisJob(models.Model):
+    """Background model analysis job"""
+    
+    id = fields.IntField(pk=True)
+    model = fields.ForeignKeyField("models.MLModel", related_name="analysis_jobs", description="Model to analyze")
+    dataset = fields.ForeignKeyField("models.Dataset", related_name="analysis_jobs", description="Dataset to analyze with")
+    status = fields.CharField(max_length=20, default="queued", description="queued, running, completed, failed or cancelled")
+    stage = fields.CharField(max_length=20, null=True, description="Current stage (load, predict, metrics, shap, persist)")
+    progress = fields.FloatField(default=0.0, description="Completed fraction between 0 and 1")
+    error = fields.TextField(null=True, description="Failure reason")
+    result = fields.JSONField(null=True, description="Analysis result")
+    prediction = fields.ForeignKeyField("models.Prediction", related_name="analysis_jobs", null=True, description="Stored prediction results")
+    created_at = fields.DatetimeField(auto_now_add=True, description="Creation timestamp")
+    started_at = fields.DatetimeField(null=True, description="Start timestamp")
+    finished_at = fields.DatetimeField(null=True, description="Completion timestamp")
+    
+    class Meta:
+        table = "analysis_jobs"
+        table_description = "Background model analysis jobs"
+    
+    def __str__(self):
+        return f"AnalysisJob {self.id} ({self.status})"
+
+
 # Note: Pydantic models are defined in schemas/ directory
 # This avoids conflicts with Tortoise ORM model_config field
@@ -0,0 +1,42 @@
+"""
+Analysis job schemas for API requests and responses
+"""
+
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+
+class AnalysisJobRequest(BaseModel):
+    """Request schema for submitting an analysis job"""
+    model_id: str
+    dataset_path: str
+    target_column: Optional[str] = None
+
+
+class AnalysisJobStatus(BaseModel):
+    """Status of an analysis job"""
+    job_id: int
+    status: str
+    stage: Optional[str] = None
+    progress: float
+    error: Optional[str] = None
+    prediction_id: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class AnalysisJobProgress(BaseModel):
+    """Progress of an analysis job"""
+    job_id: int
+    status: str
+    stage: Optional[str] = None
+    progress: float
+
+
+class AnalysisJobResult(BaseModel):
+    """Result of a completed analysis job"""
+    job_id: int
+    status: str
+    result: Dict[str, Any]
@@ -14,6 +14,8 @@ class DatasetUploadResponse(BaseModel):
     file_path: str
     shape: tuple
     columns: List[str]
+    size_bytes: int
+    sha256: str
     message: str
 
 
@@ -40,6 +40,45 @@ class EvaluationResponse(BaseModel):
     message: str
 
 
+class CurvesRequest(BaseModel):
+    """Request schema for ROC / PR curves"""
+    y_true: List[Union[int, float, str]]
+    y_score: Union[List[float], List[List[float]]]  # positive-class scores or per-class probabilities
+    classes: Optional[List[Union[int, float, str]]] = None  # y_score column order
+    max_points: Optional[int] = Field(None, ge=3)
+
+
+class CurvesResponse(BaseModel):
+    """Response schema for ROC / PR curves"""
+    success: bool
+    curves: Dict[str, Any]
+    message: str
+
+
+class MetricsSessionRequest(BaseModel):
+    """Request schema for opening a metrics session"""
+    task_type: str = "classification"  # "classification" or "regression"
+    classes: Optional[List[Union[int, float, str]]] = None  # proba column order, for log-loss
+
+
+class MetricsBatchRequest(BaseModel):
+    """Request schema for adding a batch to a metrics session"""
+    y_true: List[Union[int, float, str]]
+    y_pred: List[Union[int, float, str]]
+    proba: Optional[List[List[float]]] = None
+
+
+class MetricsSessionResponse(BaseModel):
+    """Response schema for a metrics session"""
+    success: bool
+    session_id: str
+    task_type: str
+    n_samples: int
+    batches: int
+    metrics: Optional[Dict[str, Any]] = None
+    message: str
+
+
 class MetricsSummary(BaseModel):
     """Summary of all metrics"""
     task_type: str
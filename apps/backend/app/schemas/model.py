@@ -3,18 +3,20 @@ Model schemas for API requests and responses
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Literal, Optional, Union
 from datetime import datetime
 
 
 class ModelUploadResponse(BaseModel):
     """Response schema for model upload"""
     success: bool
+    model_id: str
     filename: str
     file_path: str
     model_type: str
     algorithm: str
     size_bytes: int
+    sha256: str
     uploaded_at: datetime
     message: str
 
@@ -34,6 +36,20 @@ class PredictionResponse(BaseModel):
     message: str
 
 
+class ExplainRequest(PredictionRequest):
+    """Request schema for explaining predictions of a few rows"""
+    background_dataset_id: Optional[str] = None
+    background_path: Optional[str] = None
+
+
+class ExplainResponse(PredictionResponse):
+    """Response schema for explained predictions"""
+    feature_names: List[str]
+    shap_values: List[Any]
+    expected_value: Any = None
+    explainer: Dict[str, Any]
+
+
 class ModelInfo(BaseModel):
     """Model information schema"""
     filename: str
@@ -45,3 +61,43 @@ class ModelInfo(BaseModel):
     parameters: Optional[Dict[str, Any]] = None
     feature_names: Optional[List[str]] = None
     feature_importances: Optional[List[float]] = None
+
+
+class BatchScoreRequest(BaseModel):
+    """Request schema for scoring a whole dataset file"""
+    model_id: Optional[str] = None
+    dataset_id: Optional[str] = None
+    dataset_path: Optional[str] = None
+    target_column: Optional[str] = None
+    format: Literal["ndjson", "csv"] = "ndjson"
+    output: Literal["stream", "file"] = "stream"
+    chunk_rows: Optional[int] = Field(None, gt=0)
+
+
+class BatchScoreResponse(BaseModel):
+    """Response schema for batch scoring into a results file"""
+    success: bool
+    model_id: str
+    dataset_path: str
+    results_path: str
+    size_bytes: int
+    message: str
+
+
+class ModelComparisonRequest(BaseModel):
+    """Request schema for comparing models on one dataset"""
+    model_ids: List[str] = Field(..., min_length=1)
+    dataset_id: Optional[str] = None
+    dataset_path: Optional[str] = None
+    target_column: Optional[str] = None
+
+
+class ModelComparisonResponse(BaseModel):
+    """Response schema for a model comparison"""
+    success: bool
+    dataset_info: Dict[str, Any]
+    table: List[Dict[str, Any]]
+    models: List[Dict[str, Any]]
+    aligned_curves: Dict[str, Any]
+    failed: List[Dict[str, Any]]
+    message: str
@@ -0,0 +1,51 @@
+"""
+Stored prediction schemas for API responses
+"""
+
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+
+
+class PredictionSummary(BaseModel):
+    """Stored prediction result overview"""
+    prediction_id: int
+    rows: int
+    explained_rows: int
+    classes: Optional[List[Any]] = None
+    feature_names: List[str]
+    arrays: Dict[str, List[int]]
+    metrics: Dict[str, Any]
+
+
+class PredictionPage(BaseModel):
+    """A window of stored predictions"""
+    prediction_id: int
+    offset: int
+    total: int
+    rows: List[int]
+    predictions: List[Any]
+    y_true: Optional[List[Any]] = None
+    classes: Optional[List[Any]] = None
+    probabilities: Optional[List[List[float]]] = None
+
+
+class ShapPage(BaseModel):
+    """A window of stored SHAP values"""
+    prediction_id: int
+    offset: int
+    total: int
+    rows: List[int]
+    features: List[str]
+    classes: Optional[List[Any]] = None
+    shap_values: List[Any]
+    feature_values: Optional[List[List[Any]]] = None
+
+
+class TopRows(BaseModel):
+    """Rows ranked by |SHAP| or prediction error"""
+    prediction_id: int
+    by: str
+    rows: List[int]
+    scores: List[float]
+    predictions: List[Any]
+    y_true: Optional[List[Any]] = None
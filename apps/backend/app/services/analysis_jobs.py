@@ -0,0 +1,133 @@
+"""
+Analysis Jobs
+Background execution of analyze_model with persisted status and progress
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Set
+
+from app.core.config import settings
+from app.models.ml_model import AnalysisJob, MLModel, Dataset
+from app.services.ml_service import MLService
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisJobManager:
+    """
+    Runs analysis jobs on the event loop with bounded concurrency.
+
+    Job state lives in the AnalysisJob table, so queued and interrupted
+    jobs are picked up again by `resume()` after a restart.
+    """
+
+    def __init__(self, ml_service: MLService, max_concurrent: int):
+        self.ml_service = ml_service
+        self.max_concurrent = max(1, max_concurrent)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = False
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def submit(self, model: MLModel, dataset: Dataset) -> AnalysisJob:
+        """Create a queued job and schedule it"""
+        job = await AnalysisJob.create(model=model, dataset=dataset, status=JOB_QUEUED)
+        self._schedule(job.id)
+        return job
+
+    async def resume(self) -> int:
+        """Reschedule jobs that were queued or running when the process stopped"""
+        pending = await AnalysisJob.filter(status__in=[JOB_QUEUED, JOB_RUNNING]).values_list("id", flat=True)
+        for job_id in pending:
+            await AnalysisJob.filter(id=job_id).update(status=JOB_QUEUED, stage=None, progress=0.0)
+            self._schedule(job_id)
+        return len(pending)
+
+    def stats(self) -> dict:
+        """Scheduler statistics"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "scheduled": len(self._tasks),
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel scheduled jobs; they are resumed on the next startup"""
+        self._stopping = True
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._semaphore = None
+        self._stopping = False
+
+    def _schedule(self, job_id: int) -> None:
+        task = asyncio.ensure_future(self._run(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job_id: int) -> None:
+        """
+        Execute one job once a worker slot is free. Every exit path leaves
+        the job in a final state, or queued again when the manager is
+        shutting down so the next startup resumes it.
+        """
+        async with self.semaphore:
+            try:
+                job = await AnalysisJob.get(id=job_id).prefetch_related("model", "dataset")
+                await AnalysisJob.filter(id=job_id).update(
+                    status=JOB_RUNNING, started_at=datetime.now(timezone.utc)
+                )
+
+                async def progress(stage: str, fraction: float) -> None:
+                    await AnalysisJob.filter(id=job_id).update(stage=stage, progress=fraction)
+
+                result = await self.ml_service.analyze_model(job.model, job.dataset, progress=progress)
+                await AnalysisJob.filter(id=job_id).update(
+                    status=JOB_COMPLETED,
+                    stage=None,
+                    progress=1.0,
+                    result=result,
+                    prediction_id=result.get("prediction_id"),
+                    finished_at=datetime.now(timezone.utc)
+                )
+            except asyncio.CancelledError:
+                if self._stopping:
+                    await self._set_state(job_id, status=JOB_QUEUED, stage=None, progress=0.0)
+                else:
+                    await self._set_state(
+                        job_id, status=JOB_CANCELLED, error="Job was cancelled",
+                        finished_at=datetime.now(timezone.utc)
+                    )
+                raise
+            except Exception as e:
+                logger.exception("Analysis job %s failed", job_id)
+                await self._set_state(
+                    job_id, status=JOB_FAILED, error=str(e), finished_at=datetime.now(timezone.utc)
+                )
+
+    @staticmethod
+    async def _set_state(job_id: int, **fields) -> None:
+        """Record a job's final state; a failure here is logged, not raised"""
+        try:
+            await AnalysisJob.filter(id=job_id).update(**fields)
+        except Exception:
+            logger.exception("Could not record the state of analysis job %s", job_id)
+
+
+# Shared job manager
+analysis_jobs = AnalysisJobManager(MLService(), settings.ANALYSIS_MAX_CONCURRENT_JOBS)
@@ -0,0 +1,177 @@
+"""
+Array Store
+Compressed on-disk storage for large prediction and SHAP arrays
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def _storable(array: np.ndarray, float_dtype: str) -> np.ndarray:
+    """Quantize floats wider than `float_dtype` and make object arrays storable without pickle"""
+    if array.dtype.kind == "f" and array.dtype.itemsize > np.dtype(float_dtype).itemsize:
+        return array.astype(float_dtype)
+    if array.dtype.kind == "O":
+        return array.astype(str)
+    return array
+
+
+def summarize(array: np.ndarray) -> Dict[str, Any]:
+    """Shape, dtype and basic statistics of an array"""
+    summary: Dict[str, Any] = {"shape": list(array.shape), "dtype": str(array.dtype)}
+    if array.size and array.dtype.kind in "biuf":
+        values = array.astype(np.float64, copy=False)
+        summary.update({
+            "min": float(np.nanmin(values)),
+            "max": float(np.nanmax(values)),
+            "mean": float(np.nanmean(values)),
+        })
+    return summary
+
+
+def save_arrays(arrays: Dict[str, Optional[np.ndarray]],
+                float_dtype: Optional[str] = None) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Write arrays to a new compressed .npz file.
+
+    Floating point arrays wider than `float_dtype` (ARRAY_STORE_FLOAT_DTYPE by
+    default, float64) are narrowed to it, so the default is lossless. None
+    values are skipped. Returns the file path and a summary per stored
+    array.
+    """
+    float_dtype = float_dtype or settings.ARRAY_STORE_FLOAT_DTYPE
+    os.makedirs(settings.ARRAY_STORE_DIR, exist_ok=True)
+
+    stored = {}
+    summary = {}
+    for name, array in arrays.items():
+        if array is None:
+            continue
+        array = np.asarray(array)
+        summary[name] = summarize(array)
+        stored[name] = _storable(array, float_dtype)
+        summary[name]["stored_dtype"] = str(stored[name].dtype)
+
+    path = os.path.join(settings.ARRAY_STORE_DIR, f"{uuid.uuid4().hex}.npz")
+    staging = f"{path}.tmp"
+    with open(staging, "wb") as f:
+        np.savez_compressed(f, **stored)
+    os.replace(staging, path)
+
+    return path, summary
+
+
+class ArrayBundle:
+    """
+    Lazily decoded view of a stored .npz file; each array is only
+    decompressed when it is first accessed
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._npz = None
+        self._cache: Dict[str, np.ndarray] = {}
+        # NpzFile shares one file handle between its members
+        self._lock = threading.Lock()
+
+    def _file(self):
+        if self._npz is None:
+            self._npz = np.load(self.path, allow_pickle=False)
+        return self._npz
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._file().files
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = self._file()[name]
+            return self._cache[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+
+    def keys(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._file().files))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._npz is not None:
+                self._npz.close()
+                self._npz = None
+
+    def __enter__(self) -> "ArrayBundle":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_arrays(path: str) -> ArrayBundle:
+    """Open a stored array file for lazy reading"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Array file not found: {path}")
+    return ArrayBundle(path)
+
+
+class ArrayBundleCache:
+    """
+    LRU of open bundles, so paging through a stored result decompresses
+    each array once rather than once per request
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._bundles: "OrderedDict[str, ArrayBundle]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> ArrayBundle:
+        with self._lock:
+            bundle = self._bundles.get(path)
+            if bundle is not None:
+                self._bundles.move_to_end(path)
+                return bundle
+
+        bundle = open_arrays(path)
+        with self._lock:
+            # Keep the first bundle if another thread opened the same path
+            bundle = self._bundles.setdefault(path, bundle)
+            self._bundles.move_to_end(path)
+            while len(self._bundles) > self.max_entries:
+                _, evicted = self._bundles.popitem(last=False)
+                evicted.close()
+        return bundle
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            bundle = self._bundles.pop(path, None)
+        if bundle is not None:
+            bundle.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            bundles = list(self._bundles.values())
+            self._bundles.clear()
+        for bundle in bundles:
+            bundle.close()
+
+
+def delete_arrays(path: Optional[str]) -> None:
+    """Remove a stored array file"""
+    if path:
+        array_cache.discard(path)
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+# Shared cache of open bundles used by the result read endpoints
+array_cache = ArrayBundleCache(max_entries=settings.ARRAY_STORE_CACHE_ENTRIES)
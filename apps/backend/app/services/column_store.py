@@ -0,0 +1,284 @@
+"""
+Column Store
+Per-column binary copies of uploaded datasets for fast, memory-mapped reads
+"""
+
+import json
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+
+SCHEMA_FILE = "schema.json"
+STORE_SUFFIX = ".columns"
+# Names the build directory inside the store that readers should use
+CURRENT_FILE = "CURRENT"
+# String columns up to this many characters per value are stored as
+# fixed-width arrays (memory-mappable); longer ones are pickled
+MAX_FIXED_WIDTH_CHARS = 256
+
+
+def store_path(file_path: str) -> str:
+    """Directory holding the column store builds of a dataset file"""
+    return f"{file_path}{STORE_SUFFIX}"
+
+
+def _current_build(file_path: str) -> Optional[str]:
+    """Directory of the build the store currently points to, if any"""
+    root = store_path(file_path)
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return os.path.join(root, f.read().strip())
+    except FileNotFoundError:
+        # Stores written before builds were versioned keep their files at the root
+        return root if os.path.exists(os.path.join(root, SCHEMA_FILE)) else None
+
+
+def parse_dataset(file_path: str) -> pd.DataFrame:
+    """Parse a dataset file based on its extension"""
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path)
+    elif file_path.endswith('.json'):
+        return pd.read_json(file_path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {file_path}")
+
+
+def _source_signature(file_path: str) -> Dict[str, int]:
+    stat = os.stat(file_path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def read_schema(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the store schema of a dataset if the store exists and was built
+    from the current version of the source file
+    """
+    build = _current_build(file_path)
+    if build is None:
+        return None
+
+    try:
+        with open(os.path.join(build, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+    except FileNotFoundError:
+        # Replaced by a newer build since the pointer was read
+        return None
+
+    if schema.get("source") != _source_signature(file_path):
+        return None
+    schema["directory"] = build
+    return schema
+
+
+def build_column_store(file_path: str, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """
+    Convert a dataset into one .npy file per column plus a dtype schema.
+
+    Numeric, boolean and datetime columns are stored as plain arrays that can
+    be memory-mapped, and string columns as fixed-width unicode arrays with a
+    missing-value mask, which can be too. Other columns (mixed types,
+    categoricals, very long strings) are stored as pickled object arrays and
+    are always read whole.
+
+    Each build is written to its own directory inside the store and made
+    current by atomically replacing the CURRENT pointer, so concurrent
+    builders never share files and readers always find a complete build.
+    The previous build is only deleted once the new one is in place.
+    """
+    if df is None:
+        df = parse_dataset(file_path)
+
+    root = store_path(file_path)
+    build_name = f"build-{uuid.uuid4().hex}"
+    staging = os.path.join(root, build_name)
+    os.makedirs(staging)
+
+    try:
+        columns = []
+        for index, name in enumerate(df.columns):
+            values = df[name].to_numpy()
+            column = {"name": str(name), "dtype": str(df[name].dtype), "file": f"{index:05d}.npy"}
+            fixed = _fixed_width_strings(values, column["dtype"])
+            if fixed is not None:
+                column.update(mmap=True, encoding="unicode", mask=f"{index:05d}.mask.npy")
+                np.save(os.path.join(staging, column["file"]), fixed[0])
+                np.save(os.path.join(staging, column["mask"]), fixed[1])
+            else:
+                column["mmap"] = values.dtype != object
+                np.save(os.path.join(staging, column["file"]), values, allow_pickle=not column["mmap"])
+            columns.append(column)
+
+        schema = {
+            "source": _source_signature(file_path),
+            "rows": len(df),
+            "columns": columns,
+        }
+        with open(os.path.join(staging, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    previous = _current_build(file_path)
+    pointer = os.path.join(root, f"{CURRENT_FILE}.{build_name}.tmp")
+    with open(pointer, "w") as f:
+        f.write(build_name)
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+
+    if previous == root:
+        # Files of a pre-versioning store, now superseded
+        for name in os.listdir(root):
+            if name.endswith(".npy") or name == SCHEMA_FILE:
+                try:
+                    os.remove(os.path.join(root, name))
+                except FileNotFoundError:
+                    pass
+    elif previous is not None and previous != staging:
+        # Concurrent builders may each see the same previous build; at worst
+        # one superseded build is left behind until the next rebuild
+        shutil.rmtree(previous, ignore_errors=True)
+
+    schema["directory"] = staging
+    return schema
+
+
+def ensure_column_store(file_path: str) -> Dict[str, Any]:
+    """Return the schema of a current column store, building it if needed"""
+    return read_schema(file_path) or build_column_store(file_path)
+
+
+def _fixed_width_strings(values: np.ndarray, dtype: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Fixed-width unicode copy and missing-value mask of a column holding only
+    strings and missing values, or None for any other column
+    """
+    if dtype not in ("object", "str", "string") or values.dtype != object:
+        return None
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        return None
+
+    missing = pd.isna(values)
+    present = values[~missing]
+    width = max((len(value) for value in present), default=1)
+    if width > MAX_FIXED_WIDTH_CHARS:
+        return None
+
+    fixed = np.where(missing, "", values).astype(f"<U{max(width, 1)}")
+    return fixed, missing
+
+
+def _select(schema: Dict[str, Any], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+    wanted = schema["columns"]
+    if columns is None:
+        return wanted
+    by_name = {column["name"]: column for column in wanted}
+    missing = [name for name in columns if name not in by_name]
+    if missing:
+        raise KeyError(f"Columns not in dataset: {missing}")
+    return [by_name[name] for name in columns]
+
+
+def _open_column(directory: str, column: Dict[str, Any]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """A column's stored array (memory-mapped when allowed) and missing-value mask"""
+    path = os.path.join(directory, column["file"])
+    mmap_mode = "r" if settings.DATASET_STORE_MMAP else None
+    if not column["mmap"]:
+        return np.load(path, allow_pickle=True), None
+    mask = np.load(os.path.join(directory, column["mask"]), mmap_mode=mmap_mode) if "mask" in column else None
+    return np.load(path, mmap_mode=mmap_mode), mask
+
+
+_OpenColumns = Tuple[int, List[Tuple[Dict[str, Any], np.ndarray, Optional[np.ndarray]]]]
+
+
+def _open_columns(file_path: str, columns: Optional[List[str]]) -> Optional[_OpenColumns]:
+    """Row count and opened columns of a current store, or None without one"""
+    for attempt in range(2):
+        schema = read_schema(file_path)
+        if schema is None:
+            return None
+        try:
+            return schema["rows"], [
+                (column, *_open_column(schema["directory"], column)) for column in _select(schema, columns)
+            ]
+        except FileNotFoundError:
+            # The build was replaced (and removed) while it was being opened
+            if attempt:
+                raise
+    return None
+
+
+def _frame(opened: _OpenColumns, start: int, stop: int) -> pd.DataFrame:
+    """
+    Rows [start, stop) as a DataFrame. Numeric columns stay views of their
+    memory maps; string and pickled columns are converted for these rows only.
+    """
+    data = {}
+    for column, array, mask in opened[1]:
+        values = array[start:stop]
+        if column.get("encoding") == "unicode":
+            values = values.astype(object)
+            values[mask[start:stop]] = np.nan
+        if not column["mmap"] or column.get("encoding") == "unicode":
+            # Restore extension dtypes (strings, categoricals) of object columns
+            values = pd.Series(values, copy=False).astype(column["dtype"])
+        data[column["name"]] = values
+
+    # copy=False keeps the memory-mapped arrays as the column storage
+    frame = pd.DataFrame(data, copy=False)
+    if start:
+        frame.index = pd.RangeIndex(start, start + len(frame))
+    return frame
+
+
+def load_frame(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load a dataset as a DataFrame, from its column store when it is current.
+
+    Columns are memory-mapped read-only when DATASET_STORE_MMAP is set, so
+    only the pages that are actually touched are read from disk. A missing
+    or stale store is rebuilt from the source file.
+    """
+    opened = _open_columns(file_path, columns)
+    if opened is None:
+        df = parse_dataset(file_path)
+        build_column_store(file_path, df)
+        return df[columns] if columns is not None else df
+    return _frame(opened, 0, opened[0])
+
+
+def iter_chunks(file_path: str, chunk_rows: int,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield a dataset in consecutive chunks of at most `chunk_rows` rows.
+
+    A current column store is sliced through its memory maps, so numeric
+    and string columns only take memory for the current chunk (pickled
+    columns, see build_column_store, are read whole). Otherwise CSV files
+    are parsed chunk by chunk; JSON documents cannot be parsed
+    incrementally, so their store is built first.
+    """
+    opened = _open_columns(file_path, columns)
+    if opened is None:
+        if file_path.endswith('.csv'):
+            # usecols keeps file order; callers such as sklearn need theirs
+            for chunk in pd.read_csv(file_path, chunksize=chunk_rows, usecols=columns):
+                yield chunk[columns] if columns is not None else chunk
+            return
+        ensure_column_store(file_path)
+        opened = _open_columns(file_path, columns)
+
+    for start in range(0, opened[0], chunk_rows):
+        yield _frame(opened, start, min(start + chunk_rows, opened[0]))
+
+
+def remove_column_store(file_path: str) -> None:
+    """Delete the column store of a dataset"""
+    shutil.rmtree(store_path(file_path), ignore_errors=True)
@@ -0,0 +1,233 @@
+"""
+Curves
+ROC and precision-recall curves in O(n log n) with LTTB point thinning
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+# Plotted coordinates need no more precision than this
+_CURVE_DECIMALS = 6
+
+
+def binary_clf_curve(y_true: np.ndarray, y_score: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    False and true positive counts at every distinct score threshold,
+    highest threshold first (one sort plus a cumulative sum)
+    """
+    order = np.argsort(y_score, kind="mergesort")[::-1]
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    distinct = np.flatnonzero(np.diff(y_score))
+    threshold_idxs = np.r_[distinct, y_true.size - 1]
+    tps = np.cumsum(y_true, dtype=np.float64)[threshold_idxs]
+    fps = 1 + threshold_idxs - tps
+    return fps, tps, y_score[threshold_idxs]
+
+
+def _trapezoid(x: np.ndarray, y: np.ndarray) -> float:
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2.0))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets
+    downsampling. The first and last points are always kept; every bucket
+    in between keeps the point spanning the largest triangle with the
+    previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    kept = 0
+
+    for bucket in range(n_out - 2):
+        start = int(bucket * every) + 1
+        stop = int((bucket + 1) * every) + 1
+        next_stop = min(int((bucket + 2) * every) + 1, n)
+
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs(
+            (x[kept] - avg_x) * (y[start:stop] - y[kept])
+            - (x[kept] - x[start:stop]) * (avg_y - y[kept])
+        )
+        kept = start + int(np.argmax(area))
+        indices[bucket + 1] = kept
+
+    return indices
+
+
+def _thin(x: np.ndarray, y: np.ndarray, thresholds: np.ndarray,
+          max_points: int) -> Dict[str, List[Optional[float]]]:
+    keep = lttb_indices(x, y, max_points)
+    return {
+        "x": np.round(x[keep], _CURVE_DECIMALS).tolist(),
+        "y": np.round(y[keep], _CURVE_DECIMALS).tolist(),
+        # NaN marks the synthetic end points, which have no threshold
+        "thresholds": [None if np.isnan(t) else t for t in thresholds[keep].tolist()],
+    }
+
+
+def binary_curves(y_true: np.ndarray, y_score: np.ndarray, max_points: int) -> Dict[str, Any]:
+    """
+    ROC and PR curves plus ROC AUC and average precision for one positive
+    class. AUC and AP are computed on the full curves before thinning and
+    match roc_auc_score and average_precision_score.
+    """
+    y_true = np.asarray(y_true, dtype=bool)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    fps, tps, thresholds = binary_clf_curve(y_true, y_score)
+    positives, negatives = tps[-1], fps[-1]
+
+    result: Dict[str, Any] = {"positives": int(positives), "negatives": int(negatives)}
+
+    if positives == 0 or negatives == 0:
+        # Both curves are undefined without positive and negative samples
+        result["roc"] = None
+        result["pr"] = None
+        return result
+
+    fpr = np.r_[0.0, fps / negatives]
+    tpr = np.r_[0.0, tps / positives]
+    roc = _thin(fpr, tpr, np.r_[np.nan, thresholds], max_points)
+    result["roc"] = {
+        "fpr": roc["x"], "tpr": roc["y"], "thresholds": roc["thresholds"],
+        "auc": _trapezoid(fpr, tpr),
+    }
+
+    # Stop once full recall is reached, as precision_recall_curve does
+    last = int(tps.searchsorted(positives)) + 1
+    precision = tps[:last] / (tps[:last] + fps[:last])
+    recall = tps[:last] / positives
+    average_precision = float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+    recall = np.r_[0.0, recall]
+    precision = np.r_[1.0, precision]
+    pr = _thin(recall, precision, np.r_[np.nan, thresholds[:last]], max_points)
+    result["pr"] = {
+        "recall": pr["x"], "precision": pr["y"], "thresholds": pr["thresholds"],
+        "average_precision": average_precision,
+    }
+    return result
+
+
+def _label(value: Any) -> Any:
+    """A numpy label as a plain Python value"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _score_columns(y_true: np.ndarray, y_score: np.ndarray,
+                   classes: Optional[List[Any]]) -> Tuple[np.ndarray, List[Tuple[int, np.ndarray]]]:
+    """Validate scores and pair each scored class index with its score column"""
+    if y_true.ndim != 1 or y_true.size == 0:
+        raise ValueError("y_true must be a non-empty 1d array")
+    if len(y_score) != len(y_true):
+        raise ValueError(
+            "Found input variables with inconsistent numbers of samples: "
+            f"[{len(y_true)}, {len(y_score)}]"
+        )
+    # NaN scores would sort arbitrarily and yield meaningless curves
+    if not np.all(np.isfinite(y_score)):
+        raise ValueError("y_score contains NaN or infinity")
+
+    classes = np.asarray(classes) if classes is not None else np.unique(y_true)
+
+    if y_score.ndim == 1:
+        if len(classes) != 2:
+            raise ValueError("1d scores require exactly two classes")
+        columns = [(1, y_score)]
+    elif y_score.ndim == 2 and y_score.shape[1] == len(classes):
+        if len(classes) == 2:
+            columns = [(1, y_score[:, 1])]
+        else:
+            columns = [(index, y_score[:, index]) for index in range(len(classes))]
+    else:
+        raise ValueError(
+            f"y_score must have one column per class ({len(classes)}), got shape {y_score.shape}"
+        )
+
+    return classes, columns
+
+
+def roc_pr_curves(y_true: Any, y_score: Any, classes: Optional[List[Any]] = None,
+                  max_points: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Per-class ROC and PR curves.
+
+    `y_score` is either one score per sample for the positive class of a
+    binary problem, or a (n_samples, n_classes) probability matrix whose
+    columns follow `classes` (the sorted labels of `y_true` by default).
+    Binary problems yield one curve for the positive class, multiclass
+    problems one-vs-rest curves for every class plus the macro ROC AUC.
+    """
+    max_points = max_points or settings.CURVE_MAX_POINTS
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    classes, columns = _score_columns(y_true, y_score, classes)
+
+    curves = []
+    for index, scores in columns:
+        curve = binary_curves(y_true == classes[index], scores, max_points)
+        curve["class"] = _label(classes[index])
+        curves.append(curve)
+
+    aucs = [curve["roc"]["auc"] for curve in curves if curve["roc"] is not None]
+    return {
+        "classes": classes.tolist(),
+        "curves": curves,
+        "macro_roc_auc": float(np.mean(aucs)) if aucs else None,
+        "n_samples": int(len(y_true)),
+        "max_points": max_points,
+    }
+
+
+def curves_on_grid(y_true: Any, y_score: Any, classes: Optional[List[Any]] = None,
+                   grid_points: Optional[int] = None) -> Dict[str, Any]:
+    """
+    ROC and PR curves resampled onto fixed grids so curves of different
+    models line up point for point: TPR at evenly spaced FPR values and
+    interpolated precision (the best precision at any recall >= r) at
+    evenly spaced recall values.
+    """
+    grid = np.linspace(0.0, 1.0, grid_points or settings.CURVE_MAX_POINTS)
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    classes, columns = _score_columns(y_true, y_score, classes)
+
+    tpr_by_class: List[Optional[List[float]]] = []
+    precision_by_class: List[Optional[List[float]]] = []
+    for index, scores in columns:
+        fps, tps, _ = binary_clf_curve(y_true == classes[index], scores)
+        if tps[-1] == 0 or fps[-1] == 0:
+            tpr_by_class.append(None)
+            precision_by_class.append(None)
+            continue
+
+        fpr = np.r_[0.0, fps / fps[-1]]
+        tpr = np.r_[0.0, tps / tps[-1]]
+        tpr_by_class.append(np.round(np.interp(grid, fpr, tpr), _CURVE_DECIMALS).tolist())
+
+        recall = np.r_[0.0, tps / tps[-1]]
+        precision = np.r_[1.0, tps / (tps + fps)]
+        best = np.maximum.accumulate(precision[::-1])[::-1]
+        positions = np.minimum(np.searchsorted(recall, grid), len(best) - 1)
+        precision_by_class.append(np.round(best[positions], _CURVE_DECIMALS).tolist())
+
+    return {
+        "classes": [_label(classes[index]) for index, _ in columns],
+        "fpr": np.round(grid, _CURVE_DECIMALS).tolist(),
+        "tpr": tpr_by_class,
+        "recall": np.round(grid, _CURVE_DECIMALS).tolist(),
+        "precision": precision_by_class,
+    }
@@ -0,0 +1,127 @@
+"""
+Dataset Metadata
+Cheap dataset previews and a per-file metadata cache
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+
+
+def count_lines(file_path: str, chunk_size: int = 1024 * 1024) -> int:
+    """
+    Count the lines of a file with a raw newline scan.
+
+    A final line without a trailing newline is counted as well. Quoted
+    fields spanning several lines are counted once per physical line.
+    """
+    lines = 0
+    last = b""
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+
+    if last and last != b"\n":
+        lines += 1
+    return lines
+
+
+def read_dataset_preview(file_path: str) -> Dict[str, Any]:
+    """
+    Build dataset info (shape, columns, dtypes, preview rows) without
+    parsing the whole file where the format allows it.
+
+    CSV files are read up to DATASET_DTYPE_SAMPLE_ROWS rows for the preview
+    and dtypes, and their row count comes from a newline scan. JSON
+    documents cannot be read partially, so they are parsed in full.
+    """
+    if file_path.endswith('.csv'):
+        sample = pd.read_csv(file_path, nrows=settings.DATASET_DTYPE_SAMPLE_ROWS)
+        if len(sample) < settings.DATASET_DTYPE_SAMPLE_ROWS:
+            # The sample is the whole file
+            rows = len(sample)
+        else:
+            # Every line but the header is a row
+            rows = max(count_lines(file_path) - 1, len(sample))
+    elif file_path.endswith('.json'):
+        sample = pd.read_json(file_path)
+        rows = len(sample)
+    else:
+        raise ValueError(f"Unsupported dataset format: {file_path}")
+
+    return {
+        "shape": (rows, len(sample.columns)),
+        "columns": sample.columns.tolist(),
+        "dtypes": sample.dtypes.astype(str).to_dict(),
+        "preview": sample.head(settings.DATASET_PREVIEW_ROWS).to_dict('records')
+    }
+
+
+class DatasetMetadataCache:
+    """
+    Caches dataset info per file path. An entry is reused only while the
+    file's modification time and size are unchanged.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(file_path: str) -> Tuple[int, int]:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return cached info for a file if it is still current"""
+        key = os.path.abspath(file_path)
+        signature = self._signature(file_path)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            return None
+
+    def put(self, file_path: str, info: Dict[str, Any]) -> None:
+        """Store info for a file"""
+        key = os.path.abspath(file_path)
+        signature = self._signature(file_path)
+
+        with self._lock:
+            self._entries[key] = (signature, info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, file_path: str) -> Dict[str, Any]:
+        """Return cached info for a file, building it on a miss"""
+        info = self.get(file_path)
+        if info is None:
+            info = read_dataset_preview(file_path)
+            self.put(file_path, info)
+        return info
+
+    def invalidate(self, file_path: str) -> None:
+        """Drop the cached info for a file"""
+        with self._lock:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+
+# Shared metadata cache
+dataset_metadata_cache = DatasetMetadataCache(settings.DATASET_METADATA_CACHE_ENTRIES)
@@ -0,0 +1,409 @@
+"""
+Explainers
+SHAP explainer dispatch: exact closed forms where the model allows them,
+shap's Tree/KernelExplainer otherwise
+"""
+
+import importlib.metadata
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services import column_store
+from app.services.model_registry import model_registry
+
+
+LINEAR = "linear"
+TREE = "tree"
+KERNEL = "kernel"
+
+
+def _shap() -> Any:
+    """
+    The shap module, imported on first use: importing it (and the sklearn
+    and numba modules it pulls in) takes seconds, which every worker would
+    otherwise pay at startup
+    """
+    import shap
+    return shap
+
+
+def shap_version() -> Optional[str]:
+    """Installed shap version, read without importing shap"""
+    try:
+        return importlib.metadata.version("shap")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def is_linear_model(model: Any) -> bool:
+    """
+    Whether a model is a fitted scikit-learn linear model or GLM, whose
+    output (or link) is `X @ coef_.T + intercept_`
+    """
+    return (
+        hasattr(model, "coef_") and hasattr(model, "intercept_")
+        and type(model).__module__.startswith("sklearn.linear_model")
+    )
+
+
+def explainer_kind(model: Any) -> str:
+    """SHAP explainer family used for a model"""
+    if is_linear_model(model):
+        return LINEAR
+    if hasattr(model, "feature_importances_"):
+        return TREE
+    return KERNEL
+
+
+def linear_output(model: Any) -> str:
+    """The model output that linear SHAP values decompose"""
+    from sklearn.base import is_classifier
+
+    if is_classifier(model):
+        return "log_odds"
+    if hasattr(model, "_base_loss"):
+        # GLMs such as PoissonRegressor: the linear predictor before the inverse link
+        return "linear_predictor"
+    return "prediction"
+
+
+def linear_shap_values(model: Any, X: Any, background: Any = None) -> Tuple[np.ndarray, Any]:
+    """
+    Exact SHAP values of a linear model, phi_ij = coef_j * (x_ij - E[x_j]),
+    with the expectation taken over `background` (X itself by default) under
+    feature independence.
+
+    Returns (shap_values, expected_value): an (n_rows, n_features) matrix and
+    a float for single-output models, or (n_rows, n_features, n_outputs) and
+    an array of expected values otherwise.
+    """
+    values = np.asarray(X, dtype=np.float64)
+    mean = np.asarray(background if background is not None else values, dtype=np.float64).mean(axis=0)
+
+    coef = np.atleast_2d(np.asarray(model.coef_, dtype=np.float64))
+    intercept = np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64))
+    expected_value = mean @ coef.T + intercept
+
+    centered = values - mean
+    if coef.shape[0] == 1:
+        return centered * coef[0], float(expected_value[0])
+    return centered[:, :, None] * coef.T[None, :, :], expected_value
+
+
+def kernel_budget() -> Dict[str, Any]:
+    """
+    KernelExplainer parameters that determine a result. The deadline is left
+    out since it only decides whether a result is partial.
+    """
+    return {
+        "background_method": settings.SHAP_KERNEL_BACKGROUND_METHOD,
+        "background_size": settings.SHAP_KERNEL_BACKGROUND_SIZE,
+        "explain_size": settings.SHAP_KERNEL_EXPLAIN_SIZE,
+        "nsamples": settings.SHAP_KERNEL_NSAMPLES,
+    }
+
+
+def kernel_background(X: pd.DataFrame) -> Tuple[Any, str]:
+    """
+    Summarize background data to at most SHAP_KERNEL_BACKGROUND_SIZE rows,
+    by weighted k-means centroids or a random sample
+    """
+    size = settings.SHAP_KERNEL_BACKGROUND_SIZE
+    if len(X) <= size:
+        return X, "full"
+
+    if settings.SHAP_KERNEL_BACKGROUND_METHOD == "kmeans":
+        try:
+            return _shap().kmeans(X, size), "kmeans"
+        except Exception:
+            # Non-numeric columns cannot be clustered; fall back to sampling
+            pass
+
+    return _shap().sample(X, size, random_state=42), "sample"
+
+
+def kernel_shap_values(model: Any, X_sample: pd.DataFrame,
+                       cached: Optional["ModelExplainer"] = None) -> Tuple[Any, Any, Dict[str, Any]]:
+    """
+    KernelExplainer SHAP values under the configured budget, with the
+    KernelExplainer of `cached` when given.
+
+    Rows are explained in small batches so the deadline is checked
+    regularly; once it passes, the rows explained so far are returned and
+    the run is marked partial. Returns (shap_values, explainer, parameters)
+    where shap_values covers the first `explained_rows` rows.
+    """
+    started = time.monotonic()
+    deadline = started + settings.SHAP_KERNEL_DEADLINE_SECONDS
+
+    if cached is not None:
+        explainer, background_method = cached.explainer, cached.background_method
+    else:
+        background, background_method = kernel_background(X_sample)
+        predict_fn = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+        explainer = _shap().KernelExplainer(predict_fn, background)
+
+    X_explain = X_sample.iloc[:settings.SHAP_KERNEL_EXPLAIN_SIZE]
+    batch_rows = max(1, settings.SHAP_KERNEL_BATCH_ROWS)
+
+    parts = []
+    explained = 0
+    while explained < len(X_explain) and (explained == 0 or time.monotonic() < deadline):
+        batch = X_explain.iloc[explained:explained + batch_rows]
+        parts.append(explainer.shap_values(batch, nsamples=settings.SHAP_KERNEL_NSAMPLES, silent=True))
+        explained += len(batch)
+
+    if isinstance(parts[0], list):
+        # Older shap versions return one matrix per output
+        shap_values = [np.concatenate([part[i] for part in parts]) for i in range(len(parts[0]))]
+    else:
+        shap_values = np.concatenate(parts)
+
+    parameters = {
+        "kind": KERNEL,
+        "background_method": background_method,
+        "background_size": min(settings.SHAP_KERNEL_BACKGROUND_SIZE, len(X_sample)),
+        "explain_rows_requested": len(X_explain),
+        "explained_rows": explained,
+        "nsamples": settings.SHAP_KERNEL_NSAMPLES,
+        "deadline_seconds": settings.SHAP_KERNEL_DEADLINE_SECONDS,
+        "elapsed_seconds": time.monotonic() - started,
+        "partial": explained < len(X_explain),
+    }
+    return shap_values, explainer, parameters
+
+
+def tree_shap_values(model: Any, X: pd.DataFrame,
+                     explainer: Any = None) -> Tuple[np.ndarray, Any, Dict[str, Any]]:
+    """
+    TreeExplainer SHAP values of every row of X in one call. Large samples
+    are sharded across the "shap_shards" pool by the caller instead (see
+    split_rows and explain_shard). Returns (shap_values, explainer,
+    parameters).
+    """
+    explainer = explainer if explainer is not None else _shap().TreeExplainer(model)
+    parameters = {
+        "kind": TREE,
+        "explained_rows": len(X),
+        "shards": 1,
+        "partial": False,
+    }
+    return np.asarray(explainer.shap_values(X)), explainer, parameters
+
+
+def split_rows(X: pd.DataFrame, shard_rows: int) -> List[pd.DataFrame]:
+    """Consecutive row shards of at most `shard_rows` rows"""
+    shard_rows = max(1, shard_rows)
+    return [X.iloc[start:start + shard_rows] for start in range(0, len(X), shard_rows)]
+
+
+def explain_shard(model_path: str, X_shard: pd.DataFrame) -> Tuple[np.ndarray, Any]:
+    """
+    TreeExplainer SHAP values and expected value of one row shard.
+
+    Runs in a long-lived "shap_shards" worker: the model and its
+    TreeExplainer are loaded once per worker through that process's
+    registry and reused for every later shard and analysis.
+    """
+    explainer = get_explainer(model_registry.get_by_path(model_path)).explainer
+    return np.asarray(explainer.shap_values(X_shard)), _as_list(explainer.expected_value)
+
+
+def combine_shards(X: pd.DataFrame, X_sample: pd.DataFrame,
+                   parts: List[Tuple[np.ndarray, Any]]) -> Dict[str, Any]:
+    """
+    explain()-shaped SHAP data of a tree model from the explain_shard
+    results of X_sample's shards, in order. Tree SHAP values of a row do not
+    depend on the other rows, so this is identical to an unsharded run.
+    """
+    parameters = {
+        "kind": TREE,
+        "explained_rows": len(X_sample),
+        "shards": len(parts),
+        "partial": False,
+    }
+    # Outputs are stacked on the last axis, so rows are always axis 0
+    shap_values = np.concatenate([values for values, _ in parts], axis=0)
+    return _shap_data(X.index, X_sample, parameters, shap_values, parts[0][1], None)
+
+
+def sample_for_shap(X: pd.DataFrame, feature_names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Rows and features handed to the sampling explainers. A model's declared
+    `feature_names` select the columns instead of the MAX_FEATURES_FOR_SHAP
+    cut, since the model cannot predict without any of them.
+    """
+    if feature_names is not None:
+        X = X[list(feature_names)]
+
+    # Sample data if too large (SHAP_SAMPLE_SIZE <= 0 keeps every row)
+    if 0 < settings.SHAP_SAMPLE_SIZE < len(X):
+        X = X.sample(n=settings.SHAP_SAMPLE_SIZE, random_state=42)
+
+    # Limit features if too many
+    if feature_names is None and len(X.columns) > settings.MAX_FEATURES_FOR_SHAP:
+        # For MVP, take first N features
+        X = X.iloc[:, :settings.MAX_FEATURES_FOR_SHAP]
+
+    return X
+
+
+class ModelExplainer:
+    """
+    A reusable explainer for one model.
+
+    Tree models need no background data. Linear models keep the background
+    feature means and KernelExplainer a summarized background, so neither
+    touches the background dataset again once built.
+    """
+
+    def __init__(self, model: Any, background: Optional[pd.DataFrame] = None,
+                 background_path: Optional[str] = None):
+        self.model = model
+        self.kind = explainer_kind(model)
+        self.background_path = background_path
+        self.output = linear_output(model) if self.kind == LINEAR else None
+        self.feature_names = getattr(model, "feature_names_in_", None)
+        self.background_method: Optional[str] = None
+
+        if self.kind != TREE and background is None:
+            raise ValueError(f"A background dataset is required to explain {type(model).__name__} models")
+        if background is not None and self.feature_names is not None:
+            background = background[list(self.feature_names)]
+
+        if self.kind == LINEAR:
+            self.mean = np.asarray(background, dtype=np.float64).mean(axis=0)
+            self.explainer = None
+        elif self.kind == TREE:
+            self.explainer = _shap().TreeExplainer(model)
+        else:
+            if 0 < settings.SHAP_SAMPLE_SIZE < len(background):
+                background = background.sample(n=settings.SHAP_SAMPLE_SIZE, random_state=42)
+            summary, self.background_method = kernel_background(background)
+            predict_fn = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+            self.explainer = _shap().KernelExplainer(predict_fn, summary)
+
+    def shap_values(self, X: pd.DataFrame) -> Tuple[np.ndarray, Any]:
+        """SHAP values and expected value for the rows of X"""
+        if self.feature_names is not None:
+            X = X[list(self.feature_names)]
+
+        if self.kind == LINEAR:
+            return linear_shap_values(self.model, X, self.mean[None, :])
+
+        if self.kind == TREE:
+            values = self.explainer.shap_values(X)
+        else:
+            values = self.explainer.shap_values(X, nsamples=settings.SHAP_KERNEL_NSAMPLES, silent=True)
+        return np.asarray(values), _as_list(self.explainer.expected_value)
+
+    def info(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "output": self.output, "background_path": self.background_path}
+
+
+def get_explainer(entry: Any, background_path: Optional[str] = None,
+                  background: Optional[pd.DataFrame] = None) -> ModelExplainer:
+    """
+    The cached explainer of a registry entry, built on first use.
+
+    Without `background_path` the cached explainer is reused whatever its
+    background; a different background path replaces it. A `background`
+    frame already loaded from that path is used instead of reading it again.
+    """
+    explainer = entry.explainer
+    if explainer is not None and background_path in (None, explainer.background_path):
+        return explainer
+
+    # Per entry, so building one model's explainer never blocks another's
+    with entry.explainer_lock:
+        explainer = entry.explainer
+        if explainer is not None and background_path in (None, explainer.background_path):
+            return explainer
+
+        if background is None and background_path:
+            background = column_store.load_frame(background_path)
+        explainer = ModelExplainer(entry.model, background, background_path)
+        entry.explainer = explainer
+        return explainer
+
+
+def explainer_for_dataset(entry: Any, X: pd.DataFrame, dataset_path: str) -> Optional[ModelExplainer]:
+    """
+    The cached explainer explain() can reuse for a registry entry and the
+    features X of a dataset: the TreeExplainer whatever the data, and a
+    KernelExplainer whose background is this dataset's SHAP sample. Linear
+    models are explained exactly and need none.
+    """
+    kind = explainer_kind(entry.model)
+    if kind == TREE:
+        return get_explainer(entry)
+    if kind == KERNEL:
+        background = sample_for_shap(X, getattr(entry.model, "feature_names_in_", None))
+        return get_explainer(entry, dataset_path, background=background)
+    return None
+
+
+def _as_list(value: Any) -> Any:
+    return np.asarray(value).tolist() if value is not None else None
+
+
+def explain(model: Any, X: pd.DataFrame, cached: Optional[ModelExplainer] = None) -> Dict[str, Any]:
+    """
+    SHAP data for a model on a dataset, reusing the Tree/KernelExplainer of
+    a `cached` explainer when given (see explainer_for_dataset).
+
+    Linear models are explained exactly over every row; tree models use
+    TreeExplainer and anything else the budgeted KernelExplainer, both on a
+    sample. `shap_values`, `feature_values` and `row_index` (the position of
+    each explained row in X) are returned as arrays and `explainer` reports
+    the method and parameters used.
+    """
+    kind = explainer_kind(model)
+    full_index = X.index
+
+    if kind == LINEAR:
+        feature_names = getattr(model, "feature_names_in_", None)
+        if feature_names is not None:
+            X = X[list(feature_names)]
+        shap_values, expected_value = linear_shap_values(model, X)
+        explainer = None
+        parameters = {
+            "kind": LINEAR,
+            "output": linear_output(model),
+            "explained_rows": len(X),
+            "partial": False,
+        }
+    elif kind == TREE:
+        X = sample_for_shap(X, getattr(model, "feature_names_in_", None))
+        shap_values, explainer, parameters = tree_shap_values(
+            model, X, cached.explainer if cached is not None else None
+        )
+        expected_value = getattr(explainer, "expected_value", None)
+    else:
+        # Model-agnostic fallback, bounded by the kernel budget
+        X = sample_for_shap(X, getattr(model, "feature_names_in_", None))
+        shap_values, explainer, parameters = kernel_shap_values(model, X, cached)
+        expected_value = getattr(explainer, "expected_value", None)
+        X = X.iloc[:parameters["explained_rows"]]
+
+    return _shap_data(
+        full_index, X, parameters, shap_values,
+        _as_list(expected_value), _as_list(getattr(explainer, "base_values", None))
+    )
+
+
+def _shap_data(full_index: pd.Index, X: pd.DataFrame, parameters: Dict[str, Any], shap_values: Any,
+               expected_value: Any, base_values: Any) -> Dict[str, Any]:
+    return {
+        "explainer": parameters,
+        "feature_names": X.columns.tolist(),
+        "feature_values": X.to_numpy(),
+        "row_index": full_index.get_indexer(X.index) if full_index.is_unique else np.arange(len(X)),
+        "shap_values": np.asarray(shap_values),
+        "expected_value": expected_value,
+        "base_values": base_values,
+    }
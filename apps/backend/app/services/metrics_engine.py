@@ -0,0 +1,205 @@
+"""
+Metrics Engine
+Single-pass classification and regression metrics matching scikit-learn
+"""
+
+import numpy as np
+from typing import Any, Dict, Tuple
+
+
+# Integer labels spanning at most this many values are encoded by offset
+# instead of by sorting
+_DENSE_LABEL_SPAN = 1 << 20
+
+
+def as_1d(values: Any, name: str) -> np.ndarray:
+    array = np.asarray(values)
+    if array.ndim == 2 and array.shape[1] == 1:
+        array = array.ravel()
+    if array.ndim != 1:
+        raise ValueError(f"{name} must be a 1d array, got shape {array.shape}")
+    if array.size == 0:
+        raise ValueError(
+            "Found empty input array (e.g., `y_true` or `y_pred`) while a minimum "
+            "of 1 sample is required."
+        )
+    return array
+
+
+def _is_integral(array: np.ndarray) -> bool:
+    if array.dtype.kind in "biu":
+        return True
+    if array.dtype.kind == "f":
+        return bool(np.all(np.isfinite(array)) and np.all(array == np.trunc(array)))
+    return False
+
+
+def check_classification_targets(y_true: Any, y_pred: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Validate a pair of label arrays the way scikit-learn does for
+    binary/multiclass targets
+    """
+    y_true = as_1d(y_true, "y_true")
+    y_pred = as_1d(y_pred, "y_pred")
+
+    if len(y_true) != len(y_pred):
+        raise ValueError(
+            "Found input variables with inconsistent numbers of samples: "
+            f"[{len(y_true)}, {len(y_pred)}]"
+        )
+
+    for array in (y_true, y_pred):
+        if array.dtype.kind == "f" and not _is_integral(array):
+            raise ValueError("Classification metrics can't handle continuous targets")
+
+    numeric = [array.dtype.kind in "biuf" for array in (y_true, y_pred)]
+    if numeric[0] != numeric[1]:
+        raise ValueError("Mix of label input types (string and number)")
+
+    return y_true, y_pred
+
+
+def encode_labels(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Map both label arrays onto codes 0..n_labels-1 of their sorted union.
+
+    Integer-valued labels with a small span use an offset and a lookup
+    table (two linear passes); anything else falls back to np.unique.
+    Returns (labels, true_codes, pred_codes).
+    """
+    dtype = np.result_type(y_true, y_pred)
+
+    if _is_integral(y_true) and _is_integral(y_pred):
+        true_int = y_true.astype(np.int64, copy=False)
+        pred_int = y_pred.astype(np.int64, copy=False)
+        low = min(true_int.min(), pred_int.min())
+        span = int(max(true_int.max(), pred_int.max()) - low) + 1
+
+        if span <= _DENSE_LABEL_SPAN:
+            true_off = true_int - low
+            pred_off = pred_int - low
+            present = (np.bincount(true_off, minlength=span) > 0) | (np.bincount(pred_off, minlength=span) > 0)
+            lookup = np.cumsum(present) - 1
+            labels = (np.flatnonzero(present) + low).astype(dtype)
+            return labels, lookup[true_off], lookup[pred_off]
+
+    labels, codes = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+    codes = codes.ravel()
+    return labels, codes[:len(y_true)], codes[len(y_true):]
+
+
+def confusion_matrix_from_codes(true_codes: np.ndarray, pred_codes: np.ndarray, n_labels: int) -> np.ndarray:
+    """Confusion matrix (rows: true, columns: predicted) from label codes"""
+    flat = true_codes.astype(np.int64, copy=False) * n_labels + pred_codes
+    return np.bincount(flat, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division yielding 0 where the denominator is 0 (zero_division=0)"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _weighted(values: np.ndarray, weights: np.ndarray) -> float:
+    if weights.sum() == 0:
+        return 0.0
+    return float(np.average(values, weights=weights))
+
+
+def metrics_from_confusion(cm: np.ndarray, labels: np.ndarray) -> Dict[str, Any]:
+    """
+    Derive accuracy, weighted precision/recall/F1, the confusion matrix and
+    the per-class classification report from a confusion matrix
+    """
+    cm = np.asarray(cm)
+    tp = np.diag(cm)
+    pred_sum = cm.sum(axis=0)
+    true_sum = cm.sum(axis=1)
+    total = true_sum.sum()
+
+    precision = _safe_divide(tp, pred_sum)
+    recall = _safe_divide(tp, true_sum)
+    f1 = _safe_divide(2.0 * tp, true_sum.astype(np.float64) + pred_sum)
+    accuracy = float(tp.sum() / total) if total else 0.0
+
+    report: Dict[str, Any] = {}
+    for index, label in enumerate(labels):
+        report["%s" % label] = {
+            "precision": float(precision[index]),
+            "recall": float(recall[index]),
+            "f1-score": float(f1[index]),
+            "support": float(true_sum[index]),
+        }
+    report["accuracy"] = accuracy
+    report["macro avg"] = {
+        "precision": float(np.average(precision)),
+        "recall": float(np.average(recall)),
+        "f1-score": float(np.average(f1)),
+        "support": float(total),
+    }
+    report["weighted avg"] = {
+        "precision": _weighted(precision, true_sum),
+        "recall": _weighted(recall, true_sum),
+        "f1-score": _weighted(f1, true_sum),
+        "support": float(total),
+    }
+
+    return {
+        "accuracy": accuracy,
+        "precision": report["weighted avg"]["precision"],
+        "recall": report["weighted avg"]["recall"],
+        "f1_score": report["weighted avg"]["f1-score"],
+        "confusion_matrix": cm.tolist(),
+        "classification_report": report,
+    }
+
+
+def classification_metrics(y_true: Any, y_pred: Any) -> Dict[str, Any]:
+    """
+    Classification metrics from one confusion matrix.
+
+    Equivalent to accuracy_score, weighted precision/recall/f1_score
+    (zero_division=0), confusion_matrix and classification_report
+    (output_dict=True, zero_division=0), but labels are encoded and counted
+    once instead of once per metric.
+    """
+    y_true, y_pred = check_classification_targets(y_true, y_pred)
+    labels, true_codes, pred_codes = encode_labels(y_true, y_pred)
+    cm = confusion_matrix_from_codes(true_codes, pred_codes, len(labels))
+    return metrics_from_confusion(cm, labels)
+
+
+def regression_metrics(y_true: Any, y_pred: Any) -> Dict[str, Any]:
+    """
+    MSE, RMSE, MAE and R² in one pass over the residuals, matching
+    mean_squared_error, mean_absolute_error and r2_score
+    """
+    y_true = as_1d(y_true, "y_true").astype(np.float64, copy=False)
+    y_pred = as_1d(y_pred, "y_pred").astype(np.float64, copy=False)
+
+    if len(y_true) != len(y_pred):
+        raise ValueError(
+            "Found input variables with inconsistent numbers of samples: "
+            f"[{len(y_true)}, {len(y_pred)}]"
+        )
+
+    residuals = y_true - y_pred
+    squared = residuals ** 2
+    mse = float(np.average(squared))
+
+    ss_res = squared.sum()
+    ss_tot = ((y_true - np.average(y_true)) ** 2).sum()
+    if ss_tot != 0:
+        r2 = float(1 - ss_res / ss_tot)
+    else:
+        # r2_score's force_finite convention
+        r2 = 1.0 if ss_res == 0 else 0.0
+
+    return {
+        "mse": mse,
+        "rmse": float(np.sqrt(mse)),
+        "mae": float(np.average(np.abs(residuals))),
+        "r2_score": r2,
+    }
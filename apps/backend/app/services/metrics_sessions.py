@@ -0,0 +1,281 @@
+"""
+Metrics Sessions
+Online evaluation from mergeable sufficient statistics instead of raw labels
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.metrics_engine import (
+    check_classification_targets, encode_labels, confusion_matrix_from_codes,
+    metrics_from_confusion, as_1d
+)
+
+
+class MetricsSessionNotFoundError(KeyError):
+    """Raised for an unknown or expired session id"""
+
+
+class ClassificationAccumulator:
+    """
+    Running confusion matrix over the sorted union of labels seen so far,
+    plus the summed log-loss of the rows that came with probabilities.
+
+    `classes` gives the column order of pushed probabilities and is only
+    required for log-loss.
+    """
+
+    task_type = "classification"
+
+    def __init__(self, classes: Optional[List[Any]] = None):
+        self.classes = np.asarray(classes) if classes is not None else None
+        self.labels = np.array([])
+        self.cm = np.zeros((0, 0), dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.log_loss_count = 0
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.cm.sum())
+
+    @classmethod
+    def from_batch(cls, y_true: Any, y_pred: Any, proba: Any = None,
+                   classes: Optional[List[Any]] = None) -> "ClassificationAccumulator":
+        """Sufficient statistics of one batch"""
+        partial = cls(classes)
+        y_true, y_pred = check_classification_targets(y_true, y_pred)
+        labels, true_codes, pred_codes = encode_labels(y_true, y_pred)
+        partial.labels = labels
+        partial.cm = confusion_matrix_from_codes(true_codes, pred_codes, len(labels))
+
+        if proba is not None:
+            partial.log_loss_sum = partial._log_loss_sum(y_true, proba)
+            partial.log_loss_count = len(y_true)
+
+        return partial
+
+    def _log_loss_sum(self, y_true: np.ndarray, proba: Any) -> float:
+        """Summed negative log-likelihood of the true classes (log_loss's clipping)"""
+        if self.classes is None:
+            raise ValueError("Session classes are required to accumulate log-loss")
+
+        proba = np.asarray(proba, dtype=np.float64)
+        if proba.ndim != 2 or proba.shape != (len(y_true), len(self.classes)):
+            raise ValueError(
+                f"proba must have shape ({len(y_true)}, {len(self.classes)}), got {proba.shape}"
+            )
+
+        order = np.argsort(self.classes)
+        positions = np.searchsorted(self.classes, y_true, sorter=order)
+        positions = np.clip(positions, 0, len(self.classes) - 1)
+        codes = order[positions]
+        if not np.array_equal(self.classes[codes], y_true):
+            raise ValueError("y_true contains labels missing from the session classes")
+
+        eps = np.finfo(proba.dtype).eps
+        proba = np.clip(proba, eps, 1 - eps)
+        proba = proba / proba.sum(axis=1, keepdims=True)
+        return float(-np.log(proba[np.arange(len(y_true)), codes]).sum())
+
+    def merge(self, other: "ClassificationAccumulator") -> None:
+        """Fold another accumulator into this one in O(labels²)"""
+        if other.labels.size == 0:
+            return
+        if self.labels.size and (self.labels.dtype.kind in "biuf") != (other.labels.dtype.kind in "biuf"):
+            raise ValueError("Mix of label input types (string and number)")
+
+        labels = np.union1d(self.labels, other.labels) if self.labels.size else other.labels
+        cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for source_labels, source_cm in ((self.labels, self.cm), (other.labels, other.cm)):
+            if source_labels.size:
+                index = np.searchsorted(labels, source_labels)
+                cm[np.ix_(index, index)] += source_cm
+
+        self.labels = labels
+        self.cm = cm
+        self.log_loss_sum += other.log_loss_sum
+        self.log_loss_count += other.log_loss_count
+
+    def metrics(self) -> Dict[str, Any]:
+        if self.n_samples == 0:
+            raise ValueError("No samples have been added to this session")
+        result = metrics_from_confusion(self.cm, self.labels)
+        if self.log_loss_count:
+            result["log_loss"] = self.log_loss_sum / self.log_loss_count
+        return result
+
+
+class RegressionAccumulator:
+    """
+    Count, mean and centred sum of squares of y_true (merged with Chan's
+    parallel update for numerical stability) plus residual sums.
+    """
+
+    task_type = "regression"
+
+    def __init__(self):
+        self.n = 0
+        self.mean_true = 0.0
+        self.ss_true = 0.0
+        self.sum_squared_error = 0.0
+        self.sum_absolute_error = 0.0
+
+    @property
+    def n_samples(self) -> int:
+        return self.n
+
+    @classmethod
+    def from_batch(cls, y_true: Any, y_pred: Any) -> "RegressionAccumulator":
+        """Sufficient statistics of one batch"""
+        y_true = as_1d(y_true, "y_true").astype(np.float64, copy=False)
+        y_pred = as_1d(y_pred, "y_pred").astype(np.float64, copy=False)
+        if len(y_true) != len(y_pred):
+            raise ValueError(
+                "Found input variables with inconsistent numbers of samples: "
+                f"[{len(y_true)}, {len(y_pred)}]"
+            )
+
+        partial = cls()
+        residuals = y_true - y_pred
+        partial.n = len(y_true)
+        partial.mean_true = float(np.average(y_true))
+        partial.ss_true = float(((y_true - partial.mean_true) ** 2).sum())
+        partial.sum_squared_error = float((residuals ** 2).sum())
+        partial.sum_absolute_error = float(np.abs(residuals).sum())
+        return partial
+
+    def merge(self, other: "RegressionAccumulator") -> None:
+        """Fold another accumulator into this one"""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean_true - self.mean_true
+        self.ss_true += other.ss_true + delta ** 2 * self.n * other.n / n
+        self.mean_true += delta * other.n / n
+        self.n = n
+        self.sum_squared_error += other.sum_squared_error
+        self.sum_absolute_error += other.sum_absolute_error
+
+    def metrics(self) -> Dict[str, Any]:
+        if self.n == 0:
+            raise ValueError("No samples have been added to this session")
+        mse = self.sum_squared_error / self.n
+        if self.ss_true != 0:
+            r2 = 1 - self.sum_squared_error / self.ss_true
+        else:
+            # r2_score's force_finite convention
+            r2 = 1.0 if self.sum_squared_error == 0 else 0.0
+        return {
+            "mse": mse,
+            "rmse": float(np.sqrt(mse)),
+            "mae": self.sum_absolute_error / self.n,
+            "r2_score": r2,
+        }
+
+
+def batch_statistics(task_type: str, y_true: Any, y_pred: Any, proba: Any = None,
+                     classes: Optional[List[Any]] = None):
+    """
+    Sufficient statistics of one batch. A pure function, so it can run on a
+    process-pool executor; the result is merged into the session afterwards.
+    """
+    if task_type == "classification":
+        return ClassificationAccumulator.from_batch(y_true, y_pred, proba, classes)
+    if proba is not None:
+        raise ValueError("proba is only supported for classification sessions")
+    return RegressionAccumulator.from_batch(y_true, y_pred)
+
+
+class MetricsSession:
+    """One accumulator plus its bookkeeping"""
+
+    def __init__(self, session_id: str, task_type: str, classes: Optional[List[Any]] = None):
+        if task_type == "classification":
+            self.accumulator = ClassificationAccumulator(classes)
+        elif task_type == "regression":
+            self.accumulator = RegressionAccumulator()
+        else:
+            raise ValueError(f"Unsupported task type: {task_type}")
+        self.session_id = session_id
+        self.task_type = task_type
+        self.classes = classes
+        self.batches = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self._lock = threading.Lock()
+
+    def merge(self, partial) -> None:
+        with self._lock:
+            self.accumulator.merge(partial)
+            self.batches += 1
+            self.updated_at = time.time()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "session_id": self.session_id,
+                "task_type": self.task_type,
+                "n_samples": self.accumulator.n_samples,
+                "batches": self.batches,
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.accumulator.metrics()
+
+
+class MetricsSessionManager:
+    """
+    In-memory registry of metrics sessions. Sessions idle for longer than
+    `ttl_seconds` are dropped, and the least recently updated ones go first
+    once `max_sessions` is reached.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, MetricsSession] = {}
+        self._lock = threading.Lock()
+
+    def create(self, task_type: str, classes: Optional[List[Any]] = None) -> MetricsSession:
+        session = MetricsSession(uuid.uuid4().hex, task_type, classes)
+        with self._lock:
+            self._expire()
+            while len(self._sessions) >= self.max_sessions:
+                oldest = min(self._sessions.values(), key=lambda s: s.updated_at)
+                del self._sessions[oldest.session_id]
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> MetricsSession:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise MetricsSessionNotFoundError(f"Metrics session '{session_id}' not found")
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "max_sessions": self.max_sessions}
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for session_id in [s.session_id for s in self._sessions.values() if s.updated_at < cutoff]:
+            del self._sessions[session_id]
+
+
+# Shared session registry used by the metrics router
+metrics_sessions = MetricsSessionManager(
+    max_sessions=settings.METRICS_SESSION_MAX_SESSIONS,
+    ttl_seconds=settings.METRICS_SESSION_TTL_SECONDS,
+)
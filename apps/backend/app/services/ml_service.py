@@ -3,42 +3,92 @@ ML Service
 Handles machine learning model analysis and SHAP calculations
 """
 
-import joblib
+import asyncio
 import pandas as pd
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    confusion_matrix, classification_report, mean_squared_error,
-    mean_absolute_error, r2_score
-)
-import shap
-from typing import Dict, Any, List, Union, Optional
+from typing import Dict, Any, List, Union, Optional, Tuple, Callable, Awaitable, Iterator
 import json
+import logging
 import os
+import re
+import time
+import uuid
 from datetime import datetime
 
 from app.core.config import settings
-from app.models.ml_model import MLModel, Dataset
+from app.core.executors import executors
+from app.core.instrumentation import stage, ROWS_SCORED
+from app.core.memory_profiling import memory_profiler
+from app.models.ml_model import MLModel, Dataset, Prediction
+from app.services.model_registry import model_registry, ModelEntry, ModelNotFoundError
+from app.services.dataset_metadata import dataset_metadata_cache
+from app.services import column_store, array_store
+from app.services.metrics_engine import classification_metrics, regression_metrics
+from app.services.curves import roc_pr_curves, curves_on_grid
+from app.services.shap_cache import shap_cache
+from app.services import explainers
+from app.utils.files import file_sha256
+from app.utils.codecs import encode_score_chunk
+
+logger = logging.getLogger(__name__)
+
+
+def _task_type(model: Any) -> str:
+    """Task of a fitted model; sklearn is imported on first use, not at startup"""
+    from sklearn.base import is_regressor
+    return "regression" if is_regressor(model) else "classification"
 
 
 class MLService:
     """Service for ML model analysis and visualization"""
     
     def __init__(self):
-        self.explainer = None
-        self.current_model = None
-        self.current_model_path = None
+        self.registry = model_registry
     
-    async def analyze_model(self, model: MLModel, dataset: Dataset) -> Dict[str, Any]:
+    def __getstate__(self) -> Dict[str, Any]:
+        # The registry is process-local; workers of a process pool use their own
+        state = self.__dict__.copy()
+        state.pop("registry", None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.registry = model_registry
+    
+    async def analyze_model(self, model: MLModel, dataset: Dataset,
+                            progress: Optional[Callable[[str, float], Awaitable[None]]] = None) -> Dict[str, Any]:
         """
-        Analyze a model with a dataset and generate insights
+        Analyze a model with a dataset and generate insights.
+        `progress` is awaited with (stage, fraction) as each stage starts.
+        With memory profiling on, the result carries the per-stage records
+        under `memory_profile`.
         """
+        with memory_profiler.collect() as memory_records:
+            result = await self._analyze_model(model, dataset, progress)
+        
+        if memory_records is not None:
+            result["memory_profile"] = memory_records
+        return result
+    
+    async def _analyze_model(self, model: MLModel, dataset: Dataset,
+                             progress: Optional[Callable[[str, float], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """
+        Stages of analyze_model
+        """
+        async def report(stage: str, fraction: float) -> None:
+            if progress is not None:
+                await progress(stage, fraction)
+        
         try:
             # Load model
-            ml_model = joblib.load(model.file_path)
+            await report("load", 0.0)
+            with stage("analyze.load_model"):
+                entry = await executors.run("inference", self.registry.get_by_path, model.file_path)
+            ml_model = entry.model
             
-            # Load dataset
-            df = pd.read_csv(dataset.file_path)
+            # Load dataset from its column store
+            with stage("analyze.load_dataset"):
+                df = await executors.run("dataset", column_store.load_frame, dataset.file_path)
             
             # Prepare data
             if dataset.target_column:
@@ -50,33 +100,82 @@ class MLService:
                 y = df.iloc[:, -1]
             
             # Make predictions
-            predictions = ml_model.predict(X)
-            probabilities = ml_model.predict_proba(X) if hasattr(ml_model, 'predict_proba') else None
+            await report("predict", 0.2)
+            with stage("analyze.predict"):
+                predictions, probabilities = await executors.run(
+                    "inference", self.predict_frame, entry.model_id, X
+                )
             
             # Calculate metrics
-            metrics = self._calculate_metrics(y, predictions)
-            
-            # Generate SHAP values
-            shap_values = await self._generate_shap_values(ml_model, X)
-            
-            # Create prediction record
+            await report("metrics", 0.4)
+            task_type = _task_type(ml_model)
+            with stage("analyze.metrics"):
+                metrics = await executors.run("metrics", self._calculate_metrics, y, predictions, task_type)
+            
+            # ROC / PR curves, thinned to a plottable number of points
+            curves = None
+            if task_type == "classification" and probabilities is not None:
+                with stage("analyze.curves"):
+                    curves = await executors.run(
+                        "metrics", self._calculate_curves, y, probabilities, getattr(ml_model, "classes_", None)
+                    )
+            
+            # Generate SHAP values, reusing a cached result for identical inputs;
+            # exact linear SHAP is cheaper to recompute than to read back
+            await report("shap", 0.5)
+            shap_values = None
+            shap_key = None
+            if settings.SHAP_CACHE_ENABLED and explainers.explainer_kind(ml_model) != explainers.LINEAR:
+                with stage("analyze.shap_cache"):
+                    shap_key = await executors.run(
+                        "dataset", self._shap_cache_key, ml_model,
+                        model.file_path, dataset.file_path, dataset.target_column
+                    )
+                    shap_values = await executors.run("dataset", shap_cache.get, shap_key)
+            
+            if shap_values is None:
+                with stage("analyze.shap"):
+                    shap_values = await self._shap_values(ml_model, model.file_path, dataset.file_path, X)
+                # Deadline-truncated results depend on timing, so they are not reused
+                partial = shap_values.get("explainer", {}).get("partial", False)
+                if shap_key is not None and "error" not in shap_values and not partial:
+                    await executors.run("dataset", shap_cache.put, shap_key, shap_values)
+            
+            # Create prediction record; bulky arrays go to a compressed file
+            # and the row keeps a reference plus summary stats
+            await report("persist", 0.9)
+            with stage("analyze.store_arrays"):
+                arrays_path, array_summary = await executors.run(
+                    "dataset", self._store_arrays, predictions, probabilities, shap_values,
+                    y, getattr(ml_model, "classes_", None)
+                )
+            shap_record = self._shap_record(shap_values, array_summary)
             prediction_data = {
                 "model": model,
                 "dataset": dataset,
+                "arrays_path": arrays_path,
                 "predictions": {
-                    "predictions": predictions.tolist(),
-                    "probabilities": probabilities.tolist() if probabilities is not None else None
+                    "summary": {
+                        name: array_summary[name]
+                        for name in ("predictions", "probabilities") if name in array_summary
+                    }
                 },
                 "metrics": metrics,
-                "shap_values": shap_values
+                "shap_values": shap_record
             }
             
-            prediction = await Prediction.create(**prediction_data)
+            try:
+                with stage("analyze.db_write"):
+                    prediction = await Prediction.create(**prediction_data)
+            except Exception:
+                array_store.delete_arrays(arrays_path)
+                raise
             
             return {
                 "prediction_id": prediction.id,
                 "metrics": metrics,
-                "shap_values": shap_values,
+                "curves": curves,
+                "shap_values": shap_record,
                 "model_info": {
                     "name": model.name,
                     "type": model.model_type,
@@ -92,69 +191,129 @@ class MLService:
         except Exception as e:
             raise Exception(f"Model analysis failed: {str(e)}")
     
-    def _calculate_metrics(self, y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, Any]:
+    def _store_arrays(self, predictions: np.ndarray, probabilities: Optional[np.ndarray],
+                      shap_data: Dict[str, Any], y_true: Any = None,
+                      classes: Optional[np.ndarray] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Calculate performance metrics
+        Save prediction and SHAP arrays to the array store
+        """
+        return array_store.save_arrays({
+            "predictions": predictions,
+            "probabilities": probabilities,
+            "y_true": np.asarray(y_true) if y_true is not None else None,
+            "classes": classes,
+            "shap_values": self._non_empty_array(shap_data.get("shap_values")),
+            "feature_values": self._non_empty_array(shap_data.get("feature_values")),
+            "shap_rows": self._non_empty_array(shap_data.get("row_index"))
+        })
+    
+    def _non_empty_array(self, values: Any) -> Optional[np.ndarray]:
         """
-        metrics = {
-            "accuracy": float(accuracy_score(y_true, y_pred)),
-            "precision": float(precision_score(y_true, y_pred, average='weighted', zero_division=0)),
-            "recall": float(recall_score(y_true, y_pred, average='weighted', zero_division=0)),
-            "f1_score": float(f1_score(y_true, y_pred, average='weighted', zero_division=0))
+        Array form of a list or array, or None when there is nothing to store
+        """
+        if values is None or len(values) == 0:
+            return None
+        return np.asarray(values)
+    
+    def _shap_record(self, shap_data: Dict[str, Any], array_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        SHAP metadata kept in the database; the matrices live in the array store
+        """
+        record = {
+            key: value for key, value in shap_data.items()
+            if key not in ("shap_values", "feature_values", "row_index")
         }
+        record["summary"] = {
+            name: array_summary[name]
+            for name in ("shap_values", "feature_values") if name in array_summary
+        }
+        return record
+    
+    def _calculate_metrics(self, y_true: np.ndarray, y_pred: np.ndarray,
+                           task_type: str = "classification") -> Dict[str, Any]:
+        """
+        Calculate performance metrics
+        """
+        if task_type == "regression":
+            return regression_metrics(y_true, y_pred)
         
-        # Confusion matrix
-        cm = confusion_matrix(y_true, y_pred)
-        metrics["confusion_matrix"] = cm.tolist()
-        
-        # Classification report
-        report = classification_report(y_true, y_pred, output_dict=True, zero_division=0)
-        metrics["classification_report"] = report
+        # Accuracy, weighted scores, confusion matrix and classification
+        # report all derive from a single confusion matrix
+        return classification_metrics(y_true, y_pred)
+    
+    def _calculate_curves(self, y_true: np.ndarray, probabilities: np.ndarray,
+                          classes: Optional[np.ndarray]) -> Dict[str, Any]:
+        """
+        Calculate ROC and PR curves from predicted probabilities
+        """
+        try:
+            return roc_pr_curves(y_true, probabilities, classes)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _shap_cache_key(self, model: Any, model_path: str, dataset_path: str,
+                        target_column: Optional[str]) -> str:
+        """
+        Cache key covering every input that determines a SHAP result
+        """
+        return shap_cache.make_key(
+            model_sha256=file_sha256(model_path),
+            dataset_sha256=file_sha256(dataset_path),
+            target_column=target_column,
+            sample_size=settings.SHAP_SAMPLE_SIZE,
+            max_features=settings.MAX_FEATURES_FOR_SHAP,
+            random_state=42,
+            explainer=explainers.explainer_kind(model),
+            kernel_budget=explainers.kernel_budget() if explainers.explainer_kind(model) == explainers.KERNEL else None,
+            shap_version=explainers.shap_version(),
+        )
+    
+    async def _shap_values(self, ml_model: Any, model_path: str, dataset_path: str,
+                           X: pd.DataFrame) -> Dict[str, Any]:
+        """
+        SHAP values of an analysis. Tree models whose sample spans several
+        SHAP_SHARD_ROWS shards are split here and explained shard by shard
+        on the long-lived "shap_shards" pool; everything else is one call
+        on the "shap" pool.
+        """
+        if explainers.explainer_kind(ml_model) == explainers.TREE and settings.SHAP_SHARD_WORKERS > 1:
+            try:
+                X_sample = await executors.run(
+                    "dataset", explainers.sample_for_shap, X, getattr(ml_model, "feature_names_in_", None)
+                )
+                shards = explainers.split_rows(X_sample, settings.SHAP_SHARD_ROWS)
+                if len(shards) > 1:
+                    parts = await asyncio.gather(*(
+                        executors.run("shap_shards", explainers.explain_shard, model_path, shard)
+                        for shard in shards
+                    ))
+                    return explainers.combine_shards(X, X_sample, parts)
+            except Exception as e:
+                return self._shap_failure(e)
         
-        return metrics
+        return await executors.run("shap", self._generate_shap_values, model_path, dataset_path, X)
     
-    async def _generate_shap_values(self, model: Any, X: pd.DataFrame) -> Dict[str, Any]:
+    def _generate_shap_values(self, model_path: str, dataset_path: str, X: pd.DataFrame) -> Dict[str, Any]:
         """
-        Generate SHAP values for model interpretability
+        Generate SHAP values for model interpretability.
+        
+        The model and its explainer come from the registry of the process
+        this runs in (a SHAP pool worker keeps its own), so repeated analyses
+        reuse both instead of rebuilding the explainer every time.
         """
         try:
-            # Sample data if too large
-            if len(X) > settings.SHAP_SAMPLE_SIZE:
-                X_sample = X.sample(n=settings.SHAP_SAMPLE_SIZE, random_state=42)
-            else:
-                X_sample = X
-            
-            # Limit features if too many
-            if len(X_sample.columns) > settings.MAX_FEATURES_FOR_SHAP:
-                # For MVP, take first N features
-                X_sample = X_sample.iloc[:, :settings.MAX_FEATURES_FOR_SHAP]
-            
-            # Create SHAP explainer
-            if hasattr(model, 'predict_proba'):
-                # For classification models
-                explainer = shap.TreeExplainer(model) if hasattr(model, 'feature_importances_') else shap.KernelExplainer(model.predict_proba, X_sample)
-            else:
-                # For regression models
-                explainer = shap.TreeExplainer(model) if hasattr(model, 'feature_importances_') else shap.KernelExplainer(model.predict, X_sample)
-            
-            # Calculate SHAP values
-            shap_values = explainer.shap_values(X_sample)
-            
-            # Prepare SHAP data for JSON serialization
-            shap_data = {
-                "feature_names": X_sample.columns.tolist(),
-                "feature_values": X_sample.values.tolist(),
-                "shap_values": shap_values.tolist() if isinstance(shap_values, np.ndarray) else [sv.tolist() for sv in shap_values],
-                "expected_value": explainer.expected_value.tolist() if hasattr(explainer, 'expected_value') else None,
-                "base_values": explainer.base_values.tolist() if hasattr(explainer, 'base_values') else None
-            }
-            
-            return shap_data
+            entry = self.registry.get_by_path(model_path)
+            cached = explainers.explainer_for_dataset(entry, X, dataset_path)
+            return explainers.explain(entry.model, X, cached)
             
         except Exception as e:
-            # Return empty SHAP data if calculation fails
-            print(f"SHAP calculation failed: {e}")
-            return {
+            return self._shap_failure(e)
+    
+    @staticmethod
+    def _shap_failure(e: Exception) -> Dict[str, Any]:
+        """Empty SHAP data returned when calculation fails"""
+        logger.warning("SHAP calculation failed: %s", e)
+        return {
                 "feature_names": [],
                 "feature_values": [],
                 "shap_values": [],
@@ -168,7 +327,7 @@ class MLService:
         Get detailed information about a model
         """
         try:
-            ml_model = joblib.load(model.file_path)
+            ml_model = self.registry.get_by_path(model.file_path).model
             
             info = {
                 "name": model.name,
@@ -192,12 +351,131 @@ class MLService:
         except Exception as e:
             raise Exception(f"Error getting model info: {str(e)}")
     
-    async def compare_models(self, model_ids: List[int], dataset_id: int) -> Dict[str, Any]:
+    async def compare_models(self, model_ids: List[str], dataset_path: str,
+                             target_column: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Compare multiple models on the same dataset.
+        
+        The dataset is parsed once into its column store; every model is then
+        evaluated concurrently on the compare executor, whose workers
+        memory-map the same column files instead of re-reading the source.
+        Curves are also resampled onto shared grids so they line up across
+        models.
+        """
+        try:
+            schema = await executors.run("dataset", column_store.ensure_column_store, dataset_path)
+            columns = [column["name"] for column in schema["columns"]]
+            
+            # For MVP, assume last column is target
+            target_column = target_column or columns[-1]
+            if target_column not in columns:
+                raise ValueError(f"Target column '{target_column}' not in dataset")
+            feature_columns = [name for name in columns if name != target_column]
+            
+            model_ids = list(dict.fromkeys(model_ids))
+            results = await asyncio.gather(*(
+                executors.run(
+                    "compare", self._evaluate_model, model_id, dataset_path,
+                    feature_columns, target_column
+                )
+                for model_id in model_ids
+            ))
+            
+            evaluated = [result for result in results if result["success"]]
+            failed = [
+                {"model_id": result["model_id"], "error": result["error"]}
+                for result in results if not result["success"]
+            ]
+            
+            # One row of scalar metrics per model
+            table = []
+            for result in evaluated:
+                row = {
+                    "model_id": result["model_id"],
+                    "algorithm": result["algorithm"],
+                    "task_type": result["task_type"],
+                }
+                row.update({
+                    name: value for name, value in result["metrics"].items()
+                    if isinstance(value, (int, float))
+                })
+                if result["curves"] is not None:
+                    row["roc_auc"] = result["curves"]["macro_roc_auc"]
+                row["seconds"] = result["seconds"]
+                table.append(row)
+            
+            return {
+                "success": True,
+                "dataset_info": {
+                    "file_path": dataset_path,
+                    "rows": schema["rows"],
+                    "columns": len(columns),
+                    "target_column": target_column
+                },
+                "table": table,
+                "models": [
+                    {name: result[name] for name in ("model_id", "algorithm", "task_type", "metrics", "curves")}
+                    for result in evaluated
+                ],
+                "aligned_curves": {
+                    result["model_id"]: result["aligned_curves"]
+                    for result in evaluated if result["aligned_curves"] is not None
+                },
+                "failed": failed,
+                "message": f"Compared {len(evaluated)} of {len(model_ids)} models"
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Model comparison failed: {str(e)}"
+            }
+    
+    def _evaluate_model(self, model_id: str, dataset_path: str, feature_columns: List[str],
+                        target_column: str) -> Dict[str, Any]:
         """
-        Compare multiple models on the same dataset
+        Evaluate one model on a dataset's column store (runs in a compare worker)
         """
-        # TODO: Implement model comparison functionality
-        return {"message": "Model comparison - to be implemented"}
+        started = time.perf_counter()
+        try:
+            ml_model = self.registry.get(model_id).model
+            df = column_store.load_frame(dataset_path, columns=feature_columns + [target_column])
+            
+            feature_names = getattr(ml_model, "feature_names_in_", None)
+            X = df[list(feature_names)] if feature_names is not None else df[feature_columns]
+            y = df[target_column].to_numpy()
+            
+            predictions = ml_model.predict(X)
+            task_type = _task_type(ml_model)
+            metrics = self._calculate_metrics(y, predictions, task_type)
+            
+            curves = None
+            aligned_curves = None
+            if task_type == "classification" and hasattr(ml_model, "predict_proba"):
+                probabilities = ml_model.predict_proba(X)
+                classes = getattr(ml_model, "classes_", None)
+                curves = self._calculate_curves(y, probabilities, classes)
+                if "error" not in curves:
+                    aligned_curves = curves_on_grid(y, probabilities, classes)
+            
+            return {
+                "success": True,
+                "model_id": model_id,
+                "algorithm": type(ml_model).__name__,
+                "task_type": task_type,
+                "metrics": metrics,
+                "curves": curves,
+                "aligned_curves": aligned_curves,
+                "seconds": time.perf_counter() - started
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "model_id": model_id,
+                "error": str(e)
+            }
     
     # MVP Methods
     def load_model(self, file_path: str) -> Dict[str, Any]:
@@ -205,18 +483,9 @@ class MLService:
         Load a machine learning model from file
         """
         try:
-            # Load model based on file extension
-            if file_path.endswith(('.pkl', '.joblib')):
-                model = joblib.load(file_path)
-            elif file_path.endswith('.pt'):
-                # PyTorch model - for future implementation
-                raise NotImplementedError("PyTorch models not yet supported")
-            else:
-                raise ValueError(f"Unsupported model format: {file_path}")
-            
-            # Store current model
-            self.current_model = model
-            self.current_model_path = file_path
+            # Load model into the shared registry
+            entry = self.registry.register(file_path)
+            model = entry.model
             
             # Get model info
             model_info = {
@@ -228,6 +497,7 @@ class MLService:
             
             return {
                 "success": True,
+                "model_id": entry.model_id,
                 "model_info": model_info,
                 "message": "Model loaded successfully"
             }
@@ -239,49 +509,193 @@ class MLService:
                 "message": f"Failed to load model: {str(e)}"
             }
     
-    def predict(self, data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    def predict(self, data: Union[List[Dict[str, Any]], Dict[str, Any]],
+                model_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Make predictions using the loaded model
+        Make predictions using a registered model (the latest upload by default)
         """
         try:
-            if self.current_model is None:
-                return {
-                    "success": False,
-                    "error": "No model loaded",
-                    "message": "Please upload a model first"
-                }
+            try:
+                entry = self.registry.get(model_id)
+            except ModelNotFoundError as e:
+                return self.model_not_found(model_id, e)
             
             # Convert data to DataFrame
             if isinstance(data, dict):
                 data = [data]
             
-            df = pd.DataFrame(data)
+            with stage("predict.build_frame"):
+                df = pd.DataFrame(data)
             
             # Make predictions
-            predictions = self.current_model.predict(df)
+            predictions, probabilities = self.predict_frame(entry.model_id, df)
+            
+            return self.prediction_result(entry, predictions, probabilities)
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Prediction failed: {str(e)}"
+            }
+    
+    def predict_frame(self, model_id: str, df: pd.DataFrame) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Run predict (and predict_proba if available) on a prepared DataFrame
+        """
+        model = self.registry.get(model_id).model
+        with stage("predict.model"):
+            predictions = model.predict(df)
             
             # Get probabilities if available
             probabilities = None
-            if hasattr(self.current_model, 'predict_proba'):
-                probabilities = self.current_model.predict_proba(df).tolist()
+            if hasattr(model, 'predict_proba'):
+                probabilities = model.predict_proba(df)
+        
+        ROWS_SCORED.inc(len(df))
+        return predictions, probabilities
+    
+    def prediction_result(self, entry: ModelEntry, predictions: np.ndarray,
+                          probabilities: Optional[np.ndarray]) -> Dict[str, Any]:
+        """
+        Build the predict() result payload; arrays are left for the
+        response encoder
+        """
+        return {
+            "success": True,
+            "predictions": predictions,
+            "probabilities": probabilities,
+            "model_info": {
+                "model_id": entry.model_id,
+                "algorithm": type(entry.model).__name__,
+                "model_path": entry.file_path
+            },
+            "message": "Predictions generated successfully"
+        }
+    
+    def explain(self, data: Union[List[Dict[str, Any]], Dict[str, Any]], model_id: Optional[str] = None,
+                background_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Predict and explain a few rows with the model's cached explainer
+        """
+        try:
+            try:
+                entry = self.registry.get(model_id)
+            except ModelNotFoundError as e:
+                return self.model_not_found(model_id, e)
+            
+            df = pd.DataFrame([data] if isinstance(data, dict) else data)
+            
+            explainer = explainers.get_explainer(entry, background_path)
+            predictions, probabilities = self.predict_frame(entry.model_id, df)
+            shap_values, expected_value = explainer.shap_values(df)
+            
+            feature_names = explainer.feature_names if explainer.feature_names is not None else df.columns
             
+            result = self.prediction_result(entry, predictions, probabilities)
+            result.update({
+                "feature_names": [str(name) for name in feature_names],
+                "shap_values": shap_values,
+                "expected_value": np.asarray(expected_value),
+                "explainer": explainer.info(),
+                "message": "Explanations generated successfully"
+            })
+            return result
+            
+        except Exception as e:
             return {
-                "success": True,
-                "predictions": predictions.tolist(),
-                "probabilities": probabilities,
-                "model_info": {
-                    "algorithm": type(self.current_model).__name__,
-                    "model_path": self.current_model_path
-                },
-                "message": "Predictions generated successfully"
+                "success": False,
+                "error": str(e),
+                "message": f"Explanation failed: {str(e)}"
             }
-            
+    
+    def model_not_found(self, model_id: Optional[str], error: ModelNotFoundError) -> Dict[str, Any]:
+        """
+        Build the failure payload for an unknown model id
+        """
+        return {
+            "success": False,
+            "error": str(error.args[0]),
+            "message": "Please upload a model first" if model_id is None else str(error.args[0])
+        }
+    
+    def find_dataset(self, dataset_id: str) -> str:
+        """
+        Locate an uploaded dataset file by its id (the stem of the stored file)
+        """
+        if not re.match(r"^[A-Za-z0-9_-]+$", dataset_id):
+            raise FileNotFoundError(f"Invalid dataset id: {dataset_id}")
+        
+        for ext in settings.ALLOWED_DATASET_EXTENSIONS:
+            candidate = os.path.join(settings.DATASET_UPLOAD_DIR, f"{dataset_id}{ext}")
+            if os.path.exists(candidate):
+                return candidate
+        
+        raise FileNotFoundError(f"Dataset '{dataset_id}' not found")
+    
+    def score_dataset(self, model_id: str, file_path: str, output_format: str = "ndjson",
+                      chunk_rows: Optional[int] = None,
+                      target_column: Optional[str] = None) -> Iterator[bytes]:
+        """
+        Score a dataset file chunk by chunk, yielding encoded results.
+        
+        Only `chunk_rows` rows (plus their predictions) are held in memory at
+        a time, except for columns the column store has to pickle (mixed
+        types, categoricals, very long strings), which are read whole. The
+        model's `feature_names_in_` select the input columns when present;
+        otherwise every column except `target_column` is used.
+        """
+        entry = self.registry.get(model_id)
+        chunk_rows = chunk_rows or settings.BATCH_SCORE_CHUNK_ROWS
+        
+        feature_names = getattr(entry.model, "feature_names_in_", None)
+        columns = list(feature_names) if feature_names is not None else None
+        
+        classes = getattr(entry.model, "classes_", None)
+        classes = classes.tolist() if classes is not None else None
+        
+        start = 0
+        for chunk in column_store.iter_chunks(file_path, chunk_rows, columns=columns):
+            if columns is None and target_column in chunk.columns:
+                chunk = chunk.drop(columns=[target_column])
+            
+            predictions, probabilities = self.predict_frame(entry.model_id, chunk)
+            yield encode_score_chunk(
+                start, predictions, probabilities, classes, output_format, header=start == 0
+            )
+            start += len(chunk)
+    
+    def write_scores(self, model_id: str, file_path: str, output_format: str = "ndjson",
+                     chunk_rows: Optional[int] = None,
+                     target_column: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Score a dataset file into a results file under BATCH_SCORE_RESULTS_DIR
+        """
+        os.makedirs(settings.BATCH_SCORE_RESULTS_DIR, exist_ok=True)
+        results_path = os.path.join(
+            settings.BATCH_SCORE_RESULTS_DIR, f"{uuid.uuid4()}.{output_format}"
+        )
+        
+        try:
+            with open(results_path, "wb") as f:
+                for block in self.score_dataset(model_id, file_path, output_format,
+                                                chunk_rows, target_column):
+                    f.write(block)
         except Exception as e:
+            if os.path.exists(results_path):
+                os.remove(results_path)
             return {
                 "success": False,
                 "error": str(e),
-                "message": f"Prediction failed: {str(e)}"
+                "message": f"Batch scoring failed: {str(e)}"
             }
+        
+        return {
+            "success": True,
+            "results_path": results_path,
+            "size_bytes": os.path.getsize(results_path),
+            "message": "Dataset scored successfully"
+        }
     
     def evaluate_metrics(self, y_true: List[Union[int, float]], 
                         y_pred: List[Union[int, float]], 
@@ -294,21 +708,9 @@ class MLService:
             y_pred = np.array(y_pred)
             
             if task_type == "classification":
-                metrics = {
-                    "accuracy": float(accuracy_score(y_true, y_pred)),
-                    "precision": float(precision_score(y_true, y_pred, average='weighted', zero_division=0)),
-                    "recall": float(recall_score(y_true, y_pred, average='weighted', zero_division=0)),
-                    "f1_score": float(f1_score(y_true, y_pred, average='weighted', zero_division=0)),
-                    "confusion_matrix": confusion_matrix(y_true, y_pred).tolist(),
-                    "classification_report": classification_report(y_true, y_pred, output_dict=True, zero_division=0)
-                }
+                metrics = classification_metrics(y_true, y_pred)
             else:  # regression
-                metrics = {
-                    "mse": float(mean_squared_error(y_true, y_pred)),
-                    "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
-                    "mae": float(mean_absolute_error(y_true, y_pred)),
-                    "r2_score": float(r2_score(y_true, y_pred))
-                }
+                metrics = regression_metrics(y_true, y_pred)
             
             return {
                 "success": True,
@@ -324,26 +726,54 @@ class MLService:
                 "message": f"Metrics calculation failed: {str(e)}"
             }
     
-    def load_dataset(self, file_path: str) -> Dict[str, Any]:
+    def build_dataset_store(self, file_path: str) -> Dict[str, Any]:
         """
-        Load and preview a dataset
+        Convert an uploaded dataset into its columnar binary store
         """
         try:
-            # Load dataset based on file extension
-            if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
-            elif file_path.endswith('.json'):
-                df = pd.read_json(file_path)
-            else:
-                raise ValueError(f"Unsupported dataset format: {file_path}")
+            schema = column_store.build_column_store(file_path)
             
-            # Get basic info
-            info = {
-                "shape": df.shape,
-                "columns": df.columns.tolist(),
-                "dtypes": df.dtypes.astype(str).to_dict(),
-                "preview": df.head(10).to_dict('records')
+            return {
+                "success": True,
+                "schema": schema,
+                "message": "Dataset store built successfully"
+            }
+            
+        except Exception as e:
+            column_store.remove_column_store(file_path)
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Failed to load dataset: {str(e)}"
             }
+    
+    def load_dataset(self, file_path: str, preview: bool = False) -> Dict[str, Any]:
+        """
+        Load and preview a dataset.
+        In preview mode only the first rows are parsed and the result is cached per file.
+        """
+        try:
+            if preview:
+                with stage("dataset.preview"):
+                    dataset_info = dataset_metadata_cache.get_or_load(file_path)
+                return {
+                    "success": True,
+                    "dataset_info": dataset_info,
+                    "message": "Dataset loaded successfully"
+                }
+            
+            # Load dataset from its column store (built on first read)
+            with stage("dataset.load"):
+                df = column_store.load_frame(file_path)
+            
+            # Get basic info
+            with stage("dataset.describe"):
+                info = {
+                    "shape": df.shape,
+                    "columns": df.columns.tolist(),
+                    "dtypes": df.dtypes.astype(str).to_dict(),
+                    "preview": df.head(10).to_dict('records')
+                }
             
             return {
                 "success": True,
@@ -0,0 +1,206 @@
+"""
+Model Registry
+Process-wide cache of loaded models with LRU eviction under a memory budget
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.instrumentation import stage, MODELS_LOADED
+
+
+_MODEL_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class ModelNotFoundError(KeyError):
+    """Raised when a model id cannot be resolved to a model file"""
+
+
+class ModelEntry:
+    """A loaded model together with its bookkeeping data"""
+
+    def __init__(self, model_id: str, file_path: str, model: Any, size_bytes: int):
+        self.model_id = model_id
+        self.file_path = file_path
+        self.model = model
+        self.size_bytes = size_bytes
+        # Built on first /explain and dropped together with the model
+        self.explainer: Optional[Any] = None
+        self.explainer_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Holds many loaded estimators keyed by model id.
+
+    The model id is the stem of the uploaded model file, so an evicted or
+    never-loaded model can always be reloaded from the upload directory.
+    The in-memory size of an estimator is approximated by its serialized
+    size on disk.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, model_dir: str):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.model_dir = model_dir
+        self._entries: "OrderedDict[str, ModelEntry]" = OrderedDict()
+        self._paths: Dict[str, str] = {}
+        self._default_id: Optional[str] = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def model_id_for_path(file_path: str) -> str:
+        """Derive the registry id of a model file"""
+        return os.path.splitext(os.path.basename(file_path))[0]
+
+    def register(self, file_path: str, model_id: Optional[str] = None) -> ModelEntry:
+        """
+        Load a model file into the registry and make it the default model
+        """
+        model_id = model_id or self.model_id_for_path(file_path)
+        model = self._load_from_disk(file_path)
+        entry = ModelEntry(model_id, file_path, model, os.path.getsize(file_path))
+
+        with self._lock:
+            self._paths[model_id] = file_path
+            self._insert(entry)
+            self._default_id = model_id
+
+        return entry
+
+    def get(self, model_id: Optional[str] = None) -> ModelEntry:
+        """
+        Return the loaded model for `model_id`, reloading it on a miss.
+        Without an id the most recently registered model is returned.
+        """
+        model_id = self.resolve_id(model_id)
+
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None:
+                self._entries.move_to_end(model_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        file_path = self.find_path(model_id)
+        model = self._load_from_disk(file_path)
+        entry = ModelEntry(model_id, file_path, model, os.path.getsize(file_path))
+
+        with self._lock:
+            # Another caller may have loaded the same model meanwhile
+            existing = self._entries.get(model_id)
+            if existing is not None:
+                self._entries.move_to_end(model_id)
+                return existing
+            self._paths[model_id] = file_path
+            self._insert(entry)
+
+        return entry
+
+    def get_by_path(self, file_path: str) -> ModelEntry:
+        """Return the loaded model stored at `file_path`"""
+        model_id = self.model_id_for_path(file_path)
+        with self._lock:
+            self._paths.setdefault(model_id, file_path)
+        return self.get(model_id)
+
+    def resolve_id(self, model_id: Optional[str] = None) -> str:
+        """Resolve an optional model id to a concrete one"""
+        if model_id is None:
+            if self._default_id is None:
+                raise ModelNotFoundError("No model loaded")
+            return self._default_id
+
+        if not _MODEL_ID_PATTERN.match(model_id):
+            raise ModelNotFoundError(f"Invalid model id: {model_id}")
+
+        return model_id
+
+    @property
+    def default_model_id(self) -> Optional[str]:
+        """Id of the most recently registered model, if any"""
+        return self._default_id
+
+    def evict(self, model_id: str) -> bool:
+        """Drop a model from memory; it can still be reloaded later"""
+        with self._lock:
+            return self._entries.pop(model_id, None) is not None
+
+    def loaded_ids(self) -> List[str]:
+        """Model ids currently held in memory, least recently used first"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry usage statistics"""
+        with self._lock:
+            return {
+                "loaded_models": len(self._entries),
+                "used_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "default_model_id": self._default_id,
+            }
+
+    def _insert(self, entry: ModelEntry) -> None:
+        """Insert an entry and evict least recently used ones over budget"""
+        self._entries[entry.model_id] = entry
+        self._entries.move_to_end(entry.model_id)
+
+        used = sum(e.size_bytes for e in self._entries.values())
+        while len(self._entries) > 1 and (
+            used > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            used -= evicted.size_bytes
+            self.evictions += 1
+
+    def find_path(self, model_id: str) -> str:
+        """Locate the model file for an id"""
+        model_id = self.resolve_id(model_id)
+        with self._lock:
+            file_path = self._paths.get(model_id)
+        if file_path and os.path.exists(file_path):
+            return file_path
+
+        for ext in settings.ALLOWED_MODEL_EXTENSIONS:
+            candidate = os.path.join(self.model_dir, f"{model_id}{ext}")
+            if os.path.exists(candidate):
+                return candidate
+
+        raise ModelNotFoundError(f"Model '{model_id}' not found")
+
+    @staticmethod
+    def _load_from_disk(file_path: str) -> Any:
+        """Load a model based on its file extension"""
+        if file_path.endswith(('.pkl', '.joblib')):
+            import joblib
+
+            with stage("model.load"):
+                model = joblib.load(file_path)
+            MODELS_LOADED.inc()
+            return model
+        elif file_path.endswith('.pt'):
+            # PyTorch model - for future implementation
+            raise NotImplementedError("PyTorch models not yet supported")
+        else:
+            raise ValueError(f"Unsupported model format: {file_path}")
+
+
+# Shared registry used by every router
+model_registry = ModelRegistry(
+    max_bytes=settings.MODEL_CACHE_MAX_BYTES,
+    max_entries=settings.MODEL_CACHE_MAX_ENTRIES,
+    model_dir=settings.MODEL_UPLOAD_DIR,
+)
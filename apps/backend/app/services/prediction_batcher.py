@@ -0,0 +1,168 @@
+"""
+Prediction Batcher
+Coalesces concurrent /predict requests for the same model into one vectorized call
+"""
+
+import asyncio
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Union, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executors import executors
+from app.services.ml_service import MLService
+from app.services.model_registry import ModelEntry, ModelNotFoundError
+
+
+class _PendingBatch:
+    """Rows collected for one (model, columns) key while the batch window is open"""
+
+    def __init__(self, entry: ModelEntry, columns: Tuple[str, ...]):
+        self.entry = entry
+        self.columns = columns
+        self.rows: List[Dict[str, Any]] = []
+        self.waiters: List[Tuple[asyncio.Future, int, int]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class PredictionBatcher:
+    """
+    Collects concurrent prediction requests for up to `max_wait_ms` or
+    `max_rows` rows, runs them as a single predict/predict_proba call and
+    splits the results back to each caller.
+
+    Requests are only merged when they target the same model with the same
+    column layout, so every batch is a well-formed DataFrame.
+    """
+
+    def __init__(self, ml_service: MLService, max_wait_ms: float, max_rows: int):
+        self.ml_service = ml_service
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_rows = max_rows
+        self._pending: Dict[Tuple[str, Tuple[str, ...]], _PendingBatch] = {}
+        self._tasks = set()
+        self.batches = 0
+        self.rows = 0
+        self.requests = 0
+
+    async def predict(self, data: Union[List[Dict[str, Any]], Dict[str, Any]],
+                      model_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Batched equivalent of MLService.predict
+        """
+        try:
+            # A registry miss deserializes the model; keep it off the event loop
+            entry = await executors.run("inference", self.ml_service.registry.get, model_id)
+        except ModelNotFoundError as e:
+            return self.ml_service.model_not_found(model_id, e)
+
+        rows = [data] if isinstance(data, dict) else list(data)
+        columns = tuple(rows[0].keys()) if rows else ()
+
+        # Oversized or ragged requests gain nothing from batching
+        if (not rows or len(rows) >= self.max_rows
+                or any(tuple(row.keys()) != columns for row in rows)):
+            return await executors.run("inference", self.ml_service.predict, rows, entry.model_id)
+
+        try:
+            predictions, probabilities = await self._submit(entry, columns, rows)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"Prediction failed: {str(e)}"
+            }
+
+        return self.ml_service.prediction_result(entry, predictions, probabilities)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching statistics"""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+            "pending_batches": len(self._pending),
+        }
+
+    async def _submit(self, entry: ModelEntry, columns: Tuple[str, ...],
+                      rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Add rows to the open batch for their key and wait for the result"""
+        loop = asyncio.get_running_loop()
+        key = (entry.model_id, columns)
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(entry, columns)
+            batch.timer = loop.call_later(self.max_wait, self._flush, key)
+            self._pending[key] = batch
+
+        future = loop.create_future()
+        start = len(batch.rows)
+        batch.rows.extend(rows)
+        batch.waiters.append((future, start, len(batch.rows)))
+
+        if len(batch.rows) >= self.max_rows:
+            batch.timer.cancel()
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, Tuple[str, ...]]) -> None:
+        """Close the batch for `key` and schedule its execution"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        """Predict a closed batch and resolve every waiter"""
+        self.batches += 1
+        self.requests += len(batch.waiters)
+        self.rows += len(batch.rows)
+
+        try:
+            df = pd.DataFrame(batch.rows, columns=list(batch.columns))
+            predictions, probabilities = await executors.run(
+                "inference", self.ml_service.predict_frame, batch.entry.model_id, df
+            )
+        except Exception:
+            # One malformed request must not fail its neighbours
+            await self._run_individually(batch)
+            return
+
+        for future, start, stop in batch.waiters:
+            if not future.done():
+                future.set_result((
+                    predictions[start:stop],
+                    probabilities[start:stop] if probabilities is not None else None
+                ))
+
+    async def _run_individually(self, batch: _PendingBatch) -> None:
+        """Fallback when a merged batch fails: predict each request alone"""
+        for future, start, stop in batch.waiters:
+            if future.done():
+                continue
+            try:
+                df = pd.DataFrame(batch.rows[start:stop], columns=list(batch.columns))
+                result = await executors.run(
+                    "inference", self.ml_service.predict_frame, batch.entry.model_id, df
+                )
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            # The caller may have gone away (cancelling its future) meanwhile
+            if not future.done():
+                future.set_result(result)
+
+
+# Shared batcher used by the models router when batching is enabled
+prediction_batcher = PredictionBatcher(
+    MLService(),
+    max_wait_ms=settings.PREDICT_BATCH_MAX_WAIT_MS,
+    max_rows=settings.PREDICT_BATCH_MAX_ROWS,
+)
@@ -0,0 +1,76 @@
+"""
+Prewarm
+Startup preloading of heavy modules, models and their explainers
+"""
+
+import importlib
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.executors import executors
+from app.services import explainers
+from app.services.model_registry import model_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+def import_module(name: str) -> float:
+    """Import a module by name; returns the seconds taken (about 0 if already loaded)"""
+    started = time.perf_counter()
+    importlib.import_module(name)
+    return time.perf_counter() - started
+
+
+def load_model(model_id: str, explainer: bool = False,
+               background_path: Optional[str] = None) -> Dict[str, Any]:
+    """Load a model into the registry and optionally build its cached explainer"""
+    started = time.perf_counter()
+    entry = model_registry.get(model_id)
+    result: Dict[str, Any] = {"model_id": entry.model_id, "load_seconds": time.perf_counter() - started}
+
+    if explainer:
+        started = time.perf_counter()
+        result["explainer"] = explainers.get_explainer(entry, background_path).kind
+        result["explainer_seconds"] = time.perf_counter() - started
+    return result
+
+
+async def prewarm(imports: Optional[List[str]] = None, model_ids: Optional[List[str]] = None,
+                  explainer: Optional[bool] = None, background_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import modules and load models (PREWARM_* settings by default) on the
+    inference pool, where predictions and explanations use them.
+
+    Failures are logged and reported per step rather than raised, so a
+    missing model never fails startup. Process-pool workers (SHAP by
+    default) still import on their first task.
+    """
+    imports = settings.PREWARM_IMPORTS if imports is None else imports
+    model_ids = settings.PREWARM_MODEL_IDS if model_ids is None else model_ids
+    explainer = settings.PREWARM_EXPLAINERS if explainer is None else explainer
+    background_path = background_path or settings.PREWARM_BACKGROUND_PATH
+
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"imports": {}, "models": [], "errors": []}
+
+    for name in imports:
+        try:
+            report["imports"][name] = await executors.run("inference", import_module, name)
+        except Exception as e:
+            logger.warning("Prewarm import of %s failed: %s", name, e)
+            report["errors"].append({"step": f"import:{name}", "error": str(e)})
+
+    for model_id in model_ids:
+        try:
+            report["models"].append(
+                await executors.run("inference", load_model, model_id, explainer, background_path)
+            )
+        except Exception as e:
+            logger.warning("Prewarm of model %s failed: %s", model_id, e)
+            report["errors"].append({"step": f"model:{model_id}", "error": str(e)})
+
+    report["seconds"] = time.perf_counter() - started
+    return report
@@ -0,0 +1,204 @@
+"""
+Result Slices
+Server-side windows over stored prediction and SHAP arrays; slices are
+returned as arrays for NumpyJSONResponse
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.array_store import ArrayBundle
+
+
+BY_SHAP = "shap"
+BY_ERROR = "error"
+
+
+def _window(total: int, offset: int, limit: int) -> slice:
+    start = min(max(offset, 0), total)
+    return slice(start, min(start + max(limit, 0), total))
+
+
+def _select(names: List[Any], requested: Optional[List[str]], kind: str) -> List[int]:
+    """Positions of the requested names, matched on their string form"""
+    if not requested:
+        return list(range(len(names)))
+    positions = {str(name): index for index, name in enumerate(names)}
+    missing = [name for name in requested if name not in positions]
+    if missing:
+        raise ValueError(f"Unknown {kind}: {missing}")
+    return [positions[name] for name in requested]
+
+
+def _classes(bundle: ArrayBundle) -> Optional[List[Any]]:
+    classes = bundle.get("classes")
+    return classes.tolist() if classes is not None else None
+
+
+def _require(bundle: ArrayBundle, name: str, what: str) -> np.ndarray:
+    array = bundle.get(name)
+    if array is None:
+        raise ValueError(f"This result has no stored {what}")
+    return array
+
+
+def _shap_rows(bundle: ArrayBundle, shap_values: np.ndarray) -> np.ndarray:
+    """Dataset row of every explained row (results stored before row tracking are in order)"""
+    rows = bundle.get("shap_rows")
+    return rows if rows is not None else np.arange(len(shap_values))
+
+
+def _shap_block(shap_values: np.ndarray, classes: Optional[List[Any]],
+                feature_index: List[int], requested_classes: Optional[List[str]]) -> Tuple[np.ndarray, Optional[List[Any]]]:
+    """
+    SHAP values restricted to the selected features and, for per-class
+    (rows, features, classes) outputs, to the selected classes
+    """
+    block = shap_values[:, feature_index]
+    if block.ndim != 3:
+        return block, None
+    names = classes if classes is not None else list(range(block.shape[2]))
+    class_index = _select(names, requested_classes, "classes")
+    return block[:, :, class_index], [names[index] for index in class_index]
+
+
+def result_summary(bundle: ArrayBundle, feature_names: Optional[List[str]]) -> Dict[str, Any]:
+    """Row counts, classes and stored array shapes of one result"""
+    predictions = bundle["predictions"]
+    shap_values = bundle.get("shap_values")
+    return {
+        "rows": int(len(predictions)),
+        "explained_rows": int(len(shap_values)) if shap_values is not None else 0,
+        "classes": _classes(bundle),
+        "feature_names": feature_names or [],
+        "arrays": {name: list(bundle[name].shape) for name in bundle.keys()},
+    }
+
+
+def prediction_page(bundle: ArrayBundle, offset: int, limit: int,
+                    classes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Predictions, labels and probabilities of rows [offset, offset + limit),
+    with probability columns limited to `classes`
+    """
+    predictions = bundle["predictions"]
+    window = _window(len(predictions), offset, limit)
+    result: Dict[str, Any] = {
+        "offset": window.start,
+        "total": int(len(predictions)),
+        "rows": np.arange(window.start, window.stop),
+        "predictions": predictions[window],
+        "y_true": None,
+        "classes": None,
+        "probabilities": None,
+    }
+
+    y_true = bundle.get("y_true")
+    if y_true is not None:
+        result["y_true"] = y_true[window]
+
+    probabilities = bundle.get("probabilities")
+    if probabilities is not None:
+        names = _classes(bundle) or list(range(probabilities.shape[1]))
+        class_index = _select(names, classes, "classes")
+        result["classes"] = [names[index] for index in class_index]
+        result["probabilities"] = probabilities[window][:, class_index]
+    elif classes:
+        raise ValueError("This result has no stored probabilities")
+
+    return result
+
+
+def shap_page(bundle: ArrayBundle, feature_names: List[str], offset: int, limit: int,
+              features: Optional[List[str]] = None,
+              classes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    SHAP and feature values of explained rows [offset, offset + limit),
+    restricted to the selected features and classes. `rows` maps each
+    explained row back to its dataset row.
+    """
+    shap_values = _require(bundle, "shap_values", "SHAP values")
+    feature_index = _select(feature_names, features, "features")
+    window = _window(len(shap_values), offset, limit)
+
+    block, class_names = _shap_block(shap_values[window], _classes(bundle), feature_index, classes)
+    feature_values = bundle.get("feature_values")
+    return {
+        "offset": window.start,
+        "total": int(len(shap_values)),
+        "rows": _shap_rows(bundle, shap_values)[window],
+        "features": [feature_names[index] for index in feature_index],
+        "classes": class_names,
+        "shap_values": block,
+        "feature_values": (
+            feature_values[window][:, feature_index] if feature_values is not None else None
+        ),
+    }
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest scores, largest first, in O(n + k log k)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _error_scores(bundle: ArrayBundle) -> np.ndarray:
+    """
+    Per-row error: |y - prediction| for regression, 1 - p(true class) for
+    classifiers with probabilities, and a 0/1 miss flag otherwise
+    """
+    y_true = _require(bundle, "y_true", "labels")
+    predictions = bundle["predictions"]
+    classes = _classes(bundle)
+
+    if classes is None:
+        return np.abs(y_true.astype(np.float64) - predictions.astype(np.float64))
+
+    probabilities = bundle.get("probabilities")
+    if probabilities is None:
+        return (y_true.astype(str) != predictions.astype(str)).astype(np.float64)
+
+    positions = {str(name): index for index, name in enumerate(classes)}
+    codes = np.array([positions.get(label, -1) for label in y_true.astype(str).tolist()])
+    true_proba = np.where(
+        codes >= 0, probabilities[np.arange(len(codes)), np.maximum(codes, 0)], 0.0
+    )
+    return 1.0 - true_proba.astype(np.float64)
+
+
+def top_rows(bundle: ArrayBundle, feature_names: List[str], by: str, k: int,
+             features: Optional[List[str]] = None,
+             classes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    The k rows with the largest total |SHAP| over the selected features and
+    classes, or the largest prediction error
+    """
+    predictions = bundle["predictions"]
+    y_true = bundle.get("y_true")
+
+    if by == BY_SHAP:
+        shap_values = _require(bundle, "shap_values", "SHAP values")
+        block, _ = _shap_block(
+            shap_values, _classes(bundle), _select(feature_names, features, "features"), classes
+        )
+        scores = np.abs(block.astype(np.float64)).reshape(len(block), -1).sum(axis=1)
+        rows = _shap_rows(bundle, shap_values)
+    elif by == BY_ERROR:
+        scores = _error_scores(bundle)
+        rows = np.arange(len(scores))
+    else:
+        raise ValueError(f"Unsupported ranking: {by}")
+
+    top = _top_k(scores, k)
+    rows = rows[top]
+    return {
+        "by": by,
+        "rows": rows,
+        "scores": scores[top],
+        "predictions": predictions[rows],
+        "y_true": y_true[rows] if y_true is not None else None,
+    }
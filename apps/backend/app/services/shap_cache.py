@@ -0,0 +1,130 @@
+"""
+SHAP Cache
+Persistent, content-addressed cache of SHAP results
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def _to_json(value: Any) -> Any:
+    """JSON form of the numpy arrays and scalars inside a SHAP payload"""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ShapCache:
+    """
+    Stores SHAP payloads on disk under a key derived from everything that
+    determines them: model and dataset content hashes, sampling parameters
+    and explainer type and version.
+
+    Entries are evicted least recently used (by file mtime, refreshed on
+    every hit) once the cache directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a cache key from the parameters that determine a result"""
+        encoded = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached payload, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Refresh recency for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a payload and evict old entries over the size budget"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        staging = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(staging, "w") as f:
+            json.dump(value, f, default=_to_json)
+        os.replace(staging, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache usage statistics"""
+        entries = 0
+        used = 0
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    entries += 1
+                    used += os.path.getsize(os.path.join(self.directory, name))
+
+        with self._lock:
+            return {
+                "enabled": settings.SHAP_CACHE_ENABLED,
+                "entries": entries,
+                "used_bytes": used,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Shared SHAP cache
+shap_cache = ShapCache(settings.SHAP_CACHE_DIR, settings.SHAP_CACHE_MAX_BYTES)
@@ -0,0 +1,212 @@
+"""
+Codecs
+Columnar and binary request/response bodies for prediction endpoints
+"""
+
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+JSON = "application/json"
+NPY = "application/x-npy"
+ARROW = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+
+_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+SUPPORTED_MEDIA_TYPES = (JSON, NPY, ARROW, MSGPACK)
+
+
+class UnsupportedMediaTypeError(ValueError):
+    """Raised for a body format that cannot be decoded or encoded"""
+
+
+def media_type(header: Optional[str], default: str = JSON) -> str:
+    """Normalize a Content-Type header value to a bare media type"""
+    if not header:
+        return default
+    value = header.split(";", 1)[0].strip().lower()
+    return _ALIASES.get(value, value)
+
+
+def negotiate(accept: Optional[str], default: str = JSON) -> str:
+    """Pick the first supported media type from an Accept header"""
+    if not accept:
+        return default
+    for part in accept.split(","):
+        value = media_type(part, default)
+        if value in ("*/*", "application/*"):
+            return default
+        if value in SUPPORTED_MEDIA_TYPES:
+            return value
+    raise UnsupportedMediaTypeError(f"None of the accepted types are supported: {accept}")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise UnsupportedMediaTypeError("Arrow bodies require the pyarrow package")
+    return pyarrow
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise UnsupportedMediaTypeError("msgpack bodies require the msgpack package")
+    return msgpack
+
+
+def decode_body(body: bytes, content_type: str) -> Any:
+    """
+    Decode a request body.
+
+    JSON and msgpack bodies decode to their document (dict or list). NPY
+    bodies decode to an ndarray and Arrow IPC streams to a DataFrame, in
+    both cases without building per-row Python objects.
+    """
+    if content_type == JSON:
+        return json.loads(body)
+    if content_type == MSGPACK:
+        return _import_msgpack().unpackb(body, raw=False)
+    if content_type == NPY:
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+        return array.reshape(1, -1) if array.ndim == 1 else array
+    if content_type == ARROW:
+        pa = _import_pyarrow()
+        with pa.ipc.open_stream(body) as reader:
+            return reader.read_all().to_pandas()
+    raise UnsupportedMediaTypeError(f"Unsupported Content-Type: {content_type}")
+
+
+def is_columnar(payload: Any) -> bool:
+    """Whether a decoded JSON/msgpack document uses the columnar form"""
+    return isinstance(payload, dict) and "columns" in payload and "data" in payload
+
+
+def columnar_to_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Build a DataFrame from a columnar document.
+
+    `data` is either a mapping of column name to values, or (msgpack only)
+    a raw little-endian buffer described by `dtype` and `shape`.
+    """
+    columns: List[str] = list(payload["columns"])
+    data = payload["data"]
+
+    if isinstance(data, (bytes, bytearray)):
+        array = np.frombuffer(data, dtype=np.dtype(payload.get("dtype", "<f8")))
+        array = array.reshape(payload.get("shape", (-1, len(columns))))
+        return pd.DataFrame(array, columns=columns, copy=False)
+
+    if not isinstance(data, dict):
+        raise ValueError("Columnar 'data' must map column names to value lists")
+
+    missing = [name for name in columns if name not in data]
+    if missing:
+        raise ValueError(f"Columns missing from 'data': {missing}")
+
+    lengths = {len(data[name]) for name in columns}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+
+    return pd.DataFrame({name: np.asarray(data[name]) for name in columns}, copy=False)
+
+
+def _pack_array(array: Optional[np.ndarray]) -> Any:
+    """Raw buffer form of a numeric array for msgpack responses"""
+    if array is None:
+        return None
+    array = np.ascontiguousarray(array)
+    if array.dtype.kind not in "biuf":
+        return array.tolist()
+    array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+    return {"dtype": array.dtype.str, "shape": list(array.shape), "data": array.tobytes()}
+
+
+def encode_predictions(predictions: np.ndarray, probabilities: Optional[np.ndarray],
+                       model_info: Dict[str, Any], content_type: str,
+                       classes: Optional[List[Any]] = None) -> bytes:
+    """
+    Encode prediction results as NPY, Arrow IPC or msgpack.
+
+    NPY carries the predictions only. Arrow returns a table with a
+    `prediction` column plus one `proba_<class>` column per class. msgpack
+    returns the JSON response layout with numeric arrays as raw buffers.
+    """
+    if content_type == NPY:
+        buffer = io.BytesIO()
+        np.save(buffer, np.asarray(predictions), allow_pickle=False)
+        return buffer.getvalue()
+
+    if content_type == ARROW:
+        pa = _import_pyarrow()
+        table = {"prediction": np.asarray(predictions)}
+        if probabilities is not None:
+            names = classes if classes is not None else range(probabilities.shape[1])
+            for index, name in enumerate(names):
+                table[f"proba_{name}"] = probabilities[:, index]
+        table = pa.table(table)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if content_type == MSGPACK:
+        return _import_msgpack().packb({
+            "success": True,
+            "predictions": _pack_array(np.asarray(predictions)),
+            "probabilities": _pack_array(probabilities),
+            "model_info": model_info,
+            "message": "Predictions generated successfully"
+        }, use_bin_type=True)
+
+    raise UnsupportedMediaTypeError(f"Unsupported response type: {content_type}")
+
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+
+def encode_score_chunk(start: int, predictions: np.ndarray, probabilities: Optional[np.ndarray],
+                       classes: Optional[List[Any]], output_format: str, header: bool) -> bytes:
+    """
+    Encode one chunk of batch-scoring results.
+
+    NDJSON yields one {"row", "prediction"[, "probabilities"]} object per
+    line; CSV yields `row,prediction[,proba_<class>...]` records, with the
+    header only on the first chunk.
+    """
+    rows = np.arange(start, start + len(predictions))
+
+    if output_format == "ndjson":
+        predictions_list = np.asarray(predictions).tolist()
+        if probabilities is None:
+            lines = (
+                json.dumps({"row": row, "prediction": prediction})
+                for row, prediction in zip(rows.tolist(), predictions_list)
+            )
+        else:
+            lines = (
+                json.dumps({"row": row, "prediction": prediction, "probabilities": proba})
+                for row, prediction, proba in zip(rows.tolist(), predictions_list, probabilities.tolist())
+            )
+        return ("\n".join(lines) + "\n").encode()
+
+    if output_format == "csv":
+        table = {"row": rows, "prediction": np.asarray(predictions)}
+        if probabilities is not None:
+            names = classes if classes is not None else range(probabilities.shape[1])
+            for index, name in enumerate(names):
+                table[f"proba_{name}"] = probabilities[:, index]
+        return pd.DataFrame(table, copy=False).to_csv(index=False, header=header).encode()
+
+    raise UnsupportedMediaTypeError(f"Unsupported output format: {output_format}")
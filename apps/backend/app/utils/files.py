@@ -0,0 +1,167 @@
+"""
+File utilities
+Streaming upload persistence and content hashing
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+import aiofiles
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+
+
+# Multipart framing and form fields allowed on top of an upload's file limit
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload crosses the configured size limit"""
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware rejecting upload bodies over a per-path limit.
+
+    Starlette parses and spools a whole multipart body before an endpoint
+    runs, so the limit has to be applied here: a Content-Length over the
+    limit is refused without reading the body, and a body sent without one
+    (or with a false one) is cut off at the first chunk that crosses it.
+    `limits` maps paths to callables returning the file size limit, read
+    per request; FORM_OVERHEAD_BYTES is allowed on top.
+    """
+
+    def __init__(self, app: Any, limits: Dict[str, Callable[[], int]]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_body = limit() + FORM_OVERHEAD_BYTES
+        length = Headers(scope=scope).get("content-length")
+        if length is not None and length.isdigit() and int(length) > max_body:
+            await _too_large(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Dict[str, Any]:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    exceeded = True
+                    raise UploadTooLargeError(f"Request body exceeds the {max_body} byte limit")
+            return message
+
+        async def guarded_send(message: Dict[str, Any]) -> None:
+            nonlocal started
+            # Once the body is cut off, the rejection below replaces the
+            # error response the app builds from the failed read
+            if exceeded and not started:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLargeError:
+            if not exceeded:
+                raise
+        if exceeded and not started:
+            await _too_large(scope, receive, send)
+
+
+async def _too_large(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    # Same status and detail as the endpoints' own size checks
+    response = JSONResponse({"detail": "File too large"}, status_code=400, headers={"Connection": "close"})
+    await response(scope, receive, send)
+
+
+async def save_upload_file(upload: UploadFile, dest_path: str, max_bytes: int,
+                           chunk_size: int) -> Tuple[int, str]:
+    """
+    Copy an upload to `dest_path` in chunks, hashing it on the fly.
+
+    The upload has already been spooled by Starlette, whose request body
+    UploadLimitMiddleware bounds; `max_bytes` is checked here on the file
+    part alone, which the body limit only approximates. A partially
+    written file is removed on any failure. The destination directory is
+    created if needed.
+
+    Returns the number of bytes written and the SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+
+    try:
+        async with aiofiles.open(dest_path, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the {max_bytes} byte limit")
+
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+    return size, digest.hexdigest()
+
+
+_hash_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_lock = threading.Lock()
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 hex digest of a file's content.
+
+    Digests are memoized per (path, mtime, size), so a file is only read
+    again after it changes; the least recently used of more than
+    FILE_HASH_CACHE_ENTRIES digests are dropped.
+    """
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+    with _hash_lock:
+        cached = _hash_cache.get(key)
+        if cached is not None:
+            _hash_cache.move_to_end(key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+
+    with _hash_lock:
+        _hash_cache[key] = digest.hexdigest()
+        _hash_cache.move_to_end(key)
+        while len(_hash_cache) > settings.FILE_HASH_CACHE_ENTRIES:
+            _hash_cache.popitem(last=False)
+    return digest.hexdigest()
@@ -0,0 +1,100 @@
+"""
+Responses
+NumPy-aware JSON responses that skip per-element validation of array fields
+"""
+
+import json
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements
+    orjson = None
+
+
+def _round(content: Any, decimals: int) -> Any:
+    """Round floats inside containers; arrays are rounded in one vectorized call"""
+    if isinstance(content, np.ndarray):
+        return np.round(content, decimals) if content.dtype.kind in "fc" else content
+    if isinstance(content, (pd.DataFrame, pd.Series)):
+        return _round(_plain(content), decimals)
+    if isinstance(content, BaseModel):
+        return _round(content.model_dump(), decimals)
+    if isinstance(content, dict):
+        return {key: _round(value, decimals) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [_round(value, decimals) for value in content]
+    if isinstance(content, (float, np.floating)):
+        return round(float(content), decimals)
+    return content
+
+
+def _plain(value: Any) -> Any:
+    """Encodable form of a value the JSON encoder does not handle natively"""
+    if isinstance(value, pd.DataFrame):
+        # Column-oriented, so each column stays one array
+        return {"columns": [str(name) for name in value.columns],
+                "data": {str(name): value[name].to_numpy() for name in value.columns}}
+    if isinstance(value, pd.Series):
+        return value.to_numpy()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, np.ndarray):
+        if value.dtype == np.float16:
+            return value.astype(np.float32)
+        if value.dtype.kind in "biuf" and not value.flags.c_contiguous:
+            return np.ascontiguousarray(value)
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _default(value: Any) -> Any:
+    value = _plain(value)
+    if orjson is None and isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def dumps(content: Any, decimals: Optional[int] = None) -> bytes:
+    """
+    Encode a response document to JSON bytes.
+
+    NumPy arrays and scalars, pandas objects and pydantic models may appear
+    anywhere in `content`. With orjson, native numeric arrays are written
+    straight from their buffers; NaN and infinity become null. `decimals`
+    rounds every float first.
+    """
+    if decimals is not None:
+        content = _round(content, decimals)
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class NumpyJSONResponse(JSONResponse):
+    """
+    JSON response for array-heavy payloads.
+
+    Returning it from an endpoint bypasses response-model validation, so
+    arrays are never expanded into per-element Python objects. Floats are
+    rounded to RESPONSE_FLOAT_DECIMALS unless `decimals` is given.
+    """
+
+    def __init__(self, content: Any, decimals: Optional[int] = None, **kwargs: Any):
+        self.decimals = decimals if decimals is not None else settings.RESPONSE_FLOAT_DECIMALS
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, self.decimals)
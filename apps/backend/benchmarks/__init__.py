@@ -0,0 +1,4 @@
+"""
+Meovis backend benchmarks
+Timing and memory measurements of the API hot paths on synthetic data
+"""
@@ -0,0 +1,77 @@
+"""
+Baseline comparison of benchmark results
+
+    python -m benchmarks.compare results.json baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def _by_key(report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {result["key"]: result for result in report.get("results", [])}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2,
+            metric: str = "p50_ms", min_delta_ms: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Per-scenario change of `metric` against a baseline report.
+
+    A scenario regresses when it is more than `threshold` (a fraction) and
+    more than `min_delta_ms` slower than its baseline; the absolute floor
+    keeps sub-millisecond noise from being flagged. Scenarios missing from
+    either report are skipped.
+    """
+    baseline_results = _by_key(baseline)
+    rows = []
+    for key, result in _by_key(current).items():
+        reference = baseline_results.get(key)
+        if reference is None or metric not in result or metric not in reference:
+            continue
+        before, after = reference[metric], result[metric]
+        ratio = after / before if before else float("inf")
+        rows.append({
+            "key": key,
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold and after - before > min_delta_ms,
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]], metric: str = "p50_ms") -> str:
+    lines = [f"{'scenario':<70} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['key']:<70} {row['baseline']:>10.2f} {row['current']:>10.2f} {row['ratio']:>7.2f}{flag}"
+        )
+    regressions = sum(row["regression"] for row in rows)
+    lines.append(f"{regressions} regression(s) in {len(rows)} compared scenarios ({metric})")
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results with a baseline")
+    parser.add_argument("current", help="Results JSON")
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction (default 0.2)")
+    parser.add_argument("--metric", default="p50_ms", help="Compared statistic (default p50_ms)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore smaller absolute changes")
+    args = parser.parse_args(argv)
+
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    rows = compare(current, baseline, args.threshold, args.metric, args.min_delta_ms)
+    print(format_comparison(rows, args.metric))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
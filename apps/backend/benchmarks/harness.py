@@ -0,0 +1,71 @@
+"""
+Timing and memory measurement helpers
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def summarize_times(seconds: List[float]) -> Dict[str, float]:
+    """p50/p95/max/mean of a list of durations, in milliseconds"""
+    ms = np.asarray(seconds) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "max_ms": float(ms.max()),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1,
+            memory: bool = True) -> Dict[str, Any]:
+    """
+    Time `repeat` calls of fn after `warmup` untimed calls.
+
+    With `memory`, one more call runs under tracemalloc to record the peak
+    Python/NumPy allocation of a single call. Allocations made in worker
+    processes are not included; max_rss_bytes covers this process only.
+    """
+    for _ in range(warmup):
+        fn()
+
+    seconds = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+
+    result: Dict[str, Any] = {"repeat": repeat, **summarize_times(seconds)}
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_traced_bytes"] = int(peak)
+
+    result["max_rss_bytes"] = max_rss_bytes()
+    return result
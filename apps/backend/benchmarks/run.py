@@ -0,0 +1,265 @@
+"""
+Benchmark runner
+
+Times upload, preview, /predict at several batch sizes, /metrics/evaluate,
+analyze_model and SHAP on synthetic datasets and models, and writes p50,
+p95, max and peak memory per scenario as JSON. Run from apps/backend:
+
+    python -m benchmarks.run --rows 1000 100000 --output results.json
+    python -m benchmarks.run --baseline baseline.json --fail-on-regression
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import compare, harness, synthetic
+
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+DEFAULT_FEATURES = [20]
+DEFAULT_BATCH_SIZES = [1, 100, 1_000, 10_000]
+SCENARIOS = ("upload_model", "upload_dataset", "preview", "predict", "evaluate", "analyze", "shap")
+
+# Bodies above this many rows make JSON encoding, not the endpoint, dominate
+MAX_EVALUATE_ROWS = 1_000_000
+
+
+def _isolate(root: str) -> None:
+    """Point uploads, caches and the database at a scratch directory"""
+    os.environ["UPLOAD_DIR"] = root
+    os.environ["DATASET_UPLOAD_DIR"] = os.path.join(root, "datasets")
+    os.environ["MODEL_UPLOAD_DIR"] = os.path.join(root, "models")
+    os.environ["SHAP_CACHE_DIR"] = os.path.join(root, "cache", "shap")
+    os.environ["ARRAY_STORE_DIR"] = os.path.join(root, "arrays")
+    os.environ["BATCH_SCORE_RESULTS_DIR"] = os.path.join(root, "results")
+    os.environ["DATABASE_URL"] = "sqlite://:memory:"
+    # Repeated analyses must recompute SHAP rather than hit the cache
+    os.environ["SHAP_CACHE_ENABLED"] = "false"
+
+
+def _versions() -> Dict[str, Optional[str]]:
+    versions = {}
+    for name in ("numpy", "pandas", "sklearn", "shap", "fastapi", "pydantic", "orjson"):
+        try:
+            versions[name] = __import__(name).__version__
+        except Exception:
+            versions[name] = None
+    return versions
+
+
+def _check(response: Any) -> Any:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url.path} returned {response.status_code}: {response.text[:200]}")
+    return response
+
+
+class Suite:
+    """Benchmarks of one (family, task, rows, features) configuration"""
+
+    def __init__(self, client: Any, args: argparse.Namespace, family: str, rows: int, features: int):
+        self.client = client
+        self.args = args
+        self.family = family
+        self.rows = rows
+        self.features = features
+        self.prefix = f"{args.task}/{family}/rows={rows}/features={features}"
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, scenario: str, fn: Callable[[], Any], repeat: Optional[int] = None, **params: Any) -> None:
+        label = scenario + "".join(f"[{name}={value}]" for name, value in params.items())
+        key = f"{self.prefix}/{label}"
+        started = time.perf_counter()
+        try:
+            stats = harness.measure(
+                fn, repeat=repeat or self.args.repeat, warmup=self.args.warmup, memory=not self.args.no_memory
+            )
+            result = {"key": key, "status": "ok", **stats}
+        except Exception as e:
+            result = {"key": key, "status": "error", "error": str(e)}
+        result.update({
+            "scenario": scenario, "task": self.args.task, "family": self.family,
+            "rows": self.rows, "features": self.features, "params": params,
+            "wall_seconds": time.perf_counter() - started,
+        })
+        self.results.append(result)
+        timing = f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms" if "p50_ms" in result else result["error"]
+        print(f"{key}: {timing}", file=sys.stderr)
+
+    def run(self) -> List[Dict[str, Any]]:
+        import joblib
+        import numpy as np
+        from app.core.executors import executors
+        from app.models.ml_model import Dataset, MLModel
+        from app.services import explainers
+        from app.services.analysis_jobs import analysis_jobs
+
+        scenarios = set(self.args.scenarios)
+        df = synthetic.make_dataset(self.rows, self.features, self.args.task, self.args.seed)
+        model, X = synthetic.fit_model(self.family, df, self.args.task, self.args.seed)
+
+        model_buffer = io.BytesIO()
+        joblib.dump(model, model_buffer)
+        model_bytes = model_buffer.getvalue()
+        dataset_bytes = df.to_csv(index=False).encode()
+
+        def upload_model() -> Dict[str, Any]:
+            return _check(self.client.post(
+                "/api/v1/models/upload-model",
+                files={"file": ("model.joblib", model_bytes, "application/octet-stream")}
+            )).json()
+
+        def upload_dataset() -> Dict[str, Any]:
+            return _check(self.client.post(
+                "/api/v1/datasets/upload-dataset",
+                files={"file": ("data.csv", dataset_bytes, "text/csv")}
+            )).json()
+
+        if "upload_model" in scenarios:
+            self.record("upload_model", upload_model)
+        if "upload_dataset" in scenarios:
+            self.record("upload_dataset", upload_dataset, repeat=self.args.upload_repeat)
+
+        uploaded = upload_model()
+        model_id = uploaded["model_id"]
+        dataset_path = upload_dataset()["file_path"]
+
+        if "preview" in scenarios:
+            self.record("preview", lambda: _check(self.client.get(
+                "/api/v1/datasets/preview-dataset", params={"file_path": dataset_path}
+            )))
+
+        if "predict" in scenarios:
+            for batch in self.args.batch_sizes:
+                if batch > self.rows:
+                    continue
+                body = {"model_id": model_id, "data": X.iloc[:batch].to_dict(orient="records")}
+                self.record("predict", lambda body=body: _check(
+                    self.client.post("/api/v1/models/predict", json=body)
+                ), batch=batch)
+
+        if "evaluate" in scenarios:
+            n = min(self.rows, MAX_EVALUATE_ROWS)
+            y_true = df[synthetic.TARGET].to_numpy()[:n]
+            y_pred = model.predict(X.iloc[:n])
+            body = {"y_true": y_true.tolist(), "y_pred": np.asarray(y_pred).tolist(), "task_type": self.args.task}
+            self.record("evaluate", lambda: _check(
+                self.client.post("/api/v1/metrics/evaluate", json=body)
+            ), rows=n)
+
+        if "analyze" in scenarios:
+            async def records():
+                db_model, _ = await MLModel.get_or_create(
+                    file_path=uploaded["file_path"],
+                    defaults={"name": model_id, "model_type": "sklearn", "algorithm": type(model).__name__}
+                )
+                dataset, _ = await Dataset.get_or_create(
+                    file_path=dataset_path, target_column=synthetic.TARGET,
+                    defaults={"name": "benchmark", "row_count": self.rows, "column_count": self.features + 1}
+                )
+                return db_model, dataset
+
+            db_model, dataset = self.client.portal.call(records)
+            ml_service = analysis_jobs.ml_service
+            self.record("analyze", lambda: self.client.portal.call(
+                ml_service.analyze_model, db_model, dataset
+            ), repeat=self.args.analyze_repeat)
+
+        if "shap" in scenarios:
+            self.record("shap", lambda: self.client.portal.call(
+                executors.run, "shap", explainers.explain, model, X
+            ), repeat=self.args.analyze_repeat, explainer=explainers.explainer_kind(model))
+
+        return self.results
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every configuration and return the report"""
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.main import app
+
+    results: List[Dict[str, Any]] = []
+    with TestClient(app) as client:
+        for family in args.families:
+            for features in args.features:
+                for rows in args.rows:
+                    results.extend(Suite(client, args, family, rows, features).run())
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "versions": _versions(),
+            "settings": {
+                name: getattr(settings, name) for name in (
+                    "SHAP_SAMPLE_SIZE", "SHAP_SHARD_WORKERS", "SHAP_KERNEL_EXPLAIN_SIZE",
+                    "EXECUTOR_INFERENCE_KIND", "EXECUTOR_SHAP_KIND", "PREDICT_BATCHING_ENABLED",
+                )
+            },
+            "args": {name: value for name, value in vars(args).items() if name != "baseline"},
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Meovis backend hot paths")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Dataset row counts (up to 1e7; default %(default)s)")
+    parser.add_argument("--features", type=int, nargs="+", default=DEFAULT_FEATURES)
+    parser.add_argument("--families", nargs="+", choices=synthetic.FAMILIES, default=list(synthetic.FAMILIES))
+    parser.add_argument("--task", choices=synthetic.TASKS, default="classification")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per scenario")
+    parser.add_argument("--upload-repeat", type=int, default=3, help="Timed runs per dataset upload")
+    parser.add_argument("--analyze-repeat", type=int, default=3, help="Timed runs of analyze_model and SHAP")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run")
+    parser.add_argument("--output", help="Results JSON path (stdout by default)")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown fraction")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    scratch = tempfile.mkdtemp(prefix="meovis-bench-")
+    _isolate(scratch)
+    try:
+        report = run(args)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare.compare(report, baseline, args.threshold)
+        print(compare.format_comparison(rows), file=sys.stderr)
+        if args.fail_on_regression and any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
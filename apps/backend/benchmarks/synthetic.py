@@ -0,0 +1,73 @@
+"""
+Synthetic datasets and models for benchmarks
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import (
+    GradientBoostingClassifier, GradientBoostingRegressor,
+    RandomForestClassifier, RandomForestRegressor
+)
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+
+
+TARGET = "target"
+
+# Linear, tree ensembles and a non-tree model (explained with KernelExplainer)
+FAMILIES = ("linear", "forest", "boosting", "knn")
+TASKS = ("classification", "regression")
+
+# Models are fitted on at most this many rows so large scales measure
+# serving cost rather than training time
+TRAIN_ROWS = 20_000
+
+
+def make_dataset(rows: int, features: int, task: str = "classification",
+                 seed: int = 42) -> pd.DataFrame:
+    """
+    Gaussian features `f0..f{features-1}` plus a `target` column that
+    depends linearly on the first features and non-linearly on one of them
+    """
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(rows, features)).astype(np.float64)
+    weights = rng.normal(size=min(features, 10))
+    signal = X[:, :len(weights)] @ weights + np.sin(2 * X[:, 0])
+    noise = rng.normal(scale=0.5, size=rows)
+
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(features)], copy=False)
+    if task == "classification":
+        df[TARGET] = (signal + noise > 0).astype(np.int64)
+    elif task == "regression":
+        df[TARGET] = signal + noise
+    else:
+        raise ValueError(f"Unsupported task: {task}")
+    return df
+
+
+def make_model(family: str, task: str = "classification", seed: int = 42) -> Any:
+    """Unfitted estimator of a model family"""
+    classification = task == "classification"
+    if family == "linear":
+        return LogisticRegression(max_iter=1000) if classification else LinearRegression()
+    if family == "forest":
+        cls = RandomForestClassifier if classification else RandomForestRegressor
+        return cls(n_estimators=50, max_depth=8, n_jobs=-1, random_state=seed)
+    if family == "boosting":
+        cls = GradientBoostingClassifier if classification else GradientBoostingRegressor
+        return cls(n_estimators=50, max_depth=3, random_state=seed)
+    if family == "knn":
+        return KNeighborsClassifier(n_neighbors=15) if classification else KNeighborsRegressor(n_neighbors=15)
+    raise ValueError(f"Unsupported model family: {family}")
+
+
+def fit_model(family: str, df: pd.DataFrame, task: str = "classification",
+              seed: int = 42) -> Tuple[Any, pd.DataFrame]:
+    """Fit a model of `family` on (a sample of) df; returns the model and the features"""
+    X = df.drop(columns=[TARGET])
+    train = df.sample(n=TRAIN_ROWS, random_state=seed) if len(df) > TRAIN_ROWS else df
+    model = make_model(family, task, seed)
+    model.fit(train.drop(columns=[TARGET]), train[TARGET])
+    return model, X
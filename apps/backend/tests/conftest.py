@@ -0,0 +1,16 @@
+"""
+Shared test configuration
+"""
+
+import os
+import tempfile
+
+# Keep uploads and the database out of the working tree during tests
+_test_root = tempfile.mkdtemp(prefix="meovis-tests-")
+os.environ.setdefault("UPLOAD_DIR", _test_root)
+os.environ.setdefault("DATASET_UPLOAD_DIR", os.path.join(_test_root, "datasets"))
+os.environ.setdefault("MODEL_UPLOAD_DIR", os.path.join(_test_root, "models"))
+os.environ.setdefault("SHAP_CACHE_DIR", os.path.join(_test_root, "cache", "shap"))
+os.environ.setdefault("ARRAY_STORE_DIR", os.path.join(_test_root, "arrays"))
+os.environ.setdefault("BATCH_SCORE_RESULTS_DIR", os.path.join(_test_root, "results"))
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
@@ -0,0 +1,126 @@
+"""
+Background analysis job tests
+"""
+
+import asyncio
+import io
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from app.main import app
+from app.services.analysis_jobs import analysis_jobs
+
+
+def _upload_fixtures(client):
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"a": rng.normal(size=60), "b": rng.normal(size=60)})
+    df["target"] = (df["a"] + df["b"] > 0).astype(int)
+    model = LogisticRegression().fit(df[["a", "b"]], df["target"])
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    model_response = client.post(
+        "/api/v1/models/upload-model",
+        files={"file": ("clf.joblib", buffer.getvalue(), "application/octet-stream")}
+    )
+    dataset_response = client.post(
+        "/api/v1/datasets/upload-dataset",
+        files={"file": ("data.csv", df.to_csv(index=False).encode(), "text/csv")}
+    )
+    return model_response.json()["model_id"], dataset_response.json()["file_path"]
+
+
+def _wait_for(client, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/v1/analysis/jobs/{job_id}").json()
+        if status["status"] in ("completed", "failed"):
+            return status
+        time.sleep(0.1)
+    raise AssertionError("Job did not finish in time")
+
+
+class TestAnalysisJobs:
+    """Test submitting and tracking analysis jobs"""
+
+    def test_job_lifecycle(self):
+        with TestClient(app) as client:
+            model_id, dataset_path = _upload_fixtures(client)
+
+            response = client.post(
+                "/api/v1/analysis/jobs",
+                json={"model_id": model_id, "dataset_path": dataset_path, "target_column": "target"}
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+
+            status = _wait_for(client, job_id)
+            assert status["status"] == "completed", status["error"]
+            assert status["progress"] == 1.0
+
+            result = client.get(f"/api/v1/analysis/jobs/{job_id}/result")
+            assert result.status_code == 200
+            stored = result.json()["result"]
+            assert "accuracy" in stored["metrics"]
+            assert stored["curves"]["curves"][0]["roc"]["auc"] is not None
+            assert "shap_values" not in stored["shap_values"]
+            assert stored["shap_values"]["summary"]["shap_values"]["shape"][0] == 60
+
+    def test_unknown_model(self):
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/v1/analysis/jobs",
+                json={"model_id": "missing", "dataset_path": "nonexistent.csv"}
+            )
+            assert response.status_code == 404
+
+    def test_unknown_job(self):
+        with TestClient(app) as client:
+            assert client.get("/api/v1/analysis/jobs/999999").status_code == 404
+
+    def _submit(self, client):
+        model_id, dataset_path = _upload_fixtures(client)
+        response = client.post(
+            "/api/v1/analysis/jobs",
+            json={"model_id": model_id, "dataset_path": dataset_path, "target_column": "target"}
+        )
+        return response.json()["job_id"]
+
+    def test_failed_completion_update_marks_job_failed(self, monkeypatch):
+        async def analyze(model, dataset, progress=None):
+            # Not JSON serializable, so storing the result fails
+            return {"prediction_id": None, "bad": object()}
+
+        monkeypatch.setattr(analysis_jobs.ml_service, "analyze_model", analyze)
+        with TestClient(app) as client:
+            status = _wait_for(client, self._submit(client))
+            assert status["status"] == "failed"
+            assert status["error"]
+
+    def test_cancelled_job_is_marked_cancelled(self, monkeypatch):
+        async def analyze(model, dataset, progress=None):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(analysis_jobs.ml_service, "analyze_model", analyze)
+        with TestClient(app) as client:
+            job_id = self._submit(client)
+            deadline = time.time() + 10
+            while client.get(f"/api/v1/analysis/jobs/{job_id}").json()["status"] != "running":
+                assert time.time() < deadline
+                time.sleep(0.05)
+
+            async def cancel():
+                tasks = list(analysis_jobs._tasks)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            client.portal.call(cancel)
+            status = client.get(f"/api/v1/analysis/jobs/{job_id}").json()
+            assert status["status"] == "cancelled"
+            assert client.get(f"/api/v1/analysis/jobs/{job_id}/result").status_code == 409
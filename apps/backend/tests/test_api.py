@@ -2,10 +2,15 @@
 Basic API tests for MVP endpoints
 """
 
+import asyncio
+import hashlib
+import os
+
 import pytest
 import httpx
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core.config import settings
 
 client = TestClient(app)
 
@@ -27,6 +32,32 @@ class TestDatasetAPI:
         response = client.post("/api/v1/datasets/upload-dataset")
         assert response.status_code == 422  # Validation error
     
+    def test_upload_dataset_reports_size_and_hash(self):
+        """Test that streamed uploads report the received size and SHA-256"""
+        content = b"a,b,target\n1,2,0\n3,4,1\n"
+        response = client.post(
+            "/api/v1/datasets/upload-dataset",
+            files={"file": ("data.csv", content, "text/csv")}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["size_bytes"] == len(content)
+        assert data["sha256"] == hashlib.sha256(content).hexdigest()
+    
+    def test_upload_dataset_too_large(self, monkeypatch):
+        """Test that oversized uploads are rejected and not left on disk"""
+        monkeypatch.setattr(settings, "MAX_DATASET_FILE_SIZE", 16)
+        monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 4)
+        before = set(os.listdir(settings.DATASET_UPLOAD_DIR))
+        
+        response = client.post(
+            "/api/v1/datasets/upload-dataset",
+            files={"file": ("data.csv", b"a,b\n" * 100, "text/csv")}
+        )
+        assert response.status_code == 400
+        assert "too large" in response.json()["detail"]
+        assert set(os.listdir(settings.DATASET_UPLOAD_DIR)) == before
+    
     def test_preview_dataset_file_not_found(self):
         """Test previewing non-existent file"""
         response = client.get("/api/v1/datasets/preview-dataset?file_path=nonexistent.csv")
@@ -128,3 +159,50 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["service"] == "meovis-api"
+
+
+class TestUploadLimits:
+    """Test that oversized upload bodies are refused before they are read"""
+
+    @staticmethod
+    def _call(headers, chunks):
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/v1/datasets/upload-dataset",
+            "raw_path": b"/api/v1/datasets/upload-dataset", "query_string": b"", "root_path": "",
+            "scheme": "http", "server": ("testserver", 80), "client": ("testclient", 50000),
+            "http_version": "1.1", "headers": [(b"host", b"testserver")] + headers,
+        }
+        remaining = list(chunks)
+        received = []
+        sent = []
+
+        async def receive():
+            body = remaining.pop(0)
+            received.append(body)
+            return {"type": "http.request", "body": body, "more_body": bool(remaining)}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(app(scope, receive, send))
+        return received, sent
+
+    def test_content_length_over_limit_is_refused_unread(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_DATASET_FILE_SIZE", 1024)
+        chunks = [b"x" * 65536] * 8
+        received, sent = self._call(
+            [(b"content-type", b"multipart/form-data; boundary=b"), (b"content-length", b"524288")], chunks
+        )
+        assert received == []
+        assert sent[0]["status"] == 400
+
+    def test_body_without_length_is_cut_off_at_the_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_DATASET_FILE_SIZE", 1024)
+        head = b'--b\r\nContent-Disposition: form-data; name="file"; filename="d.csv"\r\n\r\n'
+        chunks = [head] + [b"x" * 65536] * 8
+        received, sent = self._call(
+            [(b"content-type", b"multipart/form-data; boundary=b"), (b"transfer-encoding", b"chunked")], chunks
+        )
+        assert len(received) < len(chunks)
+        assert sent[0]["status"] == 400
+        assert b"too large" in sent[-1]["body"]
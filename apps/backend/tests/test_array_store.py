@@ -0,0 +1,45 @@
+"""
+Array store tests
+"""
+
+import numpy as np
+
+from app.services import array_store
+
+
+class TestArrayStore:
+    """Test compressed array persistence"""
+
+    def test_round_trip_with_quantization(self):
+        shap_values = np.random.RandomState(0).normal(size=(100, 5))
+        labels = np.array(["a", "b"] * 50, dtype=object)
+
+        path, summary = array_store.save_arrays(
+            {"shap_values": shap_values, "predictions": labels, "probabilities": None},
+            float_dtype="float16"
+        )
+
+        assert summary["shap_values"]["shape"] == [100, 5]
+        assert summary["shap_values"]["stored_dtype"] == "float16"
+        assert summary["shap_values"]["max"] == float(shap_values.max())
+        assert "probabilities" not in summary
+
+        with array_store.open_arrays(path) as bundle:
+            assert set(bundle.keys()) == {"shap_values", "predictions"}
+            np.testing.assert_allclose(bundle["shap_values"], shap_values, atol=1e-2)
+            assert bundle["predictions"].tolist() == labels.tolist()
+            assert bundle.get("probabilities") is None
+
+        array_store.delete_arrays(path)
+
+    def test_default_is_lossless(self):
+        values = np.random.RandomState(1).normal(size=(10, 3))
+        narrow = values.astype(np.float32)
+
+        path, summary = array_store.save_arrays({"values": values, "narrow": narrow})
+
+        assert summary["values"]["stored_dtype"] == "float64"
+        assert summary["narrow"]["stored_dtype"] == "float32"
+        with array_store.open_arrays(path) as bundle:
+            np.testing.assert_array_equal(bundle["values"], values)
+        array_store.delete_arrays(path)
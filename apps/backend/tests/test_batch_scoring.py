@@ -0,0 +1,108 @@
+"""
+Streaming batch scoring tests
+"""
+
+import io
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from app.main import app
+from app.services import column_store
+
+client = TestClient(app)
+
+X = pd.DataFrame({"a": np.linspace(-2, 2, 101), "b": np.linspace(1, -1, 101) ** 2})
+y = (X["a"] > 0).astype(int)
+model = LogisticRegression().fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def model_id():
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    response = client.post(
+        "/api/v1/models/upload-model",
+        files={"file": ("clf.joblib", buffer.getvalue(), "application/octet-stream")}
+    )
+    return response.json()["model_id"]
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    frame = X.assign(target=y)
+    response = client.post(
+        "/api/v1/datasets/upload-dataset",
+        files={"file": ("data.csv", frame.to_csv(index=False).encode(), "text/csv")}
+    )
+    return response.json()
+
+
+class TestBatchScoring:
+    """Test chunked dataset scoring"""
+
+    def test_iter_chunks_csv_without_store(self, tmp_path):
+        path = str(tmp_path / "plain.csv")
+        X.to_csv(path, index=False)
+        chunks = list(column_store.iter_chunks(path, 30, columns=["b"]))
+        assert [len(chunk) for chunk in chunks] == [30, 30, 30, 11]
+        assert list(chunks[0].columns) == ["b"]
+
+    def test_stream_ndjson(self, model_id, dataset):
+        response = client.post("/api/v1/models/score-dataset", json={
+            "model_id": model_id,
+            "dataset_id": dataset["filename"].split(".")[0],
+            "chunk_rows": 25,
+        })
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["row"] for r in records] == list(range(len(X)))
+        assert [r["prediction"] for r in records] == model.predict(X).tolist()
+        np.testing.assert_allclose([r["probabilities"] for r in records], model.predict_proba(X))
+
+    def test_stream_csv(self, model_id, dataset):
+        response = client.post("/api/v1/models/score-dataset", json={
+            "model_id": model_id,
+            "dataset_path": dataset["file_path"],
+            "format": "csv",
+            "chunk_rows": 40,
+        })
+        assert response.status_code == 200
+
+        scores = pd.read_csv(io.StringIO(response.text))
+        assert list(scores.columns) == ["row", "prediction", "proba_0", "proba_1"]
+        assert scores["prediction"].tolist() == model.predict(X).tolist()
+
+    def test_write_results_file(self, model_id, dataset):
+        response = client.post("/api/v1/models/score-dataset", json={
+            "model_id": model_id,
+            "dataset_path": dataset["file_path"],
+            "format": "csv",
+            "output": "file",
+        })
+        assert response.status_code == 200
+        data = response.json()
+        scores = pd.read_csv(data["results_path"])
+        assert len(scores) == len(X)
+        assert data["size_bytes"] > 0
+
+    def test_unknown_dataset(self, model_id):
+        response = client.post("/api/v1/models/score-dataset", json={
+            "model_id": model_id, "dataset_id": "missing"
+        })
+        assert response.status_code == 404
+
+    def test_feature_mismatch_fails_before_streaming(self, model_id, tmp_path):
+        path = str(tmp_path / "other.csv")
+        pd.DataFrame({"c": [1.0, 2.0]}).to_csv(path, index=False)
+        response = client.post("/api/v1/models/score-dataset", json={
+            "model_id": model_id, "dataset_path": path
+        })
+        assert response.status_code == 400
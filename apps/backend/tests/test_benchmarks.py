@@ -0,0 +1,38 @@
+"""
+Benchmark helper tests
+"""
+
+from benchmarks import compare, harness, synthetic
+
+
+class TestBenchmarkHelpers:
+    """Test the benchmark harness without running benchmarks"""
+
+    def test_measure(self):
+        calls = []
+        stats = harness.measure(lambda: calls.append(bytearray(1024)), repeat=4, warmup=2)
+        assert len(calls) == 7  # warmup, timed runs and the memory run
+        assert stats["repeat"] == 4
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+        assert stats["peak_traced_bytes"] >= 1024
+
+    def test_synthetic_dataset(self):
+        df = synthetic.make_dataset(200, 5, "classification")
+        assert df.shape == (200, 6)
+        assert set(df[synthetic.TARGET].unique()) <= {0, 1}
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [
+            {"key": "a", "p50_ms": 10.0}, {"key": "b", "p50_ms": 10.0}, {"key": "c", "p50_ms": 0.1}
+        ]}
+        current = {"results": [
+            {"key": "a", "p50_ms": 11.0}, {"key": "b", "p50_ms": 15.0},
+            {"key": "c", "p50_ms": 0.5}, {"key": "new", "p50_ms": 1.0}
+        ]}
+
+        rows = {row["key"]: row for row in compare.compare(current, baseline, threshold=0.2)}
+        assert set(rows) == {"a", "b", "c"}
+        assert not rows["a"]["regression"]
+        assert rows["b"]["regression"]
+        # Slower in ratio but under the absolute noise floor
+        assert not rows["c"]["regression"]
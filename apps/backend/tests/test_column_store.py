@@ -0,0 +1,152 @@
+"""
+Column store tests
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.services import column_store
+
+
+def _frame():
+    return pd.DataFrame({
+        "x": np.arange(5, dtype=float),
+        "n": np.arange(5),
+        "flag": [True, False, True, False, True],
+        "label": ["a", "b", "a", "c", "b"],
+    })
+
+
+class TestColumnStore:
+    """Test building and reading the columnar dataset store"""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+
+        schema = column_store.build_column_store(path)
+        df = column_store.load_frame(path)
+
+        assert schema["rows"] == 5
+        pd.testing.assert_frame_equal(df.copy(), pd.read_csv(path))
+        assert isinstance(df["x"].values, np.memmap)
+
+    def test_select_columns(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+        column_store.build_column_store(path)
+
+        df = column_store.load_frame(path, columns=["label", "x"])
+        assert df.columns.tolist() == ["label", "x"]
+
+    def test_stale_store_is_rebuilt(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+        column_store.build_column_store(path)
+
+        pd.DataFrame({"y": [1.0, 2.0]}).to_csv(path, index=False)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert column_store.read_schema(path) is None
+        assert column_store.load_frame(path).columns.tolist() == ["y"]
+        assert column_store.read_schema(path)["rows"] == 2
+
+    def test_rebuild_swaps_builds(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+
+        first = column_store.build_column_store(path)["directory"]
+        held = column_store.load_frame(path)
+        second = column_store.build_column_store(path)["directory"]
+
+        assert first != second
+        assert not os.path.exists(first)
+        assert sorted(os.listdir(column_store.store_path(path))) == ["CURRENT", os.path.basename(second)]
+        # Frames opened from the replaced build stay readable
+        assert held["x"].sum() == 10.0
+
+    def test_concurrent_builds_and_reads(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+        column_store.build_column_store(path)
+        errors = []
+
+        def build():
+            try:
+                for _ in range(5):
+                    column_store.build_column_store(path)
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(20):
+                    assert len(column_store.load_frame(path)) == 5
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fn) for fn in (build, build, build, read, read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert column_store.read_schema(path)["rows"] == 5
+        assert not [name for name in os.listdir(column_store.store_path(path)) if name.endswith(".tmp")]
+
+    def test_legacy_store_is_replaced(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+        built = column_store.build_column_store(path)["directory"]
+        root = column_store.store_path(path)
+        for name in os.listdir(built):
+            os.replace(os.path.join(built, name), os.path.join(root, name))
+        os.rmdir(built)
+        os.remove(os.path.join(root, "CURRENT"))
+
+        assert column_store.read_schema(path)["directory"] == root
+        column_store.build_column_store(path)
+        assert not os.path.exists(os.path.join(root, "schema.json"))
+        assert column_store.load_frame(path)["label"].tolist() == ["a", "b", "a", "c", "b"]
+
+    def test_string_columns_are_memory_mapped_and_chunked(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        frame = pd.DataFrame({"x": np.arange(7, dtype=float), "s": ["a", None, "ccc", "b", "a", None, "dd"]})
+        frame.to_csv(path, index=False)
+        expected = pd.read_csv(path)
+
+        schema = column_store.build_column_store(path)
+        column = next(column for column in schema["columns"] if column["name"] == "s")
+        assert column["encoding"] == "unicode"
+
+        opened = column_store._open_columns(path, ["s"])
+        assert isinstance(opened[1][0][1], np.memmap)
+
+        chunks = list(column_store.iter_chunks(path, 3))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert chunks[1].index.tolist() == [3, 4, 5]
+        pd.testing.assert_frame_equal(pd.concat(chunks).copy(), expected)
+        pd.testing.assert_frame_equal(column_store.load_frame(path).copy(), expected)
+
+    def test_csv_chunks_keep_requested_column_order(self, tmp_path):
+        path = str(tmp_path / "data.csv")
+        _frame().to_csv(path, index=False)
+
+        chunks = list(column_store.iter_chunks(path, 2, ["label", "x", "n"]))
+
+        assert not os.path.exists(column_store.store_path(path))
+        assert [chunk.columns.tolist() for chunk in chunks] == [["label", "x", "n"]] * 3
+        pd.testing.assert_frame_equal(pd.concat(chunks), _frame()[["label", "x", "n"]])
+
+    def test_mixed_columns_are_pickled(self, tmp_path):
+        path = str(tmp_path / "data.json")
+        pd.DataFrame({"m": [1, "a", 2.5]}).to_json(path)
+
+        schema = column_store.build_column_store(path)
+        assert schema["columns"][0]["mmap"] is False
+        assert column_store.load_frame(path)["m"].tolist() == [1, "a", 2.5]
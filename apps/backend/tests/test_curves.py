@@ -0,0 +1,80 @@
+"""
+ROC / PR curve tests against scikit-learn
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.metrics import roc_auc_score, average_precision_score
+
+from app.main import app
+from app.services.curves import roc_pr_curves, lttb_indices
+
+client = TestClient(app)
+
+rng = np.random.RandomState(11)
+
+
+class TestCurves:
+    """Test curve computation and thinning"""
+
+    def test_binary_matches_sklearn(self):
+        y_true = rng.randint(0, 2, 20000)
+        # Rounded scores produce ties, which must collapse into one threshold
+        y_score = np.round(rng.rand(20000) * 0.6 + y_true * 0.3, 3)
+
+        result = roc_pr_curves(y_true, y_score, max_points=50)
+        curve = result["curves"][0]
+
+        assert curve["class"] == 1
+        assert curve["roc"]["auc"] == pytest.approx(roc_auc_score(y_true, y_score))
+        assert curve["pr"]["average_precision"] == pytest.approx(average_precision_score(y_true, y_score))
+        assert len(curve["roc"]["fpr"]) == 50
+        assert curve["roc"]["fpr"][0] == 0.0 and curve["roc"]["fpr"][-1] == 1.0
+
+    def test_multiclass_one_vs_rest(self):
+        y_true = rng.choice(["a", "b", "c"], 3000)
+        proba = rng.dirichlet(np.ones(3), 3000)
+
+        result = roc_pr_curves(y_true, proba)
+
+        assert [curve["class"] for curve in result["curves"]] == ["a", "b", "c"]
+        for index, curve in enumerate(result["curves"]):
+            expected = roc_auc_score(y_true == curve["class"], proba[:, index])
+            assert curve["roc"]["auc"] == pytest.approx(expected)
+        assert result["macro_roc_auc"] == pytest.approx(roc_auc_score(y_true, proba, multi_class="ovr"))
+
+    def test_single_class_has_no_curve(self):
+        result = roc_pr_curves([1, 1, 1], [0.2, 0.5, 0.9], classes=[0, 1])
+        assert result["curves"][0]["roc"] is None
+        assert result["macro_roc_auc"] is None
+
+    def test_non_finite_scores_are_rejected(self):
+        with pytest.raises(ValueError, match="NaN or infinity"):
+            roc_pr_curves([0, 1, 1], [0.2, np.nan, 0.9])
+        with pytest.raises(ValueError, match="NaN or infinity"):
+            roc_pr_curves([0, 1, 2], [[0.2, 0.3, 0.5], [0.1, np.inf, 0.0], [0.3, 0.3, 0.4]])
+
+    def test_lttb_keeps_end_points(self):
+        x = np.linspace(0, 1, 1000)
+        indices = lttb_indices(x, np.sin(x * 20), 30)
+        assert len(indices) == 30
+        assert indices[0] == 0 and indices[-1] == 999
+        assert np.all(np.diff(indices) > 0)
+
+
+class TestCurvesAPI:
+    """Test the curves endpoint"""
+
+    def test_curves_endpoint(self):
+        response = client.post("/api/v1/metrics/curves", json={
+            "y_true": [0, 0, 1, 1], "y_score": [0.1, 0.4, 0.35, 0.8]
+        })
+        assert response.status_code == 200
+        assert response.json()["curves"]["curves"][0]["roc"]["auc"] == pytest.approx(0.75)
+
+    def test_mismatched_columns(self):
+        response = client.post("/api/v1/metrics/curves", json={
+            "y_true": [0, 1, 2], "y_score": [[0.5, 0.5], [0.5, 0.5], [0.5, 0.5]]
+        })
+        assert response.status_code == 400
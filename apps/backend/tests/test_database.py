@@ -0,0 +1,38 @@
+"""
+Database startup tests
+"""
+
+import asyncio
+
+from tortoise import Tortoise
+
+from app.core.config import settings
+from app.core.database import init_db, close_db
+from app.models.ml_model import Dataset, MLModel, Prediction
+
+
+class TestSchemaUpgrade:
+    """Test that startup upgrades databases created by earlier versions"""
+
+    def test_missing_column_is_added(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite://{tmp_path / 'old.db'}")
+
+        async def run():
+            # A database whose predictions table predates arrays_path
+            await init_db()
+            conn = Tortoise.get_connection("default")
+            await conn.execute_script("ALTER TABLE predictions DROP COLUMN arrays_path")
+            await close_db()
+
+            await init_db()
+            try:
+                model = await MLModel.create(name="m", file_path="m.joblib", model_type="sklearn", algorithm="A")
+                dataset = await Dataset.create(name="d", file_path="d.csv", row_count=1, column_count=1)
+                prediction = await Prediction.create(
+                    model=model, dataset=dataset, predictions={}, metrics={}, arrays_path="a.npz"
+                )
+                return (await Prediction.get(id=prediction.id)).arrays_path
+            finally:
+                await close_db()
+
+        assert asyncio.run(run()) == "a.npz"
@@ -0,0 +1,51 @@
+"""
+Dataset preview and metadata cache tests
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.dataset_metadata import DatasetMetadataCache, count_lines, read_dataset_preview
+
+
+def _write_csv(path, rows):
+    pd.DataFrame({"a": np.arange(rows), "b": np.arange(rows) * 0.5}).to_csv(path, index=False)
+    return str(path)
+
+
+class TestDatasetPreview:
+    """Test previews that only parse the head of a file"""
+
+    def test_count_lines(self, tmp_path):
+        path = tmp_path / "lines.txt"
+        path.write_bytes(b"a\nb\nc")
+        assert count_lines(str(path), chunk_size=2) == 3
+        path.write_bytes(b"a\nb\nc\n")
+        assert count_lines(str(path), chunk_size=2) == 3
+
+    def test_preview_matches_full_read(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "DATASET_DTYPE_SAMPLE_ROWS", 5)
+        path = _write_csv(tmp_path / "data.csv", 42)
+
+        info = read_dataset_preview(path)
+        full = pd.read_csv(path)
+
+        assert info["shape"] == full.shape
+        assert info["columns"] == full.columns.tolist()
+        assert info["preview"] == full.head(5).to_dict("records")
+
+    def test_cache_invalidated_on_change(self, tmp_path):
+        cache = DatasetMetadataCache(max_entries=4)
+        path = _write_csv(tmp_path / "data.csv", 10)
+
+        assert cache.get_or_load(path)["shape"] == (10, 2)
+        assert cache.get_or_load(path)["shape"] == (10, 2)
+        assert cache.hits == 1
+
+        _write_csv(path, 20)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert cache.get_or_load(path)["shape"] == (20, 2)
@@ -0,0 +1,48 @@
+"""
+Executor subsystem tests
+"""
+
+import asyncio
+import math
+import pickle
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.executors import ExecutorPool
+from app.main import app
+from app.services.ml_service import MLService
+
+client = TestClient(app)
+
+
+class TestExecutorPool:
+    """Test running blocking work on executor pools"""
+
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    def test_run_returns_result(self, kind):
+        pool = ExecutorPool("test", kind, 2)
+        try:
+            result = asyncio.run(pool.run(math.factorial, 10))
+        finally:
+            pool.shutdown()
+
+        assert result == 3628800
+        stats = pool.stats()
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            ExecutorPool("test", "fiber", 2)
+
+    def test_ml_service_is_picklable(self):
+        service = pickle.loads(pickle.dumps(MLService()))
+        assert service.registry is MLService().registry
+
+    def test_executor_status_endpoint(self):
+        response = client.get("/health/executors")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"inference", "metrics", "dataset", "shap", "compare", "shap_shards"}
+        assert "queue_depth" in data["shap"]
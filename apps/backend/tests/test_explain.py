@@ -0,0 +1,135 @@
+"""
+Cached explainer and /explain endpoint tests
+"""
+
+import io
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+
+from app.core.config import settings
+from app.main import app
+from app.services import explainers
+from app.services.analysis_jobs import analysis_jobs
+from app.services.model_registry import ModelEntry, model_registry
+
+client = TestClient(app)
+
+rng = np.random.RandomState(2)
+X = pd.DataFrame(rng.normal(size=(120, 3)), columns=["a", "b", "c"])
+y = 3 * X["a"] - X["b"]
+
+
+def _upload_model(model):
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    response = client.post(
+        "/api/v1/models/upload-model",
+        files={"file": ("model.joblib", buffer.getvalue(), "application/octet-stream")}
+    )
+    return response.json()["model_id"]
+
+
+@pytest.fixture(scope="module")
+def dataset_path():
+    response = client.post(
+        "/api/v1/datasets/upload-dataset",
+        files={"file": ("data.csv", X.assign(target=y).to_csv(index=False).encode(), "text/csv")}
+    )
+    return response.json()["file_path"]
+
+
+class TestExplain:
+    """Test single-row explanations"""
+
+    def test_linear_with_background(self, dataset_path):
+        model = LinearRegression().fit(X, y)
+        model_id = _upload_model(model)
+        rows = X.iloc[:2].to_dict("records")
+
+        response = client.post("/api/v1/models/explain", json={
+            "data": rows, "model_id": model_id, "background_path": dataset_path
+        })
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["feature_names"] == ["a", "b", "c"]
+        assert data["explainer"]["kind"] == "linear"
+        totals = np.sum(data["shap_values"], axis=1) + data["expected_value"]
+        np.testing.assert_allclose(totals, data["predictions"])
+
+        # The explainer is cached with the model and reused without a background
+        explainer = model_registry.get(model_id).explainer
+        response = client.post("/api/v1/models/explain", json={"data": rows[0], "model_id": model_id})
+        assert response.status_code == 200
+        assert model_registry.get(model_id).explainer is explainer
+
+    def test_linear_requires_background(self):
+        model_id = _upload_model(LinearRegression().fit(X, y))
+        response = client.post("/api/v1/models/explain", json={
+            "data": X.iloc[:1].to_dict("records"), "model_id": model_id
+        })
+        assert response.status_code == 400
+
+    def test_tree_without_background(self):
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y > 0)
+        model_id = _upload_model(model)
+
+        response = client.post("/api/v1/models/explain", json={
+            "data": X.iloc[:3].to_dict("records"), "model_id": model_id
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["explainer"]["kind"] == "tree"
+        assert np.asarray(data["shap_values"]).shape == (3, 3, 2)
+        assert len(data["probabilities"]) == 3
+
+    def test_analysis_reuses_cached_explainer(self, dataset_path, monkeypatch):
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y > 0)
+        model_id = _upload_model(model)
+        entry = model_registry.get(model_id)
+        ml_service = analysis_jobs.ml_service
+
+        built = []
+        tree_explainer = explainers._shap().TreeExplainer
+        monkeypatch.setattr(explainers._shap(), "TreeExplainer", lambda m: built.append(m) or tree_explainer(m))
+
+        first = ml_service._generate_shap_values(entry.file_path, dataset_path, X)
+        second = ml_service._generate_shap_values(entry.file_path, dataset_path, X)
+
+        assert len(built) == 1
+        assert entry.explainer is not None and entry.explainer.kind == "tree"
+        np.testing.assert_array_equal(first["shap_values"], second["shap_values"])
+        np.testing.assert_array_equal(first["shap_values"], explainers.explain(model, X)["shap_values"])
+
+    def test_explainer_builds_lock_per_model(self):
+        busy = ModelEntry("busy", "busy.joblib", RandomForestClassifier(n_estimators=2).fit(X, y > 0), 0)
+        other = ModelEntry("other", "other.joblib", RandomForestClassifier(n_estimators=2).fit(X, y > 0), 0)
+        built = []
+
+        with busy.explainer_lock:
+            thread = threading.Thread(target=lambda: built.append(explainers.get_explainer(other)))
+            thread.start()
+            thread.join(10)
+
+        assert built and built[0] is other.explainer
+
+    def test_kernel_background_keeps_every_model_feature(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_FEATURES_FOR_SHAP", 2)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_EXPLAIN_SIZE", 2)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_NSAMPLES", 20)
+        model = KNeighborsRegressor().fit(X, y)
+        entry = ModelEntry("knn", "knn.joblib", model, 0)
+
+        cached = explainers.explainer_for_dataset(entry, X[["c", "b", "a"]], "data.csv")
+        shap_data = explainers.explain(model, X, cached)
+
+        assert shap_data["feature_names"] == ["a", "b", "c"]
+        assert np.asarray(shap_data["shap_values"]).shape == (2, 3)
@@ -0,0 +1,121 @@
+"""
+Explainer dispatch and exact linear SHAP tests
+"""
+
+import asyncio
+
+import joblib
+import numpy as np
+import pandas as pd
+import shap
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression, PoissonRegressor
+from sklearn.neighbors import KNeighborsRegressor
+
+from app.core.config import settings
+from app.core.executors import executors
+from app.services import explainers
+from app.services.ml_service import MLService
+
+rng = np.random.RandomState(1)
+X = pd.DataFrame(rng.normal(size=(300, 4)), columns=["a", "b", "c", "d"])
+y = 2 * X["a"] - X["c"] + rng.normal(scale=0.1, size=300)
+
+
+class TestExplainerDispatch:
+    """Test explainer selection"""
+
+    def test_kinds(self):
+        assert explainers.explainer_kind(LinearRegression().fit(X, y)) == explainers.LINEAR
+        assert explainers.explainer_kind(RandomForestRegressor(n_estimators=2).fit(X, y)) == explainers.TREE
+        assert explainers.explainer_kind(KNeighborsRegressor().fit(X, y)) == explainers.KERNEL
+
+
+class TestLinearShap:
+    """Test the closed-form linear SHAP values"""
+
+    def test_regression_is_exact_over_all_rows(self):
+        model = LinearRegression().fit(X, y)
+        shap_data = explainers.explain(model, X)
+
+        values = shap_data["shap_values"]
+        assert values.shape == (300, 4)
+        assert shap_data["explainer"] == {
+            "kind": "linear", "output": "prediction", "explained_rows": 300, "partial": False
+        }
+        np.testing.assert_allclose(values.sum(axis=1) + shap_data["expected_value"], model.predict(X))
+
+    def test_matches_shap_linear_explainer(self):
+        model = LinearRegression().fit(X, y)
+        background = X.iloc[:100]
+        expected = shap.LinearExplainer(model, background).shap_values(X)
+        values, _ = explainers.linear_shap_values(model, X, background)
+        np.testing.assert_allclose(values, expected, atol=1e-10)
+
+    def test_binary_classifier_explains_log_odds(self):
+        model = LogisticRegression().fit(X, y > 0)
+        shap_data = explainers.explain(model, X)
+
+        assert shap_data["explainer"]["output"] == "log_odds"
+        np.testing.assert_allclose(
+            shap_data["shap_values"].sum(axis=1) + shap_data["expected_value"], model.decision_function(X)
+        )
+
+    def test_multiclass_has_one_output_per_class(self):
+        labels = np.digitize(y, [-1, 1])
+        model = LogisticRegression().fit(X, labels)
+        values, expected_value = explainers.linear_shap_values(model, X)
+
+        assert values.shape == (300, 4, 3)
+        np.testing.assert_allclose(values.sum(axis=1) + expected_value, model.decision_function(X))
+
+    def test_glm_explains_linear_predictor(self):
+        model = PoissonRegressor().fit(X, np.exp(y / 4))
+        shap_data = explainers.explain(model, X)
+
+        assert shap_data["explainer"]["output"] == "linear_predictor"
+        np.testing.assert_allclose(
+            shap_data["shap_values"].sum(axis=1) + shap_data["expected_value"], np.log(model.predict(X))
+        )
+
+
+class TestShardedTreeShap:
+    """Test row-sharded TreeExplainer runs"""
+
+    def test_split_rows(self):
+        shards = explainers.split_rows(X, 70)
+
+        assert [len(shard) for shard in shards] == [70, 70, 70, 70, 20]
+        assert pd.concat(shards).index.equals(X.index)
+
+    def test_default_shard_size_splits_default_sample(self):
+        assert settings.SHAP_SHARD_ROWS < settings.SHAP_SAMPLE_SIZE
+
+    def test_shards_match_single_process(self, monkeypatch, tmp_path):
+        from sklearn.ensemble import RandomForestClassifier
+
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y > 0)
+        model_path = str(tmp_path / "forest.joblib")
+        joblib.dump(model, model_path)
+        single = explainers.explain(model, X)
+
+        monkeypatch.setattr(settings, "SHAP_SHARD_WORKERS", 3)
+        monkeypatch.setattr(settings, "SHAP_SHARD_ROWS", 70)
+        submitted = executors.stats()["shap_shards"]["submitted"]
+        sharded = asyncio.run(MLService()._shap_values(model, model_path, str(tmp_path / "data.csv"), X))
+
+        assert sharded["explainer"]["shards"] == 5
+        assert executors.stats()["shap_shards"]["submitted"] == submitted + 5
+        np.testing.assert_array_equal(sharded["shap_values"], single["shap_values"])
+        assert sharded["expected_value"] == single["expected_value"]
+        np.testing.assert_array_equal(sharded["feature_values"], single["feature_values"])
+
+    def test_sample_size_zero_explains_every_row(self, monkeypatch):
+        monkeypatch.setattr(settings, "SHAP_SAMPLE_SIZE", 0)
+        model = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y)
+
+        shap_data = explainers.explain(model, X)
+
+        assert shap_data["explainer"]["explained_rows"] == len(X)
+        assert shap_data["explainer"]["shards"] == 1
+        assert shap_data["shap_values"].shape == (len(X), 4)
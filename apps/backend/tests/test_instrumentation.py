@@ -0,0 +1,119 @@
+"""
+Instrumentation and /metrics tests
+"""
+
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from app.core.instrumentation import MetricsRegistry, ROWS_SCORED, route_template, stage
+from app.main import app
+
+
+class TestMetricsRegistry:
+    """Test the text exposition format"""
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        registry.callback("cached_total", "Cached", ("cache",), lambda: [(("a",), 3)])
+
+        counter.inc(kind="x")
+        counter.inc(2, kind="x")
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="x"} 3' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert 'cached_total{cache="a"} 3' in text
+
+    def test_label_mismatch(self):
+        counter = MetricsRegistry().counter("jobs_total", "Jobs", ("kind",))
+        try:
+            counter.inc(other="x")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Expected ValueError")
+
+
+class TestMetricsEndpoint:
+    """Test request instrumentation end to end"""
+
+    client = TestClient(app)
+
+    def test_predict_is_instrumented(self):
+        X = pd.DataFrame({"a": np.arange(20.0), "b": np.arange(20.0) % 3})
+        model = LogisticRegression().fit(X, (X["a"] > 9).astype(int))
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        model_id = self.client.post(
+            "/api/v1/models/upload-model",
+            files={"file": ("clf.joblib", buffer.getvalue(), "application/octet-stream")}
+        ).json()["model_id"]
+
+        rows_before = ROWS_SCORED.value()
+        response = self.client.post(
+            "/api/v1/models/predict", json={"model_id": model_id, "data": [{"a": 1.0, "b": 0.0}] * 4}
+        )
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert "predict-model;dur=" in timing
+        assert "total;dur=" in timing
+        assert ROWS_SCORED.value() == rows_before + 4
+
+        text = self.client.get("/metrics").text
+        assert (
+            'meovis_http_request_duration_seconds_count{method="POST",route="/api/v1/models/predict",status="200"}'
+            in text
+        )
+        assert 'meovis_stage_duration_seconds_count{stage="predict.model"}' in text
+        assert 'meovis_cache_requests_total{cache="model",result="hit"}' in text
+        assert "meovis_models_loaded_total" in text
+
+    def test_stage_outside_request(self):
+        with stage("test.stage"):
+            pass
+        assert 'stage="test.stage"' in self.client.get("/metrics").text
+
+    def test_route_template_label(self):
+        with TestClient(app) as client:
+            client.get("/api/v1/predictions/424242")
+            client.get("/no/such/route")
+            text = client.get("/metrics").text
+        assert 'route="/api/v1/predictions/{prediction_id}",status="404"' in text
+        assert 'route="unmatched",status="404"' in text
+
+    def test_route_template_uses_route_path(self):
+        router = APIRouter(prefix="/files")
+
+        @router.get("/{name}")
+        def by_name(name: str, request: Request):
+            return route_template(request.scope)
+
+        @router.get("/{name}/raw/{path:path}")
+        def raw(name: str, path: str, request: Request):
+            return route_template(request.scope)
+
+        inner = FastAPI()
+        inner.include_router(router, prefix="/v1")
+        outer = FastAPI()
+        outer.include_router(router, prefix="/api")
+        outer.mount("/inner", inner)
+        client = TestClient(outer)
+
+        assert client.get("/api/files/files").json() == "/api/files/{name}"
+        assert client.get("/api/files/a/raw/b/c.csv").json() == "/api/files/{name}/raw/{path}"
+        assert client.get("/inner/v1/files/v1").json() == "/inner/v1/files/{name}"
@@ -0,0 +1,71 @@
+"""
+KernelExplainer budget tests
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+
+from app.core.config import settings
+from app.services.ml_service import MLService
+
+rng = np.random.RandomState(0)
+X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+
+ml_service = MLService()
+
+
+def _shap_values(model, tmp_path):
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(model, model_path)
+    return ml_service._generate_shap_values(str(model_path), str(tmp_path / "data.csv"), X)
+
+
+class TestKernelBudget:
+    """Test background summarization, explain-set size and the deadline"""
+
+    def test_budget_is_reported(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "SHAP_KERNEL_BACKGROUND_SIZE", 10)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_EXPLAIN_SIZE", 12)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_NSAMPLES", 50)
+        model = KNeighborsRegressor().fit(X, X["a"])
+
+        shap_data = _shap_values(model, tmp_path)
+
+        assert "error" not in shap_data
+        parameters = shap_data["explainer"]
+        assert parameters["kind"] == "kernel"
+        assert parameters["background_method"] == "kmeans"
+        assert (parameters["background_size"], parameters["nsamples"]) == (10, 50)
+        assert parameters["explained_rows"] == 12 and not parameters["partial"]
+        assert np.asarray(shap_data["shap_values"]).shape == (12, 3)
+        assert len(shap_data["feature_values"]) == 12
+
+    def test_deadline_returns_partial_rows(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "SHAP_KERNEL_BACKGROUND_METHOD", "sample")
+        monkeypatch.setattr(settings, "SHAP_KERNEL_BACKGROUND_SIZE", 10)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_NSAMPLES", 50)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_BATCH_ROWS", 5)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_DEADLINE_SECONDS", 0.0)
+        model = KNeighborsClassifier().fit(X, X["a"] > 0)
+
+        shap_data = _shap_values(model, tmp_path)
+
+        parameters = shap_data["explainer"]
+        assert parameters["background_method"] == "sample"
+        assert parameters["partial"]
+        # The first batch always completes
+        assert parameters["explained_rows"] == 5
+        assert np.asarray(shap_data["shap_values"]).shape[0] == 5
+
+    def test_cache_key_covers_budget(self, monkeypatch, tmp_path):
+        model_path = tmp_path / "model.pkl"
+        dataset_path = tmp_path / "data.csv"
+        model_path.write_bytes(b"model")
+        dataset_path.write_bytes(b"a,b\n1,2\n")
+        model = KNeighborsRegressor().fit(X, X["a"])
+
+        key = ml_service._shap_cache_key(model, str(model_path), str(dataset_path), None)
+        monkeypatch.setattr(settings, "SHAP_KERNEL_NSAMPLES", 999)
+        assert ml_service._shap_cache_key(model, str(model_path), str(dataset_path), None) != key
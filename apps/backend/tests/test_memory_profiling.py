@@ -0,0 +1,97 @@
+"""
+Memory profiling tests
+"""
+
+import logging
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.instrumentation import stage
+from app.core.memory_profiling import MemoryProfiler, memory_profiler
+from app.main import app
+
+_MB = 1024 * 1024
+
+
+@pytest.fixture
+def tracing():
+    memory_profiler.reset()
+    memory_profiler.start()
+    try:
+        yield memory_profiler
+    finally:
+        memory_profiler.stop()
+        memory_profiler.reset()
+
+
+class TestMemoryProfiler:
+    """Test per-stage memory records"""
+
+    def test_disabled_is_a_no_op(self):
+        profiler = MemoryProfiler(history=10, threshold_mb=1, top_sites=5)
+        with profiler.collect() as records:
+            with profiler.track("idle"):
+                pass
+        assert records is None
+        assert profiler.report()["stages"] == {}
+
+    def test_nested_stages(self, tracing):
+        with tracing.collect() as records:
+            with stage("test.outer"):
+                with stage("test.inner"):
+                    block = np.ones(4 * _MB // 8)
+                del block
+                kept = np.ones(_MB // 8)
+
+        inner, outer = records
+        assert inner["stage"] == "test.inner"
+        assert inner["traced_peak_bytes"] >= 4 * _MB
+        # The outer stage includes the inner peak even though it was reset
+        assert outer["traced_peak_bytes"] >= 4 * _MB
+        assert _MB <= outer["traced_net_bytes"] < 2 * _MB
+        assert tracing.report()["stages"]["test.inner"]["count"] == 1
+        del kept
+
+    def test_threshold_logs_allocation_sites(self, tracing, caplog):
+        tracing.threshold_bytes = _MB
+        try:
+            with caplog.at_level(logging.WARNING, logger="app.core.memory_profiling"):
+                with stage("test.large"):
+                    held = np.ones(2 * _MB // 8)
+        finally:
+            tracing.threshold_bytes = int(512 * _MB)
+
+        assert "Stage test.large peaked at" in caplog.text
+        assert "2.0 MB in" in caplog.text
+        del held
+
+    def test_memory_endpoint(self, tracing):
+        with stage("test.endpoint"):
+            pass
+        report = TestClient(app).get("/health/memory", params={"top": 3}).json()
+        assert report["enabled"] is True
+        assert "test.endpoint" in report["stages"]
+        assert len(report["top_allocations"]) <= 3
+
+
+class TestAnalysisMemoryProfile:
+    """Test the analysis debug field"""
+
+    def test_analysis_result_has_memory_profile(self, tracing):
+        from tests.test_analysis_jobs import _upload_fixtures, _wait_for
+
+        with TestClient(app) as client:
+            model_id, dataset_path = _upload_fixtures(client)
+            job_id = client.post(
+                "/api/v1/analysis/jobs",
+                json={"model_id": model_id, "dataset_path": dataset_path, "target_column": "target"}
+            ).json()["job_id"]
+            assert _wait_for(client, job_id)["status"] == "completed"
+
+            result = client.get(f"/api/v1/analysis/jobs/{job_id}/result").json()["result"]
+            stages = [record["stage"] for record in result["memory_profile"]]
+            assert "analyze.load_dataset" in stages
+            assert "analyze.predict" in stages
+            assert all(record["traced_peak_bytes"] >= 0 for record in result["memory_profile"])
@@ -0,0 +1,68 @@
+"""
+Metrics engine parity tests against scikit-learn
+"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score, precision_score, recall_score, f1_score,
+    confusion_matrix, classification_report, mean_squared_error,
+    mean_absolute_error, r2_score
+)
+
+from app.services.metrics_engine import classification_metrics, regression_metrics
+
+
+def _sklearn_classification(y_true, y_pred):
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "precision": float(precision_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "recall": float(recall_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "f1_score": float(f1_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "confusion_matrix": confusion_matrix(y_true, y_pred).tolist(),
+        "classification_report": classification_report(y_true, y_pred, output_dict=True, zero_division=0)
+    }
+
+
+rng = np.random.RandomState(7)
+
+
+class TestClassificationMetrics:
+    """Test that the single-pass engine reproduces scikit-learn exactly"""
+
+    @pytest.mark.parametrize("y_true, y_pred", [
+        ([1, 0, 1, 0, 1], [1, 0, 1, 0, 0]),
+        (rng.randint(0, 5, 500), rng.randint(0, 6, 500)),
+        (rng.randint(-3, 3, 200).astype(float), rng.randint(-3, 3, 200).astype(float)),
+        (np.array(["cat", "dog", "cat", "owl"]), np.array(["cat", "cat", "owl", "owl"])),
+        ([10**9, 5, 5, 10**9], [5, 5, 10**9, 7]),
+    ])
+    def test_matches_sklearn(self, y_true, y_pred):
+        assert classification_metrics(y_true, y_pred) == _sklearn_classification(y_true, y_pred)
+
+    def test_rejects_continuous_targets(self):
+        with pytest.raises(ValueError):
+            classification_metrics([1.0, 2.0, 3.0], [1.1, 1.9, 3.1])
+
+    def test_rejects_empty_input(self):
+        with pytest.raises(ValueError):
+            classification_metrics([], [])
+
+
+class TestRegressionMetrics:
+    """Test regression metrics against scikit-learn"""
+
+    @pytest.mark.parametrize("y_true, y_pred", [
+        ([1.0, 2.0, 3.0, 4.0, 5.0], [1.1, 1.9, 3.1, 3.9, 5.1]),
+        (rng.normal(size=300), rng.normal(size=300)),
+        ([2.0, 2.0, 2.0], [2.0, 2.0, 2.0]),
+        ([2.0, 2.0, 2.0], [1.0, 2.0, 3.0]),
+    ])
+    def test_matches_sklearn(self, y_true, y_pred):
+        mse = mean_squared_error(y_true, y_pred)
+        assert regression_metrics(y_true, y_pred) == {
+            "mse": float(mse),
+            "rmse": float(np.sqrt(mse)),
+            "mae": float(mean_absolute_error(y_true, y_pred)),
+            "r2_score": float(r2_score(y_true, y_pred)),
+        }
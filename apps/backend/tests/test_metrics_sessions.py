@@ -0,0 +1,112 @@
+"""
+Incremental metrics session tests
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.metrics import log_loss
+
+from app.main import app
+from app.services.metrics_engine import classification_metrics, regression_metrics
+from app.services.metrics_sessions import (
+    ClassificationAccumulator, RegressionAccumulator, MetricsSessionManager,
+    MetricsSessionNotFoundError
+)
+
+client = TestClient(app)
+
+rng = np.random.RandomState(3)
+
+
+class TestAccumulators:
+    """Test merged batch statistics against whole-array metrics"""
+
+    def test_classification_matches_full_arrays(self):
+        y_true = rng.randint(0, 5, 3000)
+        y_pred = np.where(rng.rand(3000) < 0.7, y_true, rng.randint(0, 5, 3000))
+
+        total = ClassificationAccumulator()
+        # Early batches miss some labels, so the label set has to grow
+        for start, stop in ((0, 10), (10, 1000), (1000, 3000)):
+            total.merge(ClassificationAccumulator.from_batch(y_true[start:stop], y_pred[start:stop]))
+
+        assert total.metrics() == classification_metrics(y_true, y_pred)
+
+    def test_log_loss(self):
+        y_true = rng.randint(0, 3, 500)
+        proba = rng.dirichlet(np.ones(3), 500)
+        classes = [0, 1, 2]
+
+        total = ClassificationAccumulator(classes)
+        for start in range(0, 500, 128):
+            total.merge(ClassificationAccumulator.from_batch(
+                y_true[start:start + 128], proba[start:start + 128].argmax(axis=1),
+                proba[start:start + 128], classes
+            ))
+
+        assert total.metrics()["log_loss"] == pytest.approx(log_loss(y_true, proba, labels=classes))
+
+    def test_regression_matches_full_arrays(self):
+        y_true = rng.normal(1e6, 3.0, 5000)
+        y_pred = y_true + rng.normal(0, 1.0, 5000)
+
+        total = RegressionAccumulator()
+        for start in range(0, 5000, 700):
+            total.merge(RegressionAccumulator.from_batch(y_true[start:start + 700], y_pred[start:start + 700]))
+
+        expected = regression_metrics(y_true, y_pred)
+        for name, value in total.metrics().items():
+            assert value == pytest.approx(expected[name], rel=1e-9)
+
+    def test_empty_session(self):
+        with pytest.raises(ValueError):
+            RegressionAccumulator().metrics()
+
+    def test_manager_limits_sessions(self):
+        manager = MetricsSessionManager(max_sessions=2, ttl_seconds=60)
+        first = manager.create("regression")
+        manager.create("regression")
+        manager.create("classification")
+        with pytest.raises(MetricsSessionNotFoundError):
+            manager.get(first.session_id)
+
+
+class TestMetricsSessionAPI:
+    """Test the metrics session endpoints"""
+
+    def test_session_lifecycle(self):
+        response = client.post("/api/v1/metrics/sessions", json={"task_type": "classification"})
+        assert response.status_code == 201
+        session_id = response.json()["session_id"]
+
+        assert client.get(f"/api/v1/metrics/sessions/{session_id}").status_code == 409
+
+        for y_true, y_pred in (([0, 1, 1], [0, 1, 0]), ([2, 1], [2, 1])):
+            response = client.post(
+                f"/api/v1/metrics/sessions/{session_id}/batches",
+                json={"y_true": y_true, "y_pred": y_pred}
+            )
+            assert response.status_code == 200
+        assert response.json()["n_samples"] == 5
+
+        response = client.get(f"/api/v1/metrics/sessions/{session_id}")
+        assert response.status_code == 200
+        assert response.json()["metrics"] == classification_metrics([0, 1, 1, 2, 1], [0, 1, 0, 2, 1])
+
+        assert client.delete(f"/api/v1/metrics/sessions/{session_id}").status_code == 200
+        assert client.get(f"/api/v1/metrics/sessions/{session_id}").status_code == 404
+
+    def test_invalid_batch(self):
+        session_id = client.post(
+            "/api/v1/metrics/sessions", json={"task_type": "classification"}
+        ).json()["session_id"]
+        response = client.post(
+            f"/api/v1/metrics/sessions/{session_id}/batches",
+            json={"y_true": [0, 1], "y_pred": [0.5, 1.0]}
+        )
+        assert response.status_code == 400
+
+    def test_unknown_task_type(self):
+        response = client.post("/api/v1/metrics/sessions", json={"task_type": "ranking"})
+        assert response.status_code == 400
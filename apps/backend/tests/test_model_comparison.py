@@ -0,0 +1,84 @@
+"""
+Multi-model comparison tests
+"""
+
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from app.main import app
+
+client = TestClient(app)
+
+rng = np.random.RandomState(5)
+X = pd.DataFrame({"a": rng.normal(size=300), "b": rng.normal(size=300)})
+y = ((X["a"] + 0.5 * X["b"] + rng.normal(scale=0.5, size=300)) > 0).astype(int)
+models = [
+    LogisticRegression().fit(X, y),
+    RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y),
+]
+
+
+def _upload_model(model):
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    response = client.post(
+        "/api/v1/models/upload-model",
+        files={"file": ("model.joblib", buffer.getvalue(), "application/octet-stream")}
+    )
+    return response.json()["model_id"]
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    model_ids = [_upload_model(model) for model in models]
+    response = client.post(
+        "/api/v1/datasets/upload-dataset",
+        files={"file": ("data.csv", X.assign(target=y).to_csv(index=False).encode(), "text/csv")}
+    )
+    return model_ids, response.json()["file_path"]
+
+
+class TestModelComparison:
+    """Test the compare endpoint"""
+
+    def test_compare_side_by_side(self, fixtures):
+        model_ids, dataset_path = fixtures
+        response = client.post("/api/v1/models/compare", json={
+            "model_ids": model_ids + ["missing"],
+            "dataset_path": dataset_path,
+            "target_column": "target",
+        })
+        assert response.status_code == 200
+        data = response.json()
+
+        assert [row["model_id"] for row in data["table"]] == model_ids
+        for row, model in zip(data["table"], models):
+            assert row["accuracy"] == pytest.approx(accuracy_score(y, model.predict(X)))
+            assert row["roc_auc"] == pytest.approx(roc_auc_score(y, model.predict_proba(X)[:, 1]))
+
+        assert data["failed"][0]["model_id"] == "missing"
+        assert data["dataset_info"]["rows"] == len(X)
+
+        aligned = [data["aligned_curves"][model_id] for model_id in model_ids]
+        assert aligned[0]["fpr"] == aligned[1]["fpr"]
+        assert len(aligned[0]["tpr"][0]) == len(aligned[0]["fpr"])
+
+    def test_unknown_target(self, fixtures):
+        model_ids, dataset_path = fixtures
+        response = client.post("/api/v1/models/compare", json={
+            "model_ids": model_ids, "dataset_path": dataset_path, "target_column": "nope"
+        })
+        assert response.status_code == 400
+
+    def test_requires_models(self, fixtures):
+        _, dataset_path = fixtures
+        response = client.post("/api/v1/models/compare", json={"model_ids": [], "dataset_path": dataset_path})
+        assert response.status_code == 422
@@ -0,0 +1,89 @@
+"""
+Model registry tests
+"""
+
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LinearRegression
+
+from app.main import app
+from app.services.model_registry import ModelNotFoundError, ModelRegistry
+
+client = TestClient(app)
+
+
+def _fit_model(slope):
+    X = pd.DataFrame({"x0": np.arange(10, dtype=float)})
+    return LinearRegression().fit(X, X["x0"] * slope)
+
+
+def _dump_model(path, slope):
+    joblib.dump(_fit_model(slope), path)
+    return path
+
+
+class TestModelRegistry:
+    """Test LRU behaviour of the registry"""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        registry = ModelRegistry(max_bytes=10**9, max_entries=2, model_dir=str(tmp_path))
+        for name in ("a", "b", "c"):
+            registry.register(_dump_model(tmp_path / f"{name}.joblib", 1.0).as_posix())
+
+        assert registry.loaded_ids() == ["b", "c"]
+        assert registry.stats()["evictions"] == 1
+
+    def test_reloads_on_miss(self, tmp_path):
+        registry = ModelRegistry(max_bytes=1, max_entries=10, model_dir=str(tmp_path))
+        registry.register(_dump_model(tmp_path / "a.joblib", 2.0).as_posix())
+        registry.register(_dump_model(tmp_path / "b.joblib", 3.0).as_posix())
+        assert registry.loaded_ids() == ["b"]
+
+        entry = registry.get("a")
+        assert entry.model.predict(pd.DataFrame({"x0": [1.0]}))[0] == pytest.approx(2.0)
+        assert registry.stats()["misses"] == 1
+
+    def test_unknown_model(self, tmp_path):
+        registry = ModelRegistry(max_bytes=10**9, max_entries=2, model_dir=str(tmp_path))
+        with pytest.raises(ModelNotFoundError):
+            registry.get()
+        with pytest.raises(ModelNotFoundError):
+            registry.get("../etc/passwd")
+
+
+class TestPredictRouting:
+    """Test that predictions are routed by model id"""
+
+    def _upload(self, slope):
+        buffer = io.BytesIO()
+        joblib.dump(_fit_model(slope), buffer)
+        response = client.post(
+            "/api/v1/models/upload-model",
+            files={"file": ("model.joblib", buffer.getvalue(), "application/octet-stream")}
+        )
+        assert response.status_code == 200
+        return response.json()["model_id"]
+
+    def test_predict_routes_by_model_id(self):
+        first = self._upload(2.0)
+        second = self._upload(5.0)
+
+        for model_id, expected in ((first, 2.0), (second, 5.0)):
+            response = client.post(
+                "/api/v1/models/predict",
+                json={"data": {"x0": 1.0}, "model_id": model_id}
+            )
+            assert response.status_code == 200
+            assert response.json()["predictions"][0] == pytest.approx(expected)
+
+    def test_predict_unknown_model_id(self):
+        response = client.post(
+            "/api/v1/models/predict",
+            json={"data": {"x0": 1.0}, "model_id": "does-not-exist"}
+        )
+        assert response.status_code == 400
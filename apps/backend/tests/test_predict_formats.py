@@ -0,0 +1,110 @@
+"""
+Columnar and binary /predict body tests
+"""
+
+import io
+
+import joblib
+import msgpack
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+
+from app.main import app
+from app.utils import codecs
+
+client = TestClient(app)
+
+X = pd.DataFrame({"a": np.linspace(-2, 2, 40), "b": np.linspace(1, -1, 40) ** 2})
+
+
+@pytest.fixture(scope="module")
+def model_id():
+    model = LogisticRegression().fit(X, (X["a"] > 0).astype(int))
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    response = client.post(
+        "/api/v1/models/upload-model",
+        files={"file": ("clf.joblib", buffer.getvalue(), "application/octet-stream")}
+    )
+    return response.json()["model_id"]
+
+
+def _row_predictions(model_id):
+    response = client.post(
+        "/api/v1/models/predict",
+        json={"data": X.to_dict("records"), "model_id": model_id}
+    )
+    return response.json()
+
+
+class TestPredictFormats:
+    """Test request and response encodings of /predict"""
+
+    def test_columnar_json(self, model_id):
+        response = client.post(
+            "/api/v1/models/predict",
+            json={"columns": ["a", "b"], "data": X.to_dict("list"), "model_id": model_id}
+        )
+        assert response.status_code == 200
+        assert response.json()["predictions"] == _row_predictions(model_id)["predictions"]
+
+    def test_npy_request_and_response(self, model_id):
+        buffer = io.BytesIO()
+        np.save(buffer, X.to_numpy())
+        response = client.post(
+            f"/api/v1/models/predict?model_id={model_id}&columns=a,b",
+            content=buffer.getvalue(),
+            headers={"Content-Type": codecs.NPY, "Accept": codecs.NPY}
+        )
+        assert response.status_code == 200
+        predictions = np.load(io.BytesIO(response.content))
+        assert predictions.tolist() == _row_predictions(model_id)["predictions"]
+
+    def test_arrow_request_and_response(self, model_id):
+        table = pa.Table.from_pandas(X)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        response = client.post(
+            f"/api/v1/models/predict?model_id={model_id}",
+            content=sink.getvalue().to_pybytes(),
+            headers={"Content-Type": codecs.ARROW, "Accept": codecs.ARROW}
+        )
+        assert response.status_code == 200
+        result = pa.ipc.open_stream(response.content).read_all().to_pandas()
+        assert result.columns.tolist() == ["prediction", "proba_0", "proba_1"]
+        expected = _row_predictions(model_id)
+        assert result["prediction"].tolist() == expected["predictions"]
+
+    def test_msgpack_raw_buffer(self, model_id):
+        array = X.to_numpy()
+        body = msgpack.packb({
+            "columns": ["a", "b"],
+            "data": array.tobytes(),
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "model_id": model_id,
+        })
+        response = client.post(
+            "/api/v1/models/predict",
+            content=body,
+            headers={"Content-Type": codecs.MSGPACK, "Accept": codecs.MSGPACK}
+        )
+        assert response.status_code == 200
+        result = msgpack.unpackb(response.content)
+        packed = result["probabilities"]
+        probabilities = np.frombuffer(packed["data"], dtype=packed["dtype"]).reshape(packed["shape"])
+        np.testing.assert_allclose(probabilities, _row_predictions(model_id)["probabilities"])
+
+    def test_unsupported_content_type(self, model_id):
+        response = client.post(
+            "/api/v1/models/predict",
+            content=b"a,b\n1,2\n",
+            headers={"Content-Type": "text/csv"}
+        )
+        assert response.status_code == 415
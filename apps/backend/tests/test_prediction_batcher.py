@@ -0,0 +1,105 @@
+"""
+Prediction batching tests
+"""
+
+import asyncio
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from app.services.ml_service import MLService
+from app.services.model_registry import ModelRegistry
+from app.services.prediction_batcher import PredictionBatcher
+
+
+@pytest.fixture
+def batcher(tmp_path):
+    X = pd.DataFrame({"a": np.arange(20, dtype=float), "b": np.arange(20, dtype=float) % 3})
+    model = LogisticRegression().fit(X, (X["a"] > 9).astype(int))
+    path = tmp_path / "clf.joblib"
+    joblib.dump(model, path)
+
+    service = MLService()
+    service.registry = ModelRegistry(max_bytes=10**9, max_entries=4, model_dir=str(tmp_path))
+    service.registry.register(str(path))
+    return PredictionBatcher(service, max_wait_ms=50, max_rows=100)
+
+
+class TestPredictionBatcher:
+    """Test coalescing of concurrent prediction requests"""
+
+    def test_concurrent_requests_share_one_batch(self, batcher):
+        rows = [{"a": float(i), "b": float(i % 3)} for i in range(20)]
+
+        async def run():
+            return await asyncio.gather(*(batcher.predict(row) for row in rows))
+
+        results = asyncio.run(run())
+        expected = batcher.ml_service.predict(rows)
+
+        assert batcher.stats()["batches"] == 1
+        assert [r["predictions"][0] for r in results] == expected["predictions"].tolist()
+        np.testing.assert_allclose([r["probabilities"][0] for r in results], expected["probabilities"])
+
+    def test_bad_request_does_not_fail_batch(self, batcher):
+        async def run():
+            return await asyncio.gather(
+                batcher.predict({"a": 1.0, "b": 2.0}),
+                batcher.predict({"a": "not a number", "b": 2.0}),
+            )
+
+        good, bad = asyncio.run(run())
+        assert good["success"] is True
+        assert bad["success"] is False
+
+    def test_model_lookup_runs_off_the_event_loop(self, batcher):
+        registry_get = batcher.ml_service.registry.get
+        threads = []
+
+        def get(model_id=None):
+            threads.append(threading.get_ident())
+            return registry_get(model_id)
+
+        batcher.ml_service.registry.get = get
+
+        async def run():
+            return threading.get_ident(), await batcher.predict({"a": 1.0, "b": 2.0})
+
+        loop_thread, result = asyncio.run(run())
+        assert result["success"] is True
+        assert threads and loop_thread not in threads
+
+    def test_cancelled_waiter_does_not_strand_the_batch(self, batcher):
+        predict_frame = batcher.ml_service.predict_frame
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_predict_frame(model_id, df):
+            calls.append(len(df))
+            if len(calls) == 2:
+                # First request predicted alone after the merged batch failed
+                started.set()
+                release.wait(5)
+            return predict_frame(model_id, df)
+
+        batcher.ml_service.predict_frame = slow_predict_frame
+
+        async def run():
+            cancelled = asyncio.ensure_future(batcher.predict({"a": 1.0, "b": 2.0}))
+            others = asyncio.gather(
+                batcher.predict({"a": "not a number", "b": 2.0}),
+                batcher.predict({"a": 15.0, "b": 0.0}),
+            )
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            cancelled.cancel()
+            release.set()
+            return await asyncio.wait_for(others, 5)
+
+        bad, good = asyncio.run(run())
+        assert bad["success"] is False
+        assert good["success"] is True
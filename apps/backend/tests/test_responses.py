@@ -0,0 +1,54 @@
+"""
+NumPy-aware response encoding tests
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.responses import NumpyJSONResponse, dumps
+
+
+class TestResponses:
+    """Test encoding arrays without per-element conversion"""
+
+    def test_arrays_scalars_and_frames(self):
+        content = {
+            "matrix": np.arange(6, dtype=np.float32).reshape(2, 3),
+            "column": np.arange(6.0).reshape(2, 3)[:, 1],
+            "half": np.array([0.5], dtype=np.float16),
+            "labels": np.array(["a", "b"], dtype=object),
+            "count": np.int64(3),
+            "missing": np.array([np.nan, 1.0]),
+            "frame": pd.DataFrame({"x": [1, 2], "y": [0.5, 1.5]}),
+            "keys": {1: "one"},
+        }
+
+        decoded = json.loads(dumps(content))
+        assert decoded["matrix"] == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+        assert decoded["column"] == [1.0, 4.0]
+        assert decoded["half"] == [0.5]
+        assert decoded["labels"] == ["a", "b"]
+        assert decoded["count"] == 3
+        assert decoded["missing"] == [None, 1.0]
+        assert decoded["frame"] == {"columns": ["x", "y"], "data": {"x": [1, 2], "y": [0.5, 1.5]}}
+        assert decoded["keys"] == {"1": "one"}
+
+    def test_rounding(self):
+        content = {"values": np.array([[0.123456, 2 / 3]]), "scalar": 1 / 3, "nested": [{"v": 0.98765}]}
+        decoded = json.loads(NumpyJSONResponse(content, decimals=3).body)
+        assert decoded == {"values": [[0.123, 0.667]], "scalar": 0.333, "nested": [{"v": 0.988}]}
+
+    def test_large_shap_matrix(self):
+        shap_values = np.random.RandomState(0).normal(size=(1000, 50))
+        dumps({"shap_values": shap_values})
+
+        start = time.perf_counter()
+        body = dumps({"shap_values": shap_values})
+        elapsed = time.perf_counter() - start
+
+        np.testing.assert_allclose(json.loads(body)["shap_values"], shap_values)
+        # Generous bound for slow CI machines; typically a few milliseconds
+        assert elapsed < 0.5
@@ -0,0 +1,139 @@
+"""
+Stored result read tests
+"""
+
+import io
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+
+from app.main import app
+from app.services import array_store, result_slices
+
+
+def _store(**arrays):
+    path, _ = array_store.save_arrays(arrays, float_dtype="float64")
+    return array_store.open_arrays(path)
+
+
+class TestResultSlices:
+    """Test slicing stored arrays"""
+
+    def test_prediction_page_selects_rows_and_classes(self):
+        proba = np.random.RandomState(0).dirichlet(np.ones(3), size=20)
+        bundle = _store(
+            predictions=proba.argmax(axis=1), probabilities=proba,
+            y_true=np.arange(20) % 3, classes=np.array([0, 1, 2])
+        )
+
+        page = result_slices.prediction_page(bundle, offset=15, limit=10, classes=["2", "0"])
+        assert page["rows"].tolist() == [15, 16, 17, 18, 19]
+        assert page["total"] == 20
+        assert page["classes"] == [2, 0]
+        np.testing.assert_allclose(page["probabilities"], proba[15:][:, [2, 0]])
+
+    def test_shap_page_maps_sampled_rows(self):
+        shap_values = np.random.RandomState(1).normal(size=(4, 3, 2))
+        bundle = _store(
+            predictions=np.zeros(10), shap_values=shap_values,
+            shap_rows=np.array([7, 2, 9, 4]), classes=np.array(["no", "yes"])
+        )
+
+        page = result_slices.shap_page(bundle, ["a", "b", "c"], 1, 2, features=["c", "a"], classes=["yes"])
+        assert page["rows"].tolist() == [2, 9]
+        assert page["features"] == ["c", "a"]
+        assert page["classes"] == ["yes"]
+        np.testing.assert_allclose(page["shap_values"], shap_values[1:3][:, [2, 0]][:, :, [1]])
+
+    def test_top_rows(self):
+        shap_values = np.array([[0.1, -0.2], [3.0, 0.0], [-0.5, 2.0], [0.0, 0.1]])
+        bundle = _store(
+            predictions=np.array([1.0, 2.0, 3.0, 4.0]), y_true=np.array([1.0, 0.0, 3.5, 10.0]),
+            shap_values=shap_values
+        )
+
+        by_shap = result_slices.top_rows(bundle, ["a", "b"], "shap", 2)
+        assert by_shap["rows"].tolist() == [1, 2]
+        assert result_slices.top_rows(bundle, ["a", "b"], "shap", 1, features=["b"])["rows"].tolist() == [2]
+
+        by_error = result_slices.top_rows(bundle, ["a", "b"], "error", 10)
+        assert by_error["rows"].tolist() == [3, 1, 2, 0]
+        assert by_error["scores"].tolist() == [6.0, 2.0, 0.5, 0.0]
+
+    def test_unknown_feature(self):
+        bundle = _store(predictions=np.zeros(2), shap_values=np.zeros((2, 1)))
+        try:
+            result_slices.shap_page(bundle, ["a"], 0, 10, features=["z"])
+        except ValueError as e:
+            assert "Unknown features" in str(e)
+        else:
+            raise AssertionError("Expected ValueError")
+
+
+class TestPredictionEndpoints:
+    """Test the stored prediction read endpoints"""
+
+    def _analyze(self, client):
+        rng = np.random.RandomState(0)
+        df = pd.DataFrame({"a": rng.normal(size=80), "b": rng.normal(size=80)})
+        df["target"] = (df["a"] > 0).astype(int)
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(df[["a", "b"]], df["target"])
+
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        model_id = client.post(
+            "/api/v1/models/upload-model",
+            files={"file": ("forest.joblib", buffer.getvalue(), "application/octet-stream")}
+        ).json()["model_id"]
+        dataset_path = client.post(
+            "/api/v1/datasets/upload-dataset",
+            files={"file": ("data.csv", df.to_csv(index=False).encode(), "text/csv")}
+        ).json()["file_path"]
+
+        job_id = client.post(
+            "/api/v1/analysis/jobs",
+            json={"model_id": model_id, "dataset_path": dataset_path, "target_column": "target"}
+        ).json()["job_id"]
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            status = client.get(f"/api/v1/analysis/jobs/{job_id}").json()
+            if status["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.1)
+        assert status["status"] == "completed", status["error"]
+        return status["prediction_id"], model, df
+
+    def test_read_stored_prediction(self):
+        with TestClient(app) as client:
+            prediction_id, model, df = self._analyze(client)
+            base = f"/api/v1/predictions/{prediction_id}"
+
+            summary = client.get(base).json()
+            assert summary["rows"] == 80
+            assert summary["classes"] == [0, 1]
+            assert summary["feature_names"] == ["a", "b"]
+
+            page = client.get(f"{base}/predictions", params={"offset": 70, "limit": 20, "classes": "1"}).json()
+            assert page["rows"] == list(range(70, 80))
+            assert page["predictions"] == model.predict(df[["a", "b"]])[70:].tolist()
+            assert page["y_true"] == df["target"][70:].tolist()
+            assert len(page["probabilities"][0]) == 1
+
+            shap_page = client.get(f"{base}/shap", params={"limit": 5, "features": "b"}).json()
+            assert shap_page["features"] == ["b"]
+            assert np.asarray(shap_page["shap_values"]).shape[:2] == (5, 1)
+
+            top = client.get(f"{base}/top", params={"by": "error", "k": 3}).json()
+            assert len(top["rows"]) == 3
+            assert top["scores"] == sorted(top["scores"], reverse=True)
+
+            assert client.get(f"{base}/shap", params={"features": "missing"}).status_code == 400
+            assert client.get(f"{base}/predictions", params={"limit": 10 ** 6}).status_code == 422
+
+    def test_unknown_prediction(self):
+        with TestClient(app) as client:
+            assert client.get("/api/v1/predictions/999999").status_code == 404
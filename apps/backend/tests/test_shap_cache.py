@@ -0,0 +1,60 @@
+"""
+SHAP cache tests
+"""
+
+import hashlib
+import os
+import time
+
+from app.core.config import settings
+from app.services.shap_cache import ShapCache
+from app.utils import files
+
+
+class TestShapCache:
+    """Test the persistent SHAP result cache"""
+
+    def test_round_trip_and_counters(self, tmp_path):
+        cache = ShapCache(str(tmp_path), max_bytes=10**6)
+        key = cache.make_key(model_sha256="m", dataset_sha256="d", sample_size=10)
+
+        assert cache.get(key) is None
+        cache.put(key, {"shap_values": [[0.5, -0.5]]})
+        assert cache.get(key) == {"shap_values": [[0.5, -0.5]]}
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_key_depends_on_every_part(self):
+        base = ShapCache.make_key(model_sha256="m", dataset_sha256="d", sample_size=10)
+        assert base == ShapCache.make_key(sample_size=10, dataset_sha256="d", model_sha256="m")
+        assert base != ShapCache.make_key(model_sha256="m", dataset_sha256="d", sample_size=11)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        payload = {"shap_values": [0.0] * 100}
+        cache = ShapCache(str(tmp_path), max_bytes=800)
+
+        cache.put("old", payload)
+        old_time = time.time() - 60
+        os.utime(tmp_path / "old.json", (old_time, old_time))
+        cache.put("new", payload)
+
+        assert cache.get("old") is None
+        assert cache.get("new") == payload
+        assert cache.stats()["evictions"] == 1
+
+
+class TestFileHashCache:
+    """Test the memoized content hashes used in cache keys"""
+
+    def test_digest_cache_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "FILE_HASH_CACHE_ENTRIES", 3)
+        monkeypatch.setattr(files, "_hash_cache", files.OrderedDict())
+        paths = []
+        for index in range(5):
+            path = tmp_path / f"{index}.bin"
+            path.write_bytes(bytes([index]) * 10)
+            paths.append(str(path))
+            assert files.file_sha256(str(path)) == hashlib.sha256(bytes([index]) * 10).hexdigest()
+
+        assert [key[0] for key in files._hash_cache] == [os.path.abspath(path) for path in paths[2:]]
@@ -0,0 +1,72 @@
+"""
+Cold start and prewarm tests
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import explainers, prewarm
+from tests.test_analysis_jobs import _upload_fixtures
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports:
+    """Test that importing the app defers heavy ML dependencies"""
+
+    def test_import_skips_shap_sklearn_and_directories(self):
+        root = os.path.join(tempfile.mkdtemp(prefix="meovis-import-"), "uploads")
+        env = dict(os.environ, UPLOAD_DIR=root, DATASET_UPLOAD_DIR=os.path.join(root, "datasets"),
+                   MODEL_UPLOAD_DIR=os.path.join(root, "models"), DATABASE_URL="sqlite://:memory:")
+        code = (
+            "import sys, app.main; "
+            "print(sorted(name for name in ('shap', 'sklearn', 'joblib') if name in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=_BACKEND_DIR, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "[]"
+        assert not os.path.exists(root)
+
+    def test_shap_version_without_import(self):
+        assert explainers.shap_version() == __import__("shap").__version__
+
+
+class TestStartup:
+    """Test startup timings and the prewarm step"""
+
+    def test_startup_report(self):
+        with TestClient(app) as client:
+            report = client.get("/health/startup").json()
+
+            assert report["ready"] is True
+            assert report["import_seconds"] > 0
+            assert report["ready_seconds"] >= report["import_seconds"]
+            assert {"directories", "database", "resume_jobs"} <= set(report["phases"])
+            assert "shap" in report["heavy_modules_loaded"]
+
+            metrics = client.get("/metrics").text
+            assert 'meovis_startup_phase_seconds{phase="database"}' in metrics
+
+    def test_prewarm_models_and_explainers(self):
+        with TestClient(app) as client:
+            model_id, dataset_path = _upload_fixtures(client)
+
+            report = client.portal.call(
+                lambda: prewarm.prewarm(
+                    imports=["json", "no_such_module"], model_ids=[model_id, "missing"],
+                    explainer=True, background_path=dataset_path
+                )
+            )
+
+        assert set(report["imports"]) == {"json"}
+        assert [model["model_id"] for model in report["models"]] == [model_id]
+        assert report["models"][0]["explainer"] == explainers.LINEAR
+        assert [error["step"] for error in report["errors"]] == ["import:no_such_module", "model:missing"]